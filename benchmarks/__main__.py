@@ -0,0 +1,197 @@
+"""
+Benchmarks for the candidate computation hot path.
+
+Usage (from the project directory):
+    python -m benchmarks [--sizes 100 500] [--repeat 5] [--output results.json]
+                         [--compare previous_results.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+from src.side_type import SideType
+from src.tile import Tile
+from src.tile_subsection import TileSubsection
+
+from benchmarks.board_generator import BoardGenerator
+
+DEFAULT_SIZES = [100, 500, 2000, 5000]
+
+# tiles that are used to probe the candidate computation
+PROBE_TILES = [
+    ("WWGGCC", "G"),  # common landscape tile
+    ("RRGGGG", "G"),  # river
+    ("TWWTHH", "T"),  # train tracks
+]
+
+
+def _measure(function, repeat, setup=None):
+    # returns the timings (in seconds) of each repetition, setup time is excluded
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _summarize(timings):
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "repeat": len(timings),
+    }
+
+
+def _get_open_coords_side_types(session):
+    side_types_per_open_coords = []
+    for open_coords in session.open_coords:
+        side_types = []
+        for subsection in TileSubsection.get_side_values():
+            neighbor_coords = Tile.get_coordinates(open_coords, subsection)
+            if neighbor_coords in session.played_tiles:
+                side_types.append(
+                    session.played_tiles[neighbor_coords]
+                    .get_side(Tile.get_opposing(subsection)).type)
+            else:
+                side_types.append(SideType.UNKNOWN)
+        side_types_per_open_coords.append(side_types)
+    return side_types_per_open_coords
+
+
+def benchmark_board(session, repeat):
+    """
+    Times the individual stages of the candidate computation on the given session.
+
+    Args:
+        session (Session): The session to benchmark, will be restored after each stage.
+        repeat (int): The number of repetitions per stage.
+
+    Returns:
+        Dictionary of stage name to timing summary.
+    """
+    results = {}
+
+    def compute_candidates():
+        return [session.compute_candidate_tiles(seq, center) for seq, center in PROBE_TILES]
+
+    results["compute_candidate_tiles"] = _summarize(_measure(compute_candidates, repeat))
+
+    candidates_per_probe = compute_candidates()
+    results["compute_tile_ratings"] = _summarize(_measure(
+        lambda: [session.compute_tile_ratings(c) for c in candidates_per_probe if c],
+        repeat))
+
+    def best_candidate():
+        seq, center = PROBE_TILES[0]
+        candidates = session.compute_candidate_tiles(seq, center)
+        return session.compute_tile_ratings(candidates)[0].tile
+
+    place_timings = []
+    undo_timings = []
+    for _ in range(repeat):
+        place_timings += _measure(session.place_candidate, 1,
+                                  setup=lambda: (best_candidate(),))
+        undo_timings += _measure(session.undo_last_tile, 1)
+    results["place_candidate"] = _summarize(place_timings)
+    results["undo_last_tile"] = _summarize(undo_timings)
+
+    side_types_per_open_coords = _get_open_coords_side_types(session)
+    results["find_matching_tiles"] = _summarize(_measure(
+        lambda: [session.seen_tiles_index.count_matching_tiles(side_types)
+                 for side_types in side_types_per_open_coords],
+        repeat))
+
+    def compute_groups():
+        for group in session.groups.values():
+            group.compute(session.played_tiles)
+
+    results["group_compute"] = _summarize(_measure(compute_groups, repeat))
+
+    return results
+
+
+def _get_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _compare(results, previous):
+    print(f"\nComparison against {previous.get('commit')} (median, current / previous):")
+    for size, stages in results["boards"].items():
+        previous_stages = previous.get("boards", {}).get(size)
+        if previous_stages is None:
+            continue
+        for stage, summary in stages.items():
+            if stage == "board" or stage not in previous_stages:
+                continue
+            previous_median = previous_stages[stage]["median"]
+            ratio = summary["median"] / previous_median if previous_median > 0 else float("inf")
+            print(f"  {size:>6} {stage:<25} {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the candidate computation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="number of tiles of the synthetic boards")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of repetitions per stage")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the synthetic board generation")
+    parser.add_argument("--policy", choices=[p.name.lower() for p in BoardGenerator.Policy],
+                        default=BoardGenerator.Policy.COMPACT.name.lower(),
+                        help="placement policy for the synthetic boards")
+    parser.add_argument("--output", default=None,
+                        help="path of the JSON results file")
+    parser.add_argument("--compare", default=None,
+                        help="path of a previous JSON results file to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "commit": _get_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "policy": args.policy,
+        "boards": {},
+    }
+
+    for size in args.sizes:
+        start = time.perf_counter()
+        session = BoardGenerator(seed=args.seed).build_session(
+            size, BoardGenerator.Policy[args.policy.upper()])
+        board = {
+            "build_time": time.perf_counter() - start,
+            "open_coords": len(session.open_coords),
+            "groups": len(session.groups),
+        }
+
+        stages = benchmark_board(session, args.repeat)
+        results["boards"][str(size)] = {"board": board, **stages}
+
+        print(f"{size} tiles ({board['open_coords']} open coordinates, "
+              f"{board['groups']} groups):")
+        for stage, summary in stages.items():
+            print(f"  {stage:<25} median {summary['median'] * 1000:10.2f} ms")
+
+    output = args.output or f"benchmark_{results['commit'] or 'results'}.json"
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            _compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Deterministic generator for large, valid boards.
+
+Usage (from the project directory):
+    python -m benchmarks.board_generator --tiles 2000 --seed 1 --output board.csv
+"""
+import argparse
+import random
+from collections import deque
+from enum import Enum
+from typing import Dict, List, Tuple
+
+from src.session import Session
+from src.side import Side
+from src.side_type import SideType
+from src.tile import Tile
+from src.tile_subsection import TileSubsection
+
+
+class BoardGenerator:
+    """
+    Generates seeded side type sequences and places them with the session rules
+    to build valid boards of any size.
+    """
+
+    class Policy(Enum):
+        # place tiles on a compact board around the start tile,
+        # using the orientation with the most perfectly matching sides
+        COMPACT = 0
+        # place every tile at the best rated candidate position (slow)
+        BEST_CANDIDATE = 1
+
+    # relative frequency of the plain landscape side types
+    DEFAULT_LANDSCAPE_WEIGHTS = {
+        SideType.WOODS: 0.3,
+        SideType.GREEN: 0.2,
+        SideType.CROPS: 0.2,
+        SideType.HOUSE: 0.2,
+        SideType.PONDS: 0.1,
+    }
+
+    # number of attempts to draw a tile that may be placed at the next position
+    _MAX_DRAW_ATTEMPTS = 20
+
+    def __init__(self, seed=0, landscape_weights=None,
+                 river_probability=0.08, train_probability=0.05,
+                 station_probability=0.01, isolation_probability=0.02):
+        """
+        Creates a board generator.
+
+        Args:
+            seed (int, optional): Seed for the random generation. Defaults to 0.
+            landscape_weights (dict, optional): Relative frequency per landscape side type.
+                                                Defaults to `DEFAULT_LANDSCAPE_WEIGHTS`.
+            river_probability (float, optional): Probability of a tile with river sides.
+            train_probability (float, optional): Probability of a tile with train track sides.
+            station_probability (float, optional): Probability of a station tile.
+            isolation_probability (float, optional): Probability of a tile with a side
+                                                     that is isolated from the center.
+
+        Raises:
+            ValueError: If the probabilities of the restricted types exceed 1
+                        or the landscape weights are empty.
+        """
+        self.landscape_weights: Dict[SideType, float] = dict(
+            self.DEFAULT_LANDSCAPE_WEIGHTS if landscape_weights is None else landscape_weights)
+        if not self.landscape_weights:
+            raise ValueError("At least one landscape type is required")
+        if river_probability + train_probability + station_probability > 1:
+            raise ValueError("Probabilities of the restricted types may not exceed 1")
+
+        self.river_probability = river_probability
+        self.train_probability = train_probability
+        self.station_probability = station_probability
+        self.isolation_probability = isolation_probability
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    def generate_side_type_sequences(self, num_tiles) -> List[Tuple[str, str]]:
+        """
+        Generates side type sequences.
+
+        Args:
+            num_tiles (int): The number of sequences to generate.
+
+        Returns:
+            List of pairs of side type sequence and center type (as characters).
+        """
+        self._rng = random.Random(self.seed)
+        return [self._draw_side_type_sequence() for _ in range(num_tiles)]
+
+    def build_session(self, num_tiles, policy=Policy.COMPACT) -> Session:
+        """
+        Builds a session with the given number of placed tiles, including the start tile.
+
+        Args:
+            num_tiles (int): The number of tiles to place.
+            policy (BoardGenerator.Policy, optional): Placement policy.
+                                                      Defaults to `Policy.COMPACT`.
+
+        Returns:
+            The session containing the placed tiles.
+        """
+        self._rng = random.Random(self.seed)
+        session = Session()
+        session.start()
+
+        coordinates = self._iterate_coordinates()
+        next(coordinates)  # start tile has already been placed
+        while len(session.played_tiles) < num_tiles:
+            if policy == BoardGenerator.Policy.BEST_CANDIDATE:
+                candidate = self._draw_best_candidate(session)
+            else:
+                candidate = self._draw_compact_candidate(session, next(coordinates))
+            session.place_candidate(candidate)
+
+        return session
+
+    def export_csv(self, file_name, num_tiles, policy=Policy.COMPACT):
+        """
+        Builds a session and saves it in the CSV session format.
+
+        Args:
+            file_name (str): The path of the CSV file.
+            num_tiles (int): The number of tiles to place.
+            policy (BoardGenerator.Policy, optional): Placement policy.
+                                                      Defaults to `Policy.COMPACT`.
+
+        Returns:
+            The session that has been saved.
+        """
+        session = self.build_session(num_tiles, policy)
+        session.save_to_csv(file_name)
+        return session
+
+    def _draw_side_type_sequence(self):
+        landscape_types = list(self.landscape_weights.keys())
+        weights = list(self.landscape_weights.values())
+
+        # tiles usually consist of a few contiguous runs of the same type
+        side_types = []
+        while len(side_types) < 6:
+            run_length = self._rng.randint(1, 6 - len(side_types))
+            side_types += [self._rng.choices(landscape_types, weights)[0]] * run_length
+
+        draw = self._rng.random()
+        if draw < self.station_probability:
+            center_type = SideType.STATION
+            for idx in self._rng.sample(range(6), 2):
+                side_types[idx] = self._rng.choice([SideType.RIVER, SideType.TRAIN])
+        else:
+            if draw < self.station_probability + self.river_probability:
+                restricted_type = SideType.RIVER
+            elif draw < self.station_probability + self.river_probability + \
+                    self.train_probability:
+                restricted_type = SideType.TRAIN
+            else:
+                restricted_type = None
+
+            if restricted_type is not None:
+                for idx in self._rng.sample(range(6), self._rng.choice([1, 2, 2, 2, 3])):
+                    side_types[idx] = restricted_type
+
+            center_type = max(sorted(set(side_types)), key=side_types.count)
+
+        side_chars = [side_type.to_character() for side_type in side_types]
+
+        if self._rng.random() < self.isolation_probability:
+            # an isolated side may not have the same type as its neighboring sides
+            isolation_indices = [
+                idx for idx in range(6)
+                if side_types[idx] not in (side_types[idx - 1], side_types[(idx + 1) % 6])
+            ]
+            if isolation_indices:
+                idx = self._rng.choice(isolation_indices)
+                side_chars[idx] = "(" + side_chars[idx] + ")"
+
+        return "".join(side_chars), center_type.to_character()
+
+    @staticmethod
+    def _iterate_coordinates():
+        # breadth first expansion from the origin yields a compact, roughly circular board
+        queue = deque([(0, 0)])
+        visited = {(0, 0)}
+        while queue:
+            coordinates = queue.popleft()
+            yield coordinates
+            for subsection in TileSubsection.get_side_values():
+                neighbor_coords = Tile.get_coordinates(coordinates, subsection)
+                if neighbor_coords not in visited:
+                    visited.add(neighbor_coords)
+                    queue.append(neighbor_coords)
+
+    def _draw_compact_candidate(self, session, coordinates):
+        for _ in range(self._MAX_DRAW_ATTEMPTS):
+            sequence, center_type = self._draw_side_type_sequence()
+            tile = Tile(side_types=sequence, center_type=center_type, coordinates=coordinates)
+
+            # prefer the orientation with the most perfectly matching sides
+            best = None
+            for orientation in tile.create_all_orientations(include_self=True):
+                candidate = session.prepare_candidate(orientation.get_side_type_seq(),
+                                                      center_type, coordinates)
+                if candidate is None:
+                    continue
+                if best is None or candidate.get_num_sides(Side.Placement.PERFECT_MATCH) > \
+                        best.get_num_sides(Side.Placement.PERFECT_MATCH):
+                    best = candidate
+            if best is not None:
+                return best
+
+        # a station may be placed against any type
+        return session.prepare_candidate([SideType.STATION], SideType.STATION, coordinates)
+
+    def _draw_best_candidate(self, session):
+        while True:
+            sequence, center_type = self._draw_side_type_sequence()
+            candidates = session.compute_candidate_tiles(sequence, center_type)
+            if candidates:
+                return session.compute_tile_ratings(candidates)[0].tile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic session as CSV")
+    parser.add_argument("--tiles", type=int, required=True, help="number of tiles")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generation")
+    parser.add_argument("--policy", choices=[p.name.lower() for p in BoardGenerator.Policy],
+                        default=BoardGenerator.Policy.COMPACT.name.lower(),
+                        help="placement policy")
+    parser.add_argument("--output", required=True, help="path of the CSV file")
+    args = parser.parse_args(argv)
+
+    BoardGenerator(seed=args.seed).export_csv(
+        args.output, args.tiles, BoardGenerator.Policy[args.policy.upper()])
+
+
+if __name__ == "__main__":
+    main()
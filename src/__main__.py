@@ -1,6 +1,10 @@
 import sys
-import pandas as pd
+import time
 
+# start of the application, used for the startup timing report
+STARTUP_BEGIN = time.perf_counter()
+
+# pylint: disable=wrong-import-position
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -17,15 +21,16 @@ from PySide6.QtWidgets import (
     QDialog,
     QFileDialog,
     QRadioButton,
-    QLabel,
+    QProgressDialog,
 )
 from PySide6.QtGui import QAction, QFont
-from PySide6.QtCore import Qt, Slot, Signal
+from PySide6.QtCore import Qt, Slot, Signal, QTimer
 
 from src.session import Session
 from src.side_type import SideType, SIDE_TYPE_TO_CHAR
 from src.tile import Tile
 from src.constants import DatabaseConstants
+from src.profiler import PROFILER
 from src.ui.constants import UIConstants
 
 from src.ui.tile_map_view import CandidateNeighborMapView, TileMapView
@@ -34,14 +39,18 @@ from src.ui.candidate_list import CandidateList
 from src.ui.watched_coordinates_list import WatchedCoordinatesList
 from src.ui.legend import Legend
 
+IMPORTS_DONE = time.perf_counter()
+
 
 class MainWidget(QMainWindow):
     start_session = Signal()
     trigger_save_session = Signal(str)
     trigger_save_to_csv = Signal(str)
+    trigger_save_to_binary = Signal(str)
     trigger_delete_session = Signal(int)
     trigger_load_session = Signal(tuple)
     trigger_load_from_csv = Signal(str)
+    trigger_load_from_binary = Signal(str)
     trigger_reset_session = Signal()
     trigger_next_tile = Signal(tuple)
     trigger_update_map = Signal()
@@ -50,12 +59,16 @@ class MainWidget(QMainWindow):
         super().__init__()
         self.setWindowTitle(UIConstants.TITLE)
         self.setGeometry(200, 200, 1200, 900)
-        self.session = Session(DatabaseConstants.DB_NAME)
+        # tables are created in the background once the window has been painted
+        self.session = Session(DatabaseConstants.DB_NAME, defer_database_setup=True)
 
         # tile by tile placement, triggered through loading a session
         self.tile_by_tile_data = None
         self.tile_by_tile_index = -1
 
+        # progress of a running session import
+        self.import_progress_dialog = None
+
         self.setup_ui()
         self.start_session.emit()
 
@@ -94,10 +107,17 @@ class MainWidget(QMainWindow):
         save_csv_action = QAction("&Save as CSV", self)
         load_action = QAction("&Load Session", self)
         load_csv_action = QAction("&Load from CSV", self)
+        save_binary_action = QAction("Save as &Binary", self)
+        load_binary_action = QAction("Load from B&inary", self)
         delete_action = QAction("&Delete Session", self)
 
         exit_action = QAction("&Exit", self)
 
+        enable_profiling_action = QAction("&Enable Profiling", self)
+        enable_profiling_action.setCheckable(True)
+        enable_profiling_action.setChecked(PROFILER.enabled)
+        show_profiling_action = QAction("&Show Profiling Results", self)
+
         menu_bar = self.menuBar()
         file_menu = menu_bar.addMenu("&File")
 
@@ -107,9 +127,15 @@ class MainWidget(QMainWindow):
         file_menu.addAction(save_csv_action)
         file_menu.addAction(load_action)
         file_menu.addAction(load_csv_action)
+        file_menu.addAction(save_binary_action)
+        file_menu.addAction(load_binary_action)
         file_menu.addAction(delete_action)
         file_menu.addAction(exit_action)
 
+        profiling_menu = menu_bar.addMenu("&Profiling")
+        profiling_menu.addAction(enable_profiling_action)
+        profiling_menu.addAction(show_profiling_action)
+
         # Glue UI to business logic
         # file dialog
         new_action.triggered.connect(self.confirm_new)
@@ -123,6 +149,11 @@ class MainWidget(QMainWindow):
         load_csv_action.triggered.connect(self.load_session_from_csv)
         save_action.triggered.connect(self.save_session)
         save_csv_action.triggered.connect(self.save_session_to_csv)
+        load_binary_action.triggered.connect(self.load_session_from_binary)
+        save_binary_action.triggered.connect(self.save_session_to_binary)
+        # profiling
+        enable_profiling_action.toggled.connect(self.enable_profiling)
+        show_profiling_action.triggered.connect(self.show_profiling_results)
 
         # session signals
         self.session.session_updated.connect(
@@ -137,6 +168,9 @@ class MainWidget(QMainWindow):
         self.session.session_updated.connect(
             lambda: self.control_panel.set_undo_button_enabled(True)
         )
+        self.session.session_updated.connect(
+            lambda: self.control_panel.set_redo_button_enabled(bool(self.session.redo_tiles))
+        )
         self.session.session_updated.connect(
             lambda: self.control_panel.set_place_button_enabled(False)
         )
@@ -194,7 +228,9 @@ class MainWidget(QMainWindow):
         self.session.session_reset.connect(self.control_panel.reset)
         self.session.session_reset.connect(self.reset_tile_by_tile)
         self.session.sessions_loaded_from_database.connect(self.initiate_session_load)
-        self.session.dataframe_loaded.connect(self.fill_tile_by_tile)
+        self.session.import_progress.connect(self.show_import_progress)
+        self.session.import_finished.connect(self.close_import_progress)
+        self.session.tile_records_loaded.connect(self.start_tile_by_tile)
         self.session.watched_coordinates_changed.connect(
             self.watched_candidate_list.handle_update_watched_coords
         )
@@ -296,6 +332,9 @@ class MainWidget(QMainWindow):
         self.control_panel.undo_button.clicked.connect(
             self.session.handle_undo_last_tile
         )
+        self.control_panel.redo_button.clicked.connect(
+            self.session.handle_redo_last_tile
+        )
         self.control_panel.trigger_message_display.connect(self.show_message)
         self.control_panel.trigger_display_help.connect(self.show_help)
         self.control_panel.trigger_display_stats.connect(self.show_stats)
@@ -309,6 +348,7 @@ class MainWidget(QMainWindow):
         )
         self.trigger_save_session.connect(self.session.handle_save_session_to_database)
         self.trigger_save_to_csv.connect(self.session.handle_save_session_to_csv)
+        self.trigger_save_to_binary.connect(self.session.handle_save_session_to_binary)
         self.trigger_load_session.connect(
             self.session.handle_load_session_from_database
         )
@@ -319,6 +359,10 @@ class MainWidget(QMainWindow):
         self.trigger_load_from_csv.connect(
             lambda: self.control_panel.set_undo_button_enabled(False)
         )
+        self.trigger_load_from_binary.connect(self.session.handle_load_session_from_binary)
+        self.trigger_load_from_binary.connect(
+            lambda: self.control_panel.set_undo_button_enabled(False)
+        )
         self.trigger_delete_session.connect(
             self.session.handle_delete_session_from_database
         )
@@ -326,6 +370,32 @@ class MainWidget(QMainWindow):
         self.trigger_next_tile.connect(self.control_panel.prefill_next_tile)
         self.trigger_update_map.connect(self.tile_map.refresh)
 
+    @Slot(tuple)
+    def show_import_progress(self, progress):
+        num_loaded, num_tiles = progress
+        if self.import_progress_dialog is None:
+            self.import_progress_dialog = QProgressDialog(
+                "Loading session...", "Cancel", 0, num_tiles, self
+            )
+            self.import_progress_dialog.setWindowTitle("Load Session")
+            self.import_progress_dialog.setWindowModality(Qt.WindowModal)
+            self.import_progress_dialog.setMinimumDuration(0)
+            self.import_progress_dialog.setAutoClose(False)
+            self.import_progress_dialog.setAutoReset(False)
+            self.import_progress_dialog.canceled.connect(self.session.handle_cancel_import)
+
+        self.import_progress_dialog.setValue(num_loaded)
+        # show the partially loaded board
+        self.trigger_update_map.emit()
+
+    @Slot(bool)
+    def close_import_progress(self, _):
+        if self.import_progress_dialog is not None:
+            self.import_progress_dialog.canceled.disconnect(self.session.handle_cancel_import)
+            self.import_progress_dialog.close()
+            self.import_progress_dialog.deleteLater()
+            self.import_progress_dialog = None
+
     @Slot(tuple)
     def show_message(self, args):
         title, msg = args
@@ -338,6 +408,19 @@ class MainWidget(QMainWindow):
             message_box.setFont(monospaced_font)
             message_box.exec()
 
+    @Slot(bool)
+    def enable_profiling(self, enabled):
+        PROFILER.enabled = enabled
+        PROFILER.reset()
+
+    @Slot()
+    def show_profiling_results(self):
+        if PROFILER.trace_name is None:
+            self.show_message(("Profiling", "No profiling results available. "
+                                            "Enable profiling and compute candidates first."))
+            return
+        self.show_message(("Profiling", PROFILER.get_summary(separator="\n")))
+
     @Slot()
     def show_help(self):
         example_seq = "".join(
@@ -387,9 +470,7 @@ class MainWidget(QMainWindow):
 
     @Slot()
     def show_stats(self):
-        count_marked_for_deletion = 0
-        for groups in self.session.groups_marked_for_deletion_at_coords.values():
-            count_marked_for_deletion += len(groups)
+        count_marked_for_deletion = len(self.session.marked_group_ids)
 
         info_message = (
             f"Score (without quests): {self.session.score}\n\n"
@@ -404,7 +485,8 @@ class MainWidget(QMainWindow):
              " -> Imperfect placements: "
             f"{self.session.get_open_placement_count(Tile.Placement.IMPERFECT)}\n\n"
             f"Groups: {len(self.session.groups)} "
-            f"({count_marked_for_deletion} marked for deletion)\n"
+            f"({count_marked_for_deletion} marked for deletion)\n\n"
+            f"Distinct tiles: {len(self.session.seen_tiles_index.catalog)}\n"
         )
         self.show_message(("Game Statistics", info_message))
 
@@ -461,10 +543,27 @@ class MainWidget(QMainWindow):
         if file_path:
             self.trigger_save_to_csv.emit(file_path)
 
+    @Slot()
+    def load_session_from_binary(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Load from Binary", "", f"(*{UIConstants.BINARY_SESSION_EXTENSION})"
+        )
+        if file_path:
+            self.trigger_reset_session.emit()
+            self.trigger_load_from_binary.emit(file_path)
+
+    @Slot()
+    def save_session_to_binary(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save as Binary", "", f"(*{UIConstants.BINARY_SESSION_EXTENSION})"
+        )
+        if file_path:
+            self.trigger_save_to_binary.emit(file_path)
+
     @Slot(tuple)
     def initiate_session_load(self, args):
         sessions, origin = args
-        if sessions is None or sessions.empty:
+        if not sessions:
             self.show_message(("Error", "Database does not yet contain any sessions"))
             return
 
@@ -478,22 +577,24 @@ class MainWidget(QMainWindow):
         layout = QVBoxLayout()
 
         table_widget = QTableWidget()
-        column_titles = ["Name", "Save date", "Number of tiles"]
+        column_titles = ["Name", "Save date", "Number of tiles", "Score"]
         table_widget.setColumnCount(len(column_titles))
         table_widget.setHorizontalHeaderLabels(column_titles)
-        column_widths = [350, 90, 100]
+        column_widths = [300, 90, 100, 80]
         for i, width in enumerate(column_widths):
             table_widget.setColumnWidth(i, width)
         table_widget.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         table_widget.setSelectionMode(QAbstractItemView.SingleSelection)
 
-        for row_index, session in sessions.iterrows():
+        for row_index, session in enumerate(sessions):
             table_widget.insertRow(row_index)
-            table_widget.setItem(row_index, 0, QTableWidgetItem(session["name"]))
-            table_widget.setItem(row_index, 1, QTableWidgetItem(session["save_date"]))
+            table_widget.setItem(row_index, 0, QTableWidgetItem(session.name))
+            table_widget.setItem(row_index, 1, QTableWidgetItem(session.save_date))
             table_widget.setItem(
-                row_index, 2, QTableWidgetItem(str(session["number_of_tiles"]))
+                row_index, 2, QTableWidgetItem(str(session.number_of_tiles))
             )
+            if session.score is not None:
+                table_widget.setItem(row_index, 3, QTableWidgetItem(str(session.score)))
 
             # flag read-only after filling
             for col_index in range(table_widget.columnCount()):
@@ -516,10 +617,6 @@ class MainWidget(QMainWindow):
             layout.addWidget(radio_simulate_placement)
             layout.addWidget(radio_simulate_tile_by_tile)
 
-            layout.addWidget(QLabel(
-                "Please note: The application may seem unresponsive while loading larger session"
-            ))
-
             # Add a button to confirm loading the selected session
             load_button = QPushButton("Load Session")
             load_button.clicked.connect(
@@ -554,13 +651,13 @@ class MainWidget(QMainWindow):
         msg_box.setIcon(QMessageBox.Question)
         msg_box.setWindowTitle("Confirm delete")
         msg_box.setText(
-            f"Are you sure you want to delete the session {sessions.iloc[selected[0]]['name']}?"
+            f"Are you sure you want to delete the session {sessions[selected[0]].name}?"
         )
         msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
 
         result = msg_box.exec()
         if result == QMessageBox.Yes:
-            self.trigger_delete_session.emit(sessions.iloc[selected[0]]["id"])
+            self.trigger_delete_session.emit(sessions[selected[0]].id)
 
         dialog.accept()
 
@@ -572,36 +669,35 @@ class MainWidget(QMainWindow):
 
         self.trigger_reset_session.emit()
         self.trigger_load_session.emit(
-            (sessions.iloc[selected_rows[0]]["id"], load_simulated, load_tile_by_tile)
+            (sessions[selected_rows[0]].id, load_simulated, load_tile_by_tile)
         )
         dialog.accept()
 
-    @Slot(tuple)
-    def fill_tile_by_tile(self, data):
-        auto_compute = True
-        auto_place = False
-        if isinstance(data, pd.DataFrame):
-            # initial setup for tile by tile placement from a session load
-            self.trigger_reset_session.emit()
+    @Slot(list)
+    def start_tile_by_tile(self, tile_records):
+        # initial setup for tile by tile placement from a session load
+        self.trigger_reset_session.emit()
 
-            self.tile_by_tile_data = data
-            self.tile_by_tile_index = 0
-            auto_place = True  # ensure to directly place first tile
+        self.tile_by_tile_data = tile_records
+        self.tile_by_tile_index = 0
+        self._emit_next_tile_by_tile(auto_place=True)  # ensure to directly place first tile
 
-        elif self.tile_by_tile_data is not None and self.tile_by_tile_index >= 0:
-            self.tile_by_tile_index += 1
-        else:
+    @Slot(tuple)
+    def fill_tile_by_tile(self, _):
+        if self.tile_by_tile_data is None or self.tile_by_tile_index < 0:
             # we did not trigger tile by tile placement
             return
 
-        if (
-            not self.tile_by_tile_data.empty
-            and self.tile_by_tile_index < self.tile_by_tile_data.shape[0]
-        ):
-            row = self.tile_by_tile_data.iloc[self.tile_by_tile_index]
+        self.tile_by_tile_index += 1
+        self._emit_next_tile_by_tile(auto_place=False)
+
+    def _emit_next_tile_by_tile(self, auto_place):
+        auto_compute = True
+        if self.tile_by_tile_index < len(self.tile_by_tile_data):
+            record = self.tile_by_tile_data[self.tile_by_tile_index]
 
             self.trigger_next_tile.emit(
-                (row["side_type_seq"], row["center_type"], auto_compute, auto_place)
+                (record.side_type_seq, record.center_type, auto_compute, auto_place)
             )
         else:
             self.tile_by_tile_data = None
@@ -613,8 +709,42 @@ class MainWidget(QMainWindow):
         self.tile_by_tile_index = -1
 
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+def start_application(argv):
+    """
+    Shows the main window and sets up the database in the background afterwards.
+
+    With `--startup-report` (or enabled profiling), the startup timings are printed.
+    With `--startup-report`, the application quits after the database has been set up.
+    """
+    app = QApplication(argv)
+    window_begin = time.perf_counter()
     window = MainWidget()
     window.show()
-    sys.exit(app.exec())
+    window_done = time.perf_counter()
+
+    def handle_first_paint():
+        first_paint_done = time.perf_counter()
+        window.session.database.create_tables_in_background()
+
+        if "--startup-report" not in argv and not PROFILER.enabled:
+            return
+
+        window.session.database.wait_for_setup()
+        timings = {
+            "imports": IMPORTS_DONE - STARTUP_BEGIN,
+            "main_window": window_done - window_begin,
+            "first_paint": first_paint_done - STARTUP_BEGIN,
+            "database_setup": time.perf_counter() - first_paint_done,
+        }
+        print("STARTUP " + " | ".join(f"{name} {duration * 1000:.1f} ms"
+                                      for name, duration in timings.items()))
+        if "--startup-report" in argv:
+            app.quit()
+
+    # executed as soon as the event loop has processed the initial paint events
+    QTimer.singleShot(0, handle_first_paint)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(start_application(sys.argv))
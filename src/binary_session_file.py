@@ -0,0 +1,201 @@
+import os
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from src.side_type import SideType
+from src.tile_record import TileRecord
+
+
+class BinarySessionFile:
+    """
+    Compact binary session format, which may be opened through `numpy.memmap`.
+
+    The file consists of a header, followed by a fixed-size record per tile
+    (in order of placement) and a section of watched coordinates.
+    All values are stored in little endian byte order.
+    """
+
+    MAGIC = b"DTSB"
+    VERSION = 1
+
+    HEADER_DTYPE = np.dtype([
+        ("magic", "S4"),
+        ("version", "<u2"),
+        ("reserved", "<u2"),
+        ("num_tiles", "<u4"),
+        ("num_watched", "<u4"),
+    ])
+    TILE_DTYPE = np.dtype([
+        ("x", "<i2"),
+        ("y", "<i2"),
+        ("sides", "<u4"),  # side types of the six sides, 4 bits each (first side in lowest bits)
+        ("isolated", "u1"),  # isolation bit of the six sides (first side in lowest bit)
+        ("center", "u1"),
+        ("quest", "u1"),  # NO_QUEST without quest
+        ("reserved", "u1"),
+    ])
+    WATCHED_DTYPE = np.dtype([
+        ("x", "<i2"),
+        ("y", "<i2"),
+    ])
+
+    NO_QUEST = 0xFF
+    SIDE_TYPE_BITS = 4
+
+    def __init__(self, file_name):
+        """
+        Opens a binary session file as memory map, without reading the tiles.
+
+        Args:
+            file_name (str): The path of the binary session file.
+
+        Raises:
+            ValueError: If the file is not a valid binary session file.
+            FileNotFoundError: If the file does not exist.
+        """
+        file_size = os.path.getsize(file_name)
+        if file_size < self.HEADER_DTYPE.itemsize:
+            raise ValueError(f"File {file_name} is not a binary session file")
+
+        header = np.memmap(file_name, dtype=self.HEADER_DTYPE, mode="r", shape=(1,))[0]
+        if header["magic"] != self.MAGIC or header["version"] != self.VERSION:
+            raise ValueError(f"File {file_name} is not a binary session file (version "
+                             f"{self.VERSION})")
+
+        self.num_tiles = int(header["num_tiles"])
+        self.num_watched = int(header["num_watched"])
+        tiles_offset = self.HEADER_DTYPE.itemsize
+        watched_offset = tiles_offset + self.num_tiles * self.TILE_DTYPE.itemsize
+        if file_size != watched_offset + self.num_watched * self.WATCHED_DTYPE.itemsize:
+            raise ValueError(f"File {file_name} is truncated or corrupted")
+
+        # structured arrays of the tile records and watched coordinates
+        self.tiles = self._map(file_name, self.TILE_DTYPE, tiles_offset, self.num_tiles)
+        self.watched = self._map(file_name, self.WATCHED_DTYPE, watched_offset,
+                                 self.num_watched)
+
+    def iterate_tile_records(self, chunk_size=1000) -> Iterator[List[TileRecord]]:
+        """
+        Decodes the tiles in chunks, only the current chunk is read from the file.
+
+        Args:
+            chunk_size (int, optional): The maximum number of tiles per chunk. Defaults to 1000.
+
+        Yields:
+            List of the next tiles in order of placement.
+        """
+        for start in range(0, self.num_tiles, chunk_size):
+            yield self.decode_tile_records(self.tiles[start:start + chunk_size])
+
+    def get_tile_records(self) -> List[TileRecord]:
+        return self.decode_tile_records(self.tiles)
+
+    def get_watched_coordinates(self) -> List[Tuple[int, int]]:
+        return list(zip(self.watched["x"].tolist(), self.watched["y"].tolist()))
+
+    @classmethod
+    def write(cls, file_name, tile_records: Iterable[TileRecord],
+              watched_coords: Iterable[Tuple[int, int]] = ()):
+        """
+        Writes a binary session file.
+
+        Args:
+            file_name (str): The path of the binary session file.
+            tile_records (Iterable[TileRecord]): The tiles in order of placement.
+            watched_coords (Iterable[Tuple[int, int]], optional): The watched coordinates.
+
+        Raises:
+            ValueError: If coordinates exceed the 16 bit range.
+        """
+        tiles = cls.encode_tile_records(tile_records)
+        watched = cls._encode_coordinates(list(watched_coords), cls.WATCHED_DTYPE)
+
+        header = np.zeros(1, dtype=cls.HEADER_DTYPE)
+        header["magic"] = cls.MAGIC
+        header["version"] = cls.VERSION
+        header["num_tiles"] = len(tiles)
+        header["num_watched"] = len(watched)
+
+        with open(file_name, "wb") as file:
+            file.write(header.tobytes())
+            file.write(tiles.tobytes())
+            file.write(watched.tobytes())
+
+    @classmethod
+    def encode_tile_records(cls, tile_records: Iterable[TileRecord]) -> np.ndarray:
+        tile_records = list(tile_records)
+        tiles = cls._encode_coordinates([r.coordinates for r in tile_records], cls.TILE_DTYPE)
+
+        for i, record in enumerate(tile_records):
+            sides = 0
+            isolated = 0
+            for side_idx, side in enumerate(cls._extract_sides(record.side_type_seq)):
+                side_type, side_isolated = side
+                sides |= int(side_type) << (side_idx * cls.SIDE_TYPE_BITS)
+                isolated |= int(side_isolated) << side_idx
+            tiles[i]["sides"] = sides
+            tiles[i]["isolated"] = isolated
+            tiles[i]["center"] = SideType.from_character(record.center_type)
+            tiles[i]["quest"] = cls.NO_QUEST if record.quest_type is None \
+                else SideType.from_character(record.quest_type)
+
+        return tiles
+
+    @classmethod
+    def decode_tile_records(cls, tiles: np.ndarray) -> List[TileRecord]:
+        # (number of tiles, 6) arrays of side types and isolation
+        shifts = np.arange(6, dtype=np.uint32)
+        side_types = (tiles["sides"][:, None] >> (shifts * cls.SIDE_TYPE_BITS)) & 0xF
+        isolated = (tiles["isolated"][:, None] >> shifts.astype(np.uint8)) & 1
+
+        characters = {side_type: side_type.to_character() for side_type in SideType}
+        records = []
+        for tile, tile_side_types, tile_isolated in zip(
+                tiles.tolist(), side_types.tolist(), isolated.tolist()):
+            x, y, _, _, center, quest, _ = tile
+            side_type_seq = "".join(
+                f"({characters[side_type]})" if side_isolated else characters[side_type]
+                for side_type, side_isolated in zip(tile_side_types, tile_isolated)
+            )
+            records.append(TileRecord(
+                (x, y), side_type_seq, characters[center],
+                None if quest == cls.NO_QUEST else characters[quest]
+            ))
+        return records
+
+    @staticmethod
+    def _extract_sides(side_type_seq):
+        # (side type, isolated) of the six sides of a side type sequence
+        sides = []
+        i = 0
+        while i < len(side_type_seq):
+            if side_type_seq[i] == "(":
+                sides.append((SideType.from_character(side_type_seq[i + 1]), True))
+                i += 3
+            else:
+                sides.append((SideType.from_character(side_type_seq[i]), False))
+                i += 1
+        if len(sides) == 1:
+            sides *= 6
+        if len(sides) != 6:
+            raise ValueError(f"Invalid side type sequence {side_type_seq}")
+        return sides
+
+    @staticmethod
+    def _encode_coordinates(coordinates, dtype) -> np.ndarray:
+        array = np.zeros(len(coordinates), dtype=dtype)
+        if coordinates:
+            values = np.array(coordinates, dtype=np.int64)
+            limits = np.iinfo(np.int16)
+            if values.min() < limits.min or values.max() > limits.max:
+                raise ValueError("Coordinates exceed the range of the binary session format")
+            array["x"] = values[:, 0]
+            array["y"] = values[:, 1]
+        return array
+
+    @staticmethod
+    def _map(file_name, dtype, offset, count) -> np.ndarray:
+        if count == 0:
+            return np.zeros(0, dtype=dtype)  # empty sections may not be mapped
+        return np.memmap(file_name, dtype=dtype, mode="r", offset=offset, shape=(count,))
@@ -20,6 +20,79 @@ class Constants:
         SideType.TRAIN,
         SideType.WOODS
     ]
+    # side types that perfectly match a side type
+    PERFECT_MATCH_DICT = {
+        SideType.WOODS: [SideType.WOODS],
+        SideType.HOUSE: [SideType.HOUSE],
+        SideType.GREEN: [SideType.GREEN, SideType.PONDS, SideType.STATION],
+        SideType.CROPS: [SideType.CROPS],
+        SideType.PONDS: [
+            SideType.PONDS,
+            SideType.GREEN,
+            SideType.STATION,
+            SideType.RIVER,
+        ],
+        SideType.STATION: [
+            SideType.STATION,
+            SideType.GREEN,
+            SideType.PONDS,
+            SideType.RIVER,
+            SideType.TRAIN,
+        ],
+        SideType.RIVER: [SideType.RIVER, SideType.PONDS, SideType.STATION],
+        SideType.TRAIN: [SideType.TRAIN, SideType.STATION],
+    }
+    # types that only allow placement against the listed types
+    RESTRICTED_DICT = {
+        SideType.RIVER: [SideType.RIVER, SideType.PONDS, SideType.STATION],
+        SideType.TRAIN: [SideType.TRAIN, SideType.STATION],
+    }
+    # using the neighbor compatibilty score we can handle types
+    # that are not covered by any other rating mechanism
+    DIRECT_NEIGHBOR_COMPATIBILITY_SCORE = [
+        (
+            1,
+            {
+                SideType.STATION: [SideType.RIVER, SideType.TRAIN],
+                SideType.GREEN: [SideType.GREEN],
+            },
+        ),
+        (
+            0.5,
+            {
+                SideType.STATION: [SideType.STATION, SideType.PONDS],
+                SideType.GREEN: [SideType.PONDS, SideType.STATION],
+            },
+        ),
+        (
+            -0.5,
+            {
+                SideType.STATION: [SideType.WOODS, SideType.HOUSE, SideType.CROPS]
+            }
+        ),
+    ]
+    OTHER_NEIGHBOR_COMPATIBILITY_SCORE = [
+        (
+            1,
+            {
+                SideType.STATION: [SideType.RIVER, SideType.TRAIN],
+                SideType.GREEN: [SideType.GREEN],
+            },
+        ),
+        (
+            0.5,
+            {
+                SideType.STATION: [SideType.STATION, SideType.PONDS],
+                SideType.GREEN: [SideType.PONDS, SideType.STATION],
+            },
+        ),
+        (
+            -0.5,
+            {
+                SideType.STATION: [SideType.WOODS, SideType.HOUSE, SideType.CROPS]
+            }
+        ),
+    ]
 
 
 class DatabaseConstants:
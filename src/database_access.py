@@ -1,30 +1,93 @@
 import sqlite3
+import threading
 from datetime import datetime
+from enum import IntEnum
 
-from typing import List, Tuple
-
-import pandas as pd
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
+from src.seen_tiles_index import SeenTilesIndex
 from src.side import Side
-from src.side_type import SIDE_TYPE_TO_CHAR
+from src.side_type import SIDE_TYPE_TO_CHAR, SideType
+from src.session_snapshot import SessionSnapshot
+from src.tile import Tile
+from src.tile_record import TileRecord
+from src.tile_subsection import TileSubsection
 
 class DatabaseAccess():
     """
     Class to access the database that holds information for the session.
     """
 
-    def __init__(self, database=None):
+    CREATE_PLACED_TILES_TABLE = '''CREATE TABLE IF NOT EXISTS {table} (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                x INTEGER,
+                                y INTEGER,
+                                num_perfect_sides INTEGER,
+                                num_imperfect_sides INTEGER,
+                                num_unknown_sides INTEGER,
+                                tile_id INTEGER,
+                                FOREIGN KEY (tile_id) REFERENCES tiles(id)
+                                )'''
+    CREATE_WATCHED_COORDINATES_TABLE = '''CREATE TABLE IF NOT EXISTS {table} (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                x INTEGER,
+                                y INTEGER,
+                                session_id INTEGER,
+                                FOREIGN KEY (session_id) REFERENCES sessions(id)
+                                )'''
+
+    SELECT_TILE_RECORDS = '''SELECT pt.x, pt.y, t.side_type_seq, t.center_type, t.quest_type
+                             FROM tiles t
+                             JOIN placed_tiles pt ON pt.tile_id = t.id'''
+
+    CREATE_SESSION_JOURNAL_TABLE = '''CREATE TABLE IF NOT EXISTS session_journal (
+                                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                                session_id INTEGER,
+                                operation INTEGER,
+                                x INTEGER,
+                                y INTEGER,
+                                side_type_seq VARCHAR(6),
+                                center_type VARCHAR(1),
+                                quest_type VARCHAR(1),
+                                num_perfect_sides INTEGER,
+                                num_imperfect_sides INTEGER,
+                                num_unknown_sides INTEGER,
+                                score INTEGER,
+                                FOREIGN KEY (session_id) REFERENCES sessions(id)
+                                )'''
+
+    # number of journal entries of a session after which the journal is compacted
+    JOURNAL_COMPACTION_INTERVAL = 100
+
+    class JournalOperation(IntEnum):
+        RESET = 0  # discard all tiles of the session
+        PLACE = 1  # place a tile
+        UNDO = 2  # remove the last placed tile
+
+    class SessionInfo(NamedTuple):
+        id: int
+        name: str
+        save_date: str  # date of the last modification
+        number_of_tiles: int
+        score: Optional[int]  # None if unknown (sessions saved by previous versions)
+
+    def __init__(self, database=None, defer_setup=False):
         """
         Creates a database access object.
 
         Args:
             `database` is the path to the database.
+            `defer_setup` skips the creation of the tables, which is then expected to be
+            triggered through `create_tables` or `create_tables_in_background`.
         """
         self.conn = None
         self.cursor = None
 
+        # thread that creates the tables in the background (if any)
+        self.setup_thread = None
+
         self.database = database
-        if self.database is not None:
+        if self.database is not None and not defer_setup:
             self.create_tables()
 
     def __del__(self):
@@ -57,6 +120,7 @@ class DatabaseAccess():
         if self.database is None:
             raise RuntimeError("Database has not been loaded")
 
+        self.wait_for_setup()
         if self.conn is not None or self.cursor is not None:
             return  # Database is already loaded
 
@@ -67,6 +131,7 @@ class DatabaseAccess():
         """
         Closes the database connection and cursor if they are open.
         """
+        self.wait_for_setup()
         if self.cursor is not None:
             self.cursor.close()
             self.cursor = None
@@ -83,7 +148,9 @@ class DatabaseAccess():
             self.cursor.execute('''CREATE TABLE IF NOT EXISTS sessions (
                                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                                 name VARCHAR(255),
-                                save_date DATE
+                                save_date DATE,
+                                tile_count INTEGER DEFAULT 0,
+                                score INTEGER
                                 )''')
             self.cursor.execute('''CREATE TABLE IF NOT EXISTS tiles (
                                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -93,45 +160,138 @@ class DatabaseAccess():
                                 session_id INTEGER,
                                 FOREIGN KEY (session_id) REFERENCES sessions(id)
                                 )''')
-            self.cursor.execute('''CREATE TABLE IF NOT EXISTS placed_tiles (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                coordinates VARCHAR(15),
-                                num_perfect_sides INTEGER,
-                                num_imperfect_sides INTEGER,
-                                num_unknown_sides INTEGER,
-                                tile_id INTEGER,
-                                FOREIGN KEY (tile_id) REFERENCES tiles(id)
-                                )''')
-            self.cursor.execute('''CREATE TABLE IF NOT EXISTS watched_coordinates (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                coordinates VARCHAR(15),
-                                session_id INTEGER,
+            self._migrate_coordinate_columns()
+            self._migrate_session_catalog()
+            self.cursor.execute(self.CREATE_PLACED_TILES_TABLE.format(table="placed_tiles"))
+            self.cursor.execute(
+                self.CREATE_WATCHED_COORDINATES_TABLE.format(table="watched_coordinates"))
+            self.cursor.execute('''CREATE INDEX IF NOT EXISTS tiles_session
+                                ON tiles (session_id)''')
+            self.cursor.execute('''CREATE INDEX IF NOT EXISTS placed_tiles_coordinates
+                                ON placed_tiles (x, y)''')
+            self.cursor.execute('''CREATE INDEX IF NOT EXISTS watched_coordinates_session
+                                ON watched_coordinates (session_id, x, y)''')
+            self.cursor.execute('''CREATE TABLE IF NOT EXISTS session_snapshots (
+                                session_id INTEGER PRIMARY KEY,
+                                version INTEGER,
+                                tiles_checksum VARCHAR(64),
+                                checksum VARCHAR(64),
+                                data BLOB,
                                 FOREIGN KEY (session_id) REFERENCES sessions(id)
                                 )''')
+            self.cursor.execute(self.CREATE_SESSION_JOURNAL_TABLE)
+            self.cursor.execute('''CREATE INDEX IF NOT EXISTS session_journal_session
+                                ON session_journal (session_id, seq)''')
             self.conn.commit()
+
+            # recover the operations that have been journaled before the last shutdown
+            self._compact_journal()
         finally:
             self.close_connection()
 
-    def fetch_all_sessions(self) -> pd.DataFrame:
+    def _migrate_coordinate_columns(self):
+        # databases of previous versions store the coordinates as strings "(x, y)",
+        # the tables are rebuilt with separate integer columns
+        for table, create_table, columns in [
+            ("placed_tiles", self.CREATE_PLACED_TILES_TABLE,
+             ["num_perfect_sides", "num_imperfect_sides", "num_unknown_sides", "tile_id"]),
+            ("watched_coordinates", self.CREATE_WATCHED_COORDINATES_TABLE, ["session_id"]),
+        ]:
+            self.cursor.execute(f'PRAGMA table_info({table})')
+            if "coordinates" not in [row[1] for row in self.cursor.fetchall()]:
+                continue
+
+            self.cursor.execute('BEGIN')
+            try:
+                self.cursor.execute(f'SELECT id, coordinates, {", ".join(columns)} FROM {table}')
+                rows = [(row_id, *TileRecord.parse_coordinates(coordinates), *values)
+                        for row_id, coordinates, *values in self.cursor.fetchall()]
+
+                self.cursor.execute(create_table.format(table=f"{table}_migrated"))
+                self.cursor.executemany(
+                    f'''INSERT INTO {table}_migrated (id, x, y, {", ".join(columns)})
+                        VALUES ({", ".join(["?"] * (len(columns) + 3))})''', rows)
+                self.cursor.execute(f'DROP TABLE {table}')
+                self.cursor.execute(f'ALTER TABLE {table}_migrated RENAME TO {table}')
+                self.cursor.execute('COMMIT')
+            except Exception as e:
+                # keep the previous schema if any error occurs
+                self.cursor.execute('ROLLBACK')
+                raise e
+
+    def _migrate_session_catalog(self):
+        # sessions of previous versions do not maintain their number of tiles and score,
+        # the number of tiles is counted once, the score remains unknown
+        self.cursor.execute('PRAGMA table_info(sessions)')
+        if "tile_count" in [row[1] for row in self.cursor.fetchall()]:
+            return
+
+        self.cursor.execute('BEGIN')
+        try:
+            self.cursor.execute('ALTER TABLE sessions ADD COLUMN tile_count INTEGER DEFAULT 0')
+            self.cursor.execute('ALTER TABLE sessions ADD COLUMN score INTEGER')
+            self.cursor.execute('''UPDATE sessions SET tile_count = (
+                                       SELECT COUNT(id) FROM tiles
+                                       WHERE tiles.session_id = sessions.id
+                                   )''')
+            self.cursor.execute('COMMIT')
+        except Exception as e:
+            # keep the previous schema if any error occurs
+            self.cursor.execute('ROLLBACK')
+            raise e
+
+    def create_tables_in_background(self):
+        """
+        Creates the tables in a background thread, e.g. after the application has been shown.
+        All other database operations wait for the creation to be finished.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+        """
+        if self.database is None:
+            raise RuntimeError("Database has not been loaded")
+
+        self.wait_for_setup()
+        self.setup_thread = threading.Thread(target=self._create_tables_safely, daemon=True)
+        self.setup_thread.start()
+
+    def wait_for_setup(self):
+        """
+        Blocks until the tables that are created in the background are available.
+        """
+        setup_thread = self.setup_thread
+        if setup_thread is not None and setup_thread is not threading.current_thread():
+            setup_thread.join()
+            self.setup_thread = None
+
+    def _create_tables_safely(self):
+        try:
+            self.create_tables()
+        except Exception as e:
+            print(f"ERROR: Creating the database tables was not successful: {e}")
+
+    def fetch_all_sessions(self) -> List[SessionInfo]:
         """
-        Fetches all sessions from the database and returns them as a Pandas DataFrame.
+        Fetches all sessions from the database.
 
         Returns:
-            DataFrame containing session information with columns:
-            'id', 'name', 'save_date', 'number_of_tiles'.
+            List of session information records with the fields:
+            'id', 'name', 'save_date', 'number_of_tiles', 'score'.
+            The summary is maintained with each modification, the tiles are not read.
 
         Raises:
             RuntimeError: If the database path (`self.database`) is `None`.
-            Any other exceptions raised by Pandas or SQLite operations.
+            Any other exceptions raised by SQLite operations.
         """
         self.start_connection()
 
         try:
-            query_sessions = '''SELECT s.id, s.name, save_date, COUNT(t.id) AS number_of_tiles
-                                FROM sessions s
-                                JOIN tiles t ON s.id = t.session_id
-                                GROUP BY s.id'''
-            return pd.read_sql_query(query_sessions, self.conn)
+            self._compact_journal()
+            query_sessions = '''SELECT id, name, save_date, tile_count, score
+                                FROM sessions
+                                ORDER BY id'''
+            self.cursor.execute(query_sessions)
+            return [DatabaseAccess.SessionInfo(*row) for row in self.cursor.fetchall()]
         finally:
             self.close_connection()
 
@@ -189,17 +349,19 @@ class DatabaseAccess():
                 # Get the current date as 'YYYY-MM-DD'
                 date = datetime.now().date().strftime('%Y-%m-%d')
                 self.cursor.execute('''
-                    INSERT INTO sessions (name, save_date)
-                    VALUES (?, ?)
-                ''', (name, date))
+                    INSERT INTO sessions (name, save_date, score)
+                    VALUES (?, ?, ?)
+                ''', (name, date, session.score))
                 session_id = self.cursor.lastrowid
 
-                for coordinates, tile in session.played_tiles.items():
-                    self.add_placed_tile(session_id, tile, commit_to_database=False)
+                self._add_placed_tiles(session_id, session.played_tiles.values())
 
                 if save_watched_coordinates:
-                    for coordinates in session.watched_open_coords.keys():
-                        self.add_watched_coordinates(session_id, coordinates)
+                    self.cursor.executemany('''
+                        INSERT INTO watched_coordinates (x, y, session_id)
+                        VALUES (?, ?, ?)
+                    ''', [(*coordinates, session_id)
+                          for coordinates in session.watched_open_coords.keys()])
 
                 self.cursor.execute('COMMIT')
                 return session_id
@@ -210,13 +372,18 @@ class DatabaseAccess():
         finally:
             self.close_connection()
 
-    def fill_session_tiles(self, session_id, played_tiles) -> int:
+    def fill_session_tiles(self, session_id, played_tiles, replace=False, score=None) -> int:
         """
         Fills a session with new played tiles in the database.
 
         Args:
             session_id (int): The ID of the session to update.
             played_tiles (dict): Dictionary of coordinates and tiles to add to the session.
+            replace (bool, optional): Whether to delete the tiles and watched coordinates
+                                      of the session first (within the same transaction).
+                                      Defaults to False.
+            score (int, optional): The updated score of the session.
+                                   Defaults to None, which keeps the previous score.
 
         Returns:
             The ID of the updated session.
@@ -238,13 +405,15 @@ class DatabaseAccess():
                 if not self.cursor.fetchone():
                     raise ValueError(f"No session with id {session_id}")
 
-                # Update session date ('YYYY-MM-DD')
+                if replace:
+                    self._delete_session_data(session_id)
+
+                # Update session date ('YYYY-MM-DD') and score
                 date = datetime.now().date().strftime('%Y-%m-%d')
-                self.cursor.execute('UPDATE sessions SET save_date = ? WHERE id = ?',
-                                    (date, session_id))
+                self.cursor.execute('''UPDATE sessions SET save_date = ?, score = COALESCE(?, score)
+                                       WHERE id = ?''', (date, score, session_id))
 
-                for tile in played_tiles.values():
-                    self.add_placed_tile(session_id, tile, commit_to_database=False)
+                self._add_placed_tiles(session_id, played_tiles.values())
 
                 self.cursor.execute('COMMIT')
                 return session_id
@@ -255,7 +424,7 @@ class DatabaseAccess():
         finally:
             self.close_connection()
 
-    def load_session(self, session_id) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def load_session(self, session_id) -> Tuple[List[TileRecord], List[Tuple[int, int]]]:
         """
         Loads session data from the database based on session ID.
 
@@ -263,125 +432,267 @@ class DatabaseAccess():
             id (int): The ID of the session to load.
 
         Returns:
-            A tuple containing two DataFrames:
-                - data: DataFrame containing the tiles in the session
-                - watched_coords: DataFrame of watched coordinates (if existing)
+            A tuple containing:
+                - tile_records: List of the tiles in the session in order of placement
+                - watched_coords: List of watched coordinates (if existing)
 
         Raises:
-            ValueError: If no session exists with the given `id`.
             RuntimeError: If the database path (`self.database`) is `None`.
-            Any other exceptions raised by SQLite or Pandas operations.
+            Any other exceptions raised by SQLite operations.
+        """
+        tile_records = [record
+                        for chunk in self.iterate_session_tiles(session_id)
+                        for record in chunk]
+        return (tile_records, self.fetch_watched_coordinates(session_id))
+
+    def count_session_tiles(self, session_id) -> int:
+        """
+        Counts the tiles of a session.
+
+        Args:
+            session_id (int): The ID of the session.
+
+        Returns:
+            The number of tiles in the session, 0 if the session does not exist.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite operations.
         """
         self.start_connection()
 
         try:
-            query_tiles = 'SELECT * FROM tiles'
-            query_placed_tiles = 'SELECT * FROM placed_tiles'
-            query_watched_coords = 'SELECT * FROM watched_coordinates WHERE session_id = ?'
-            query_sessions = 'SELECT * FROM sessions WHERE id = ?'
-
-            df_tiles = pd.read_sql_query(query_tiles, self.conn)
-            df_placed_tiles = pd.read_sql_query(query_placed_tiles, self.conn)
-            df_watched_coords = pd.read_sql_query(query_watched_coords, self.conn,
-                                                  params=(int(session_id),))
-            df_sessions = pd.read_sql_query(query_sessions, self.conn, params=(int(session_id),))
-
-            # Merge DataFrames based on key/foreign key pairs
-            merged_df = pd.merge(df_tiles, df_placed_tiles,
-                                 left_on='id', right_on='tile_id',
-                                 suffixes=('_tile', '_placed'))
-            merged_df = pd.merge(merged_df, df_sessions,
-                                 left_on='session_id', right_on='id',
-                                 suffixes=('_merged', '_session'))
-
-            merged_df.drop(columns=["id_tile", "id", "name", "id_placed"], inplace=True)
-            merged_df.set_index("tile_id", inplace=True)
-
-            return (merged_df, df_watched_coords)
+            self._compact_journal(session_id)
+            self.cursor.execute('SELECT COUNT(id) FROM tiles WHERE session_id = ?',
+                                (int(session_id),))
+            return self.cursor.fetchone()[0]
         finally:
             self.close_connection()
 
-    def add_placed_tile(self, session_id, tile, commit_to_database=True):
+    def iterate_session_tiles(self, session_id, chunk_size=1000) -> Iterator[List[TileRecord]]:
         """
-        Adds a placed tile to the database for a session.
+        Reads the tiles of a session in chunks, without loading all tiles into memory.
+        Uses a separate connection, so that other database operations may be executed
+        in between the chunks.
 
         Args:
-            session_id (int): The ID of the session to add the tile to.
-            tile (Tile): The Tile object to add.
-            commit_to_database (bool, optional):
-                Whether to commit changes immediately to the database.
-                Defaults to True.
+            session_id (int): The ID of the session.
+            chunk_size (int, optional): The maximum number of tiles per chunk. Defaults to 1000.
+
+        Yields:
+            List of the next tiles in the session in order of placement.
 
         Raises:
             RuntimeError: If the database path (`self.database`) is `None`.
-            Any other exceptions raised by SQLite or internal methods.
+            Any other exceptions raised by SQLite operations.
+        """
+        if self.database is None:
+            raise RuntimeError("Database has not been loaded")
+
+        self.compact_journal(session_id)
+        conn = sqlite3.connect(self.database)
+        try:
+            cursor = conn.execute(self.SELECT_TILE_RECORDS + '''
+                                      WHERE t.session_id = ?
+                                      ORDER BY t.id''', (int(session_id),))
+            while chunk := cursor.fetchmany(chunk_size):
+                yield [self._to_tile_record(row) for row in chunk]
+        finally:
+            conn.close()
+
+    def fetch_watched_coordinates(self, session_id) -> List[Tuple[int, int]]:
+        """
+        Fetches the watched coordinates of a session.
+
+        Args:
+            session_id (int): The ID of the session.
+
+        Returns:
+            List of watched coordinates in the order they have been saved.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite operations.
         """
         self.start_connection()
 
-        self.cursor.execute(
-            '''
-            INSERT INTO tiles (side_type_seq, center_type, quest_type, session_id)
-            VALUES (?, ?, ?, ?)
-            ''',
-            (tile.get_side_type_seq(),
-                SIDE_TYPE_TO_CHAR[tile.get_center().type],
-                SIDE_TYPE_TO_CHAR[tile.quest.type] if tile.quest is not None else "",
-                session_id))
-        tile_id = self.cursor.lastrowid
-
-        side_numbers = [tile.get_num_sides(type)
-                        for type in [Side.Placement.PERFECT_MATCH,
-                                    Side.Placement.IMPERFECT_MATCH,
-                                    Side.Placement.UNKNOWN_MATCH]]
+        try:
+            self.cursor.execute('''SELECT x, y FROM watched_coordinates
+                                   WHERE session_id = ?
+                                   ORDER BY id''', (int(session_id),))
+            return self.cursor.fetchall()
+        finally:
+            self.close_connection()
+
+    def save_session_snapshot(self, session_id, snapshot: SessionSnapshot):
+        """
+        Saves the snapshot of the derived state of a session, replacing any previous snapshot.
 
-        self.cursor.execute('''
-                            INSERT INTO placed_tiles (
-                            coordinates,
-                            num_perfect_sides, num_imperfect_sides, num_unknown_sides,
-                            tile_id)
-                            VALUES (?, ?, ?, ?, ?)
-                            ''',
-                            (str(tile.coordinates), *side_numbers, tile_id))
-        if commit_to_database:
-            # Update session date ('YYYY-MM-DD')
-            date = datetime.now().date().strftime('%Y-%m-%d')
-            self.cursor.execute('UPDATE sessions SET save_date = ? WHERE id = ?',
-                                (date, session_id))
+        Args:
+            session_id (int): The ID of the session.
+            snapshot (SessionSnapshot): The snapshot to save.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite operations.
+        """
+        self.start_connection()
+
+        try:
+            self.cursor.execute('''INSERT OR REPLACE INTO session_snapshots (
+                                       session_id, version, tiles_checksum, checksum, data)
+                                   VALUES (?, ?, ?, ?, ?)''', (int(session_id), *snapshot))
             self.conn.commit()
+        finally:
+            self.close_connection()
 
-    def remove_last_placed_tile(self, session_id) -> bool:
+    def fetch_session_snapshot(self, session_id) -> Optional[SessionSnapshot]:
         """
-        Removes the last placed tile from the database for a session.
+        Fetches the snapshot of the derived state of a session.
 
         Args:
-            session_id (int): The ID of the session to remove the last placed tile from.
+            session_id (int): The ID of the session.
 
         Returns:
-            True if the tile was successfully removed, False otherwise.
+            The snapshot, None if no snapshot has been saved for the session.
+            The snapshot needs to be validated against the tiles of the session before use.
 
         Raises:
             RuntimeError: If the database path (`self.database`) is `None`.
-            Any other exceptions raised by SQLite or internal methods.
+            Any other exceptions raised by SQLite operations.
         """
         self.start_connection()
 
-        # Find the most recently added placed tile for the given session
-        self.cursor.execute('''SELECT pt.id, pt.tile_id FROM placed_tiles pt
-                            JOIN tiles t ON pt.tile_id = t.id
-                            WHERE t.session_id = ?
-                            ORDER BY pt.id DESC
-                            LIMIT 1''', (session_id,))
-        result = self.cursor.fetchone()
-        if result:
-            placed_tile_id, tile_id = result
-            # Delete the most recently added placed tile and corresponding tile
-            self.cursor.execute('DELETE FROM placed_tiles WHERE id = ?',
-                                (placed_tile_id,))
-            self.cursor.execute('DELETE FROM tiles WHERE id = ?',
-                                (tile_id,))
-            self.conn.commit()
-            return True
-        return False
+        try:
+            self.cursor.execute('''SELECT version, tiles_checksum, checksum, data
+                                   FROM session_snapshots
+                                   WHERE session_id = ?''', (int(session_id),))
+            row = self.cursor.fetchone()
+            return SessionSnapshot(*row) if row is not None else None
+        finally:
+            self.close_connection()
+
+    def fetch_tiles_in_region(self, session_id, min_coordinates, max_coordinates) \
+            -> List[TileRecord]:
+        """
+        Fetches the tiles of a session that are placed within a rectangular region.
+
+        Args:
+            session_id (int): The ID of the session.
+            min_coordinates (tuple): The minimum (x, y) coordinates of the region (inclusive).
+            max_coordinates (tuple): The maximum (x, y) coordinates of the region (inclusive).
+
+        Returns:
+            List of the tiles within the region in order of placement.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite operations.
+        """
+        self.start_connection()
+
+        try:
+            self._compact_journal(session_id)
+            self.cursor.execute(self.SELECT_TILE_RECORDS + '''
+                                WHERE t.session_id = ?
+                                AND pt.x BETWEEN ? AND ? AND pt.y BETWEEN ? AND ?
+                                ORDER BY t.id''',
+                                (int(session_id),
+                                 min_coordinates[0], max_coordinates[0],
+                                 min_coordinates[1], max_coordinates[1]))
+            return [self._to_tile_record(row) for row in self.cursor.fetchall()]
+        finally:
+            self.close_connection()
+
+    def fetch_tile_histogram(self, session_id=None) -> Dict[Tuple[SideType, ...], int]:
+        """
+        Counts the tiles per canonical side types, see `SeenTilesIndex.get_canonical_side_types`.
+        The tiles are grouped by the database, therefore only the distinct side type
+        sequences are processed.
+
+        Args:
+            session_id (int, optional): The ID of the session, all sessions if None.
+
+        Returns:
+            Number of tiles per canonical side types.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite operations.
+        """
+        self.start_connection()
+
+        try:
+            self._compact_journal(session_id)
+            if session_id is None:
+                self.cursor.execute('''SELECT side_type_seq, COUNT(id) FROM tiles
+                                       GROUP BY side_type_seq''')
+            else:
+                self.cursor.execute('''SELECT side_type_seq, COUNT(id) FROM tiles
+                                       WHERE session_id = ?
+                                       GROUP BY side_type_seq''', (int(session_id),))
+            rows = self.cursor.fetchall()
+        finally:
+            self.close_connection()
+
+        histogram = {}
+        for side_type_seq, count in rows:
+            sides = Tile.extract_subsection_sides(side_type_seq)
+            side_types = SeenTilesIndex.get_canonical_side_types(
+                tuple(sides[s].type for s in TileSubsection.get_side_values())
+            )
+            histogram[side_types] = histogram.get(side_types, 0) + count
+        return histogram
+
+    @staticmethod
+    def _to_tile_record(row) -> TileRecord:
+        x, y, side_type_seq, center_type, quest_type = row
+        return TileRecord((x, y), side_type_seq, center_type, quest_type or None)
+
+    def _add_placed_tiles(self, session_id, tiles):
+        self._insert_tile_rows(session_id, [self._to_tile_row(tile) for tile in tiles])
+
+    @staticmethod
+    def _to_tile_row(tile):
+        # (x, y, side type sequence, center type, quest type, number of perfect,
+        #  imperfect and unknown sides) of a tile
+        return (
+            *tile.coordinates,
+            tile.get_side_type_seq(),
+            SIDE_TYPE_TO_CHAR[tile.get_center().type],
+            SIDE_TYPE_TO_CHAR[tile.quest.type] if tile.quest is not None else "",
+            tile.get_num_sides(Side.Placement.PERFECT_MATCH),
+            tile.get_num_sides(Side.Placement.IMPERFECT_MATCH),
+            tile.get_num_sides(Side.Placement.UNKNOWN_MATCH),
+        )
+
+    def _insert_tile_rows(self, session_id, tile_rows):
+        # bulk insert within the running transaction, the tile ids are assigned upfront
+        # so that the placed tiles may reference them without reading back each row id
+        self.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM tiles')
+        first_tile_id = self.cursor.fetchone()[0] + 1
+
+        self.cursor.executemany('''
+            INSERT INTO tiles (id, side_type_seq, center_type, quest_type, session_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(tile_id, side_type_seq, center_type, quest_type, session_id)
+              for tile_id, (_, _, side_type_seq, center_type, quest_type, *_)
+              in enumerate(tile_rows, start=first_tile_id)])
+        self.cursor.executemany('''
+            INSERT INTO placed_tiles (
+                x, y,
+                num_perfect_sides, num_imperfect_sides, num_unknown_sides,
+                tile_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(x, y, *side_numbers, tile_id)
+              for tile_id, (x, y, _, _, _, *side_numbers)
+              in enumerate(tile_rows, start=first_tile_id)])
+        self._add_to_tile_count(session_id, len(tile_rows))
+
+    def _add_to_tile_count(self, session_id, num_tiles):
+        # maintain the number of tiles of the session catalog
+        self.cursor.execute('UPDATE sessions SET tile_count = tile_count + ? WHERE id = ?',
+                            (num_tiles, int(session_id)))
 
     def add_watched_coordinates(self, session_id, coordinates):
         """
@@ -399,11 +710,164 @@ class DatabaseAccess():
 
         self.cursor.execute('''
                             INSERT INTO watched_coordinates (
-                                coordinates,
+                                x, y,
                                 session_id)
-                            VALUES (?, ?)
+                            VALUES (?, ?, ?)
                             ''',
-                            (str(coordinates), session_id))
+                            (*coordinates, session_id))
+
+    def journal_placed_tiles(self, session_id, tiles, reset=False, score=None):
+        """
+        Appends the placement of tiles to the journal of a session.
+        The saved tiles of the session are only updated once the journal is compacted.
+
+        Args:
+            session_id (int): The ID of the session.
+            tiles (Iterable[Tile]): The placed tiles in order of placement.
+            reset (bool, optional): Whether to discard the previous tiles of the session.
+                                    Defaults to False.
+            score (int, optional): The score of the session after the placement.
+                                   Defaults to None, which keeps the previous score.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite or internal methods.
+        """
+        entries = [(self.JournalOperation.RESET, *[None] * 9)] if reset else []
+        entries += [(self.JournalOperation.PLACE, *self._to_tile_row(tile), None)
+                    for tile in tiles]
+        if entries:
+            entries[-1] = (*entries[-1][:-1], score)
+        self._append_to_journal(session_id, entries)
+
+    def journal_undo(self, session_id, score=None):
+        """
+        Appends the removal of the last placed tile to the journal of a session.
+
+        Args:
+            session_id (int): The ID of the session.
+            score (int, optional): The score of the session after the removal.
+                                   Defaults to None, which keeps the previous score.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite or internal methods.
+        """
+        self._append_to_journal(session_id, [(self.JournalOperation.UNDO, *[None] * 8, score)])
+
+    def compact_journal(self, session_id=None):
+        """
+        Applies the journaled operations to the saved tiles and clears the journal.
+
+        Args:
+            session_id (int, optional): The ID of the session to compact.
+                                        Defaults to None, which compacts all sessions.
+
+        Raises:
+            RuntimeError: If the database path (`self.database`) is `None`.
+            Any other exceptions raised by SQLite or internal methods.
+        """
+        self.start_connection()
+
+        try:
+            self._compact_journal(session_id)
+        finally:
+            self.close_connection()
+
+    def _append_to_journal(self, session_id, entries):
+        self.start_connection()
+
+        try:
+            self.cursor.execute('BEGIN')
+            try:
+                self.cursor.executemany('''
+                    INSERT INTO session_journal (
+                        session_id, operation,
+                        x, y, side_type_seq, center_type, quest_type,
+                        num_perfect_sides, num_imperfect_sides, num_unknown_sides,
+                        score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(int(session_id), *entry) for entry in entries])
+                self.cursor.execute('COMMIT')
+            except Exception as e:
+                self.cursor.execute('ROLLBACK')
+                raise e
+
+            self.cursor.execute('SELECT COUNT(seq) FROM session_journal WHERE session_id = ?',
+                                (int(session_id),))
+            if self.cursor.fetchone()[0] >= self.JOURNAL_COMPACTION_INTERVAL:
+                self._compact_journal(session_id)
+        finally:
+            self.close_connection()
+
+    def _compact_journal(self, session_id=None):
+        if session_id is None:
+            self.cursor.execute('SELECT DISTINCT session_id FROM session_journal')
+            for (journal_session_id,) in self.cursor.fetchall():
+                self._compact_journal(journal_session_id)
+            return
+
+        self.cursor.execute('''SELECT seq, operation,
+                                      x, y, side_type_seq, center_type, quest_type,
+                                      num_perfect_sides, num_imperfect_sides, num_unknown_sides,
+                                      score
+                               FROM session_journal
+                               WHERE session_id = ?
+                               ORDER BY seq''', (int(session_id),))
+        entries = self.cursor.fetchall()
+        if not entries:
+            return
+
+        # reduce the journal to the net changes of the saved tiles
+        reset = False
+        num_undone_tiles = 0  # number of saved tiles to remove
+        tile_rows = []  # tiles to add
+        score = None  # latest score
+        for _, operation, *tile_row, entry_score in entries:
+            if entry_score is not None:
+                score = entry_score
+            if operation == self.JournalOperation.RESET:
+                reset = True
+                num_undone_tiles = 0
+                tile_rows = []
+            elif operation == self.JournalOperation.PLACE:
+                tile_rows.append(tile_row)
+            elif tile_rows:
+                tile_rows.pop()
+            else:
+                num_undone_tiles += 1
+
+        self.cursor.execute('BEGIN')
+        try:
+            if reset:
+                self._delete_session_data(session_id)
+            elif num_undone_tiles > 0:
+                self.cursor.execute('''
+                    DELETE FROM placed_tiles
+                    WHERE tile_id IN (
+                        SELECT id FROM tiles WHERE session_id = ? ORDER BY id DESC LIMIT ?
+                    )
+                ''', (int(session_id), num_undone_tiles))
+                self.cursor.execute('''
+                    DELETE FROM tiles
+                    WHERE id IN (
+                        SELECT id FROM tiles WHERE session_id = ? ORDER BY id DESC LIMIT ?
+                    )
+                ''', (int(session_id), num_undone_tiles))
+                self._add_to_tile_count(session_id, -self.cursor.rowcount)
+
+            self._insert_tile_rows(session_id, tile_rows)
+
+            date = datetime.now().date().strftime('%Y-%m-%d')
+            self.cursor.execute('''UPDATE sessions SET save_date = ?, score = COALESCE(?, score)
+                                   WHERE id = ?''', (date, score, int(session_id)))
+            self.cursor.execute('DELETE FROM session_journal WHERE session_id = ? AND seq <= ?',
+                                (int(session_id), entries[-1][0]))
+            self.cursor.execute('COMMIT')
+        except Exception as e:
+            # keep the journal to retry the compaction later on
+            self.cursor.execute('ROLLBACK')
+            raise e
 
     def delete_session_and_related(self, session_id, leave_empty_session=False):
         """
@@ -433,25 +897,7 @@ class DatabaseAccess():
                 if not self.cursor.fetchone():
                     raise ValueError(f"No session with id {session_id}")
 
-                # Delete placed_tiles that reference the tiles of the session
-                self.cursor.execute('''
-                    DELETE FROM placed_tiles
-                    WHERE tile_id IN (
-                        SELECT id FROM tiles WHERE session_id = ?
-                    )
-                ''', (int(session_id),))
-
-                # Delete tiles that reference the session
-                self.cursor.execute('''
-                    DELETE FROM tiles
-                    WHERE session_id = ?
-                ''', (int(session_id),))
-
-                # Delete watched coordinates that reference the session
-                self.cursor.execute('''
-                    DELETE FROM watched_coordinates
-                    WHERE session_id = ?
-                ''', (int(session_id),))
+                self._delete_session_data(session_id)
 
                 if not leave_empty_session:
                     # Delete the session
@@ -467,3 +913,39 @@ class DatabaseAccess():
                 raise e
         finally:
             self.close_connection()
+
+    def _delete_session_data(self, session_id):
+        # Delete placed_tiles that reference the tiles of the session
+        self.cursor.execute('''
+            DELETE FROM placed_tiles
+            WHERE tile_id IN (
+                SELECT id FROM tiles WHERE session_id = ?
+            )
+        ''', (int(session_id),))
+
+        # Delete tiles that reference the session
+        self.cursor.execute('''
+            DELETE FROM tiles
+            WHERE session_id = ?
+        ''', (int(session_id),))
+
+        # Delete watched coordinates that reference the session
+        self.cursor.execute('''
+            DELETE FROM watched_coordinates
+            WHERE session_id = ?
+        ''', (int(session_id),))
+
+        # Delete journaled operations of the session
+        self.cursor.execute('''
+            DELETE FROM session_journal
+            WHERE session_id = ?
+        ''', (int(session_id),))
+
+        # Delete the snapshot of the session
+        self.cursor.execute('''
+            DELETE FROM session_snapshots
+            WHERE session_id = ?
+        ''', (int(session_id),))
+
+        self.cursor.execute('UPDATE sessions SET tile_count = 0 WHERE id = ?',
+                            (int(session_id),))
@@ -1,29 +1,39 @@
+import itertools
 import uuid
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
 
 from src.side_type import SideType
 from src.tile_subsection import TileSubsection
 from src.tile import Tile
 from src.constants import Constants
+from src.rule_tables import RuleTables
 
 from functools import lru_cache
 
 class Group:
 
+    # groups of candidates are created and discarded in large numbers, therefore they are
+    # identified by cheap integer ids until they are added to a session (see make_persistent)
+    _temporary_ids = itertools.count()
+
     def __init__(self, start_tile: Tile, side_type: SideType,
                  subsections: List[TileSubsection], group_id=None):
         self.start_tile: Tile = start_tile
         self.start_tile_subsections: List[TileSubsection] = subsections
         self.type: SideType = side_type
         self.tile_coordinates: set[Tuple[int, int]] = {start_tile.coordinates}
+        # order-independent hash of the tile coordinates, maintained along with them,
+        # which allows to tell groups apart without comparing their coordinates
+        self.fingerprint: int = hash(start_tile.coordinates)
+        # (x, y) : subsections of the tile that have been counted for the group,
+        # kept by the group in order to not write into the played tiles during computation
+        self.tile_subsections: Dict[Tuple[int, int], List[TileSubsection]] = {}
         self.size: int = len(subsections)
         self.possible_extensions: Dict[Tuple[int, int] : List[TileSubsection]] = \
             {start_tile.get_neighbor_coords(s) : [Tile.get_opposing(s)]\
             for s in TileSubsection.get_side_values()}
-        if group_id is not None:
-            self.id = group_id
-        else:
-            self.id: str = str(uuid.uuid4()).replace('-', '')[:8]  # generate random uuid
+        self.id: Union[int, str] = \
+            group_id if group_id is not None else next(Group._temporary_ids)
 
         # contains ids of groups that have been consumed and therefore merged into this group
         self.consumed_groups: List[str] = []
@@ -32,14 +42,32 @@ class Group:
         if not isinstance(other, Group):
             return False
 
-        return self.type in Constants.COMPATIBLE_GROUP_TYPES[other.type] and\
-               sorted(self.tile_coordinates) == sorted(other.tile_coordinates) and\
+        # different fingerprints or sizes tell most groups apart right away,
+        # equal fingerprints are confirmed by the coordinates themselves
+        return self.fingerprint == other.fingerprint and\
                self.size == other.size and\
-               sorted(self.possible_extensions.keys()) == sorted(other.possible_extensions.keys())
+               RuleTables.COMPATIBLE_GROUP_TYPES[other.type][self.type] and\
+               self.tile_coordinates == other.tile_coordinates and\
+               self.possible_extensions.keys() == other.possible_extensions.keys()
 
     def __lt__(self, other):
         return self.start_tile.coordinates < other.start_tile.coordinates
 
+    def has_temporary_id(self):
+        return isinstance(self.id, int)
+
+    def make_persistent(self):
+        """
+        Replaces the temporary id of a group by a persistent id (random uuid),
+        which is unique across sessions.
+        """
+        if self.has_temporary_id():
+            self.id = str(uuid.uuid4()).replace('-', '')[:8]
+
+    @staticmethod
+    def compute_fingerprint(tile_coordinates):
+        return sum(hash(coordinates) for coordinates in tile_coordinates)
+
     @classmethod
     @lru_cache(maxsize=20)
     def is_type_restricted(cls, side_type):
@@ -62,15 +90,20 @@ class Group:
         # possibly merge groups that have been connected through the given tile
         groups = [gp.group for gp in tile.group_participation.values()]
         index_groups = []  # This will hold lists of indices grouped by equality of the groups
+        # equal groups share their fingerprint and size,
+        # therefore only groups within the same bucket need to be compared
+        index_groups_by_fingerprint = {}
         for i, group in enumerate(groups):
+            bucket = index_groups_by_fingerprint.setdefault((group.fingerprint, group.size), [])
             found_group = False
-            for index_group in index_groups:
+            for index_group in bucket:
                 if groups[index_group[0]] == group:
                     index_group.append(i)
                     found_group = True
                     break
             if not found_group:
                 index_groups.append([i])
+                bucket.append(index_groups[-1])
 
         for index_group in index_groups:
             # delete equal groups, only keep first
@@ -91,6 +124,8 @@ class Group:
     def compute(self, played_tiles):
         # reset as we are recomputing
         self.tile_coordinates.clear()
+        self.fingerprint = 0
+        self.tile_subsections = {}
         self.possible_extensions = {}
         self.size = 0
 
@@ -112,8 +147,8 @@ class Group:
             including the origin_subsection
         """
         origin_side = tile.get_side(origin_subsection)
-        compatible_types = Constants.COMPATIBLE_GROUP_TYPES[self.type]
-        if origin_side.type not in compatible_types:
+        compatible_types = RuleTables.COMPATIBLE_GROUP_TYPES[self.type]
+        if not compatible_types[origin_side.type]:
             # incompatible type at origin, therefore no connection to the group
             return []
 
@@ -125,7 +160,7 @@ class Group:
 
         group_connected_subsections = []
         for group_type, connected_subsections in connected_subsection_groups:
-            if group_type in compatible_types and origin_subsection in connected_subsections:
+            if compatible_types[group_type] and origin_subsection in connected_subsections:
                 group_connected_subsections = connected_subsections
                 break
 
@@ -155,7 +190,7 @@ class Group:
 
         for subsection in subsections:
             if subsection in self.possible_extensions[new_tile.coordinates] and \
-               new_tile.get_side(subsection).type in Constants.COMPATIBLE_GROUP_TYPES[self.type]:
+               RuleTables.COMPATIBLE_GROUP_TYPES[self.type][new_tile.get_side(subsection).type]:
                 return True
 
         return False
@@ -166,16 +201,23 @@ class Group:
 
         if tile.coordinates not in self.tile_coordinates:
             self.tile_coordinates.add(tile.coordinates)
-            # recompute tile group participation: keep track of subsections of the tile
-            # that have been seen already to avoid infinite recursion
-            tile.group_participation[self.id] = Tile.GroupParticipation(self, subsections=[])
-
+            self.fingerprint += hash(tile.coordinates)
+            # keep track of subsections of the tile that have been seen already
+            # to avoid infinite recursion
+            self.tile_subsections[tile.coordinates] = []
+            # only the participation of a tile that is not played yet (candidate) is updated,
+            # played tiles are only read
+            if tile.coordinates not in played_tiles:
+                tile.group_participation[self.id] = Tile.GroupParticipation(
+                    self, subsections=self.tile_subsections[tile.coordinates])
+
+        tile_subsections = self.tile_subsections[tile.coordinates]
         for subsection in subsections:
-            if subsection in tile.group_participation[self.id].subsections:
+            if subsection in tile_subsections:
                 continue
 
             # count the side
-            tile.group_participation[self.id].subsections.append(subsection)
+            tile_subsections.append(subsection)
             tile_group_size_contribution += 1
 
             # do not transition back to where we came from
@@ -199,8 +241,8 @@ class Group:
 
             opposing_tile = played_tiles[opposing_tile_coords]
 
-            if opposing_tile.get_side(opposing_subsection).type not in \
-                   Constants.COMPATIBLE_GROUP_TYPES[self.type]:
+            if not RuleTables.COMPATIBLE_GROUP_TYPES[self.type][
+                    opposing_tile.get_side(opposing_subsection).type]:
                 # opposing side is of an incompatible type -> no further expansion
                 continue
 
@@ -0,0 +1,53 @@
+from typing import Dict, Tuple
+
+from src.group import Group
+from src.tile_evaluation import TileEvaluation
+
+
+class GroupExtensionsIndex:
+    """
+    Index of the groups of a session by the coordinates at which they may be extended.
+
+    Groups of restricted types are additionally indexed on their own, as only these
+    may block the extension of other groups.
+    """
+
+    def __init__(self):
+        # (x, y) : ids of the groups that may be extended at the coordinates
+        self.group_ids: Dict[Tuple[int, int], Dict[str, None]] = {}
+        # (x, y) : ids of the groups of a restricted type that may be extended at the coordinates
+        self.restricted_group_ids: Dict[Tuple[int, int], Dict[str, None]] = {}
+        # group id : indexed extension coordinates of the group
+        self.extensions: Dict[str, Dict[Tuple[int, int], None]] = {}
+
+    def update(self, group: Group):
+        """
+        Updates the extension coordinates of a group after it has been computed.
+        """
+        indexed_coordinates = self.extensions.setdefault(group.id, {})
+        for coordinates in [c for c in indexed_coordinates
+                            if c not in group.possible_extensions]:
+            del indexed_coordinates[coordinates]
+            self._remove_group_id(coordinates, group.id)
+
+        restricted = group.type in TileEvaluation.RESTRICTED_DICT
+        for coordinates in group.possible_extensions:
+            if coordinates in indexed_coordinates:
+                continue
+            indexed_coordinates[coordinates] = None
+            self.group_ids.setdefault(coordinates, {})[group.id] = None
+            if restricted:
+                self.restricted_group_ids.setdefault(coordinates, {})[group.id] = None
+
+    def remove(self, group_id):
+        for coordinates in self.extensions.pop(group_id, {}):
+            self._remove_group_id(coordinates, group_id)
+
+    def _remove_group_id(self, coordinates, group_id):
+        for index in (self.group_ids, self.restricted_group_ids):
+            group_ids = index.get(coordinates)
+            if group_ids is None or group_id not in group_ids:
+                continue
+            del group_ids[group_id]
+            if not group_ids:
+                del index[coordinates]
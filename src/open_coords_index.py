@@ -0,0 +1,81 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from src.side import Side
+from src.side_type import SideType
+from src.tile import Tile
+from src.tile_evaluation import TileEvaluation
+
+
+class OpenCoordsIndex:
+    """
+    Index of the open coordinates by their pattern: the side types of the neighbors
+    opposing each side (UNKNOWN without neighbor).
+
+    The coordinates are bucketed by pattern, so that the placement of a tile orientation
+    is evaluated once per distinct pattern instead of once per open coordinates.
+    """
+
+    def __init__(self):
+        # (x, y) : pattern
+        self.patterns: Dict[Tuple[int, int], Tuple[SideType, ...]] = {}
+        # pattern : coordinates with that pattern
+        self.buckets: Dict[Tuple[SideType, ...], Dict[Tuple[int, int], None]] = {}
+
+    def update(self, coordinates, pattern):
+        pattern = tuple(pattern)
+        if self.patterns.get(coordinates) == pattern:
+            return
+
+        self.remove(coordinates)
+        self.patterns[coordinates] = pattern
+        self.buckets.setdefault(pattern, {})[coordinates] = None
+
+    def remove(self, coordinates):
+        if coordinates not in self.patterns:
+            return
+
+        pattern = self.patterns.pop(coordinates)
+        bucket = self.buckets[pattern]
+        del bucket[coordinates]
+        if not bucket:
+            del self.buckets[pattern]
+
+    def find_placements(self, orientations: List[Tuple[SideType, ...]]) \
+            -> List[Tuple[Tuple[int, int], int, Tile.Placement]]:
+        """
+        Finds the open coordinates where the given orientations of a tile may be placed.
+
+        Args:
+            orientations (List[Tuple[SideType, ...]]): The side types of each orientation.
+
+        Returns:
+            List of (coordinates, index of the orientation, placement) for every
+            placement that is possible, in no particular order.
+        """
+        placements = []
+        for pattern, coordinates in self.buckets.items():
+            for idx, side_types in enumerate(orientations):
+                placement = self.get_placement(side_types, pattern)
+                if placement != Tile.Placement.NOT_POSSIBLE:
+                    placements += [(coords, idx, placement) for coords in coordinates]
+        return placements
+
+    @staticmethod
+    @lru_cache(maxsize=100000)
+    def get_placement(side_types: Tuple[SideType, ...], pattern: Tuple[SideType, ...]) \
+            -> Tile.Placement:
+        """
+        Returns the placement of a tile with the given side types at open coordinates
+        with the given pattern, equal to `Tile.get_placement` after the side placements
+        have been updated.
+        """
+        side_placements = [TileEvaluation.compute_side_placement_match(side_type, opposing)
+                           for side_type, opposing in zip(side_types, pattern)]
+        if Side.Placement.NOT_POSSIBLE in side_placements:
+            return Tile.Placement.NOT_POSSIBLE
+        if Side.Placement.IMPERFECT_MATCH in side_placements:
+            return Tile.Placement.IMPERFECT
+        if Side.Placement.UNKNOWN_MATCH in side_placements:
+            return Tile.Placement.PERFECT
+        return Tile.Placement.PERFECTLY_CLOSED
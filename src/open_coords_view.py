@@ -0,0 +1,55 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class OpenCoordsView(Mapping):
+    """
+    Read-only view of open coordinates: a base mapping with some coordinates hidden
+    and some coordinates added, without copying the base.
+
+    The view reflects the base, it is meant to be used while the base is not modified,
+    e.g. for the rating of the candidates of a single computation.
+    """
+
+    def __init__(self, base: Mapping, removed: Optional[Set[Tuple[int, int]]] = None,
+                 added: Optional[Dict[Tuple[int, int], Optional[int]]] = None):
+        self.base = base
+        # coordinates of the base that are hidden
+        self.removed = {coords for coords in removed or () if coords in base}
+        # coordinates that are not part of the base
+        self.added = {coords: value for coords, value in (added or {}).items()
+                      if coords not in base}
+
+    def __contains__(self, coordinates):
+        if coordinates in self.added:
+            return True
+        return coordinates in self.base and coordinates not in self.removed
+
+    def __getitem__(self, coordinates):
+        if coordinates in self.added:
+            return self.added[coordinates]
+        if coordinates in self.removed:
+            raise KeyError(coordinates)
+        return self.base[coordinates]
+
+    def __iter__(self):
+        for coordinates in self.base:
+            if coordinates not in self.removed:
+                yield coordinates
+        yield from self.added
+
+    def __len__(self):
+        return len(self.base) - len(self.removed) + len(self.added)
+
+    def without(self, coordinates: Iterable[Tuple[int, int]]) -> "OpenCoordsView":
+        """
+        Returns a view on the same base that additionally hides the given coordinates.
+        """
+        added = dict(self.added)
+        removed = set(self.removed)
+        for coords in coordinates:
+            if coords in added:
+                del added[coords]
+            else:
+                removed.add(coords)
+        return OpenCoordsView(self.base, removed, added)
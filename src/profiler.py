@@ -0,0 +1,188 @@
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+
+class Profiler:
+    """
+    Collects the timings of the individual stages of a computation.
+
+    Profiling is disabled by default, in which case the instrumentation only costs a flag check.
+    It may be enabled through the environment variable `DORFTIPSTER_PROFILE` and cProfile/JSON
+    traces of every traced computation are written to the directory given by
+    `DORFTIPSTER_PROFILE_TRACES`.
+    """
+
+    ENV_ENABLE = "DORFTIPSTER_PROFILE"
+    ENV_TRACE_DIRECTORY = "DORFTIPSTER_PROFILE_TRACES"
+
+    _NULL_CONTEXT = nullcontext()
+
+    def __init__(self, enabled=False, trace_directory=None):
+        """
+        Creates a profiler.
+
+        Args:
+            enabled (bool, optional): Whether timings are collected. Defaults to False.
+            trace_directory (str, optional): Directory to write cProfile/JSON traces to.
+                                             Defaults to None (no traces).
+        """
+        self.enabled = enabled
+        self.trace_directory = trace_directory
+
+        # stage name : [number of calls, total duration in seconds]
+        self.stages = {}
+        # counter name : last recorded value
+        self.counters = {}
+        # name and duration in seconds of the last traced computation
+        self.trace_name = None
+        self.trace_duration = 0
+
+        self._tracing = False
+        self._num_traces = 0
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates a profiler that is configured through the environment variables.
+        """
+        trace_directory = os.environ.get(cls.ENV_TRACE_DIRECTORY) or None
+        enabled = os.environ.get(cls.ENV_ENABLE, "") not in ["", "0"] or \
+            trace_directory is not None
+        return cls(enabled, trace_directory)
+
+    def reset(self):
+        self.stages = {}
+        self.counters = {}
+        self.trace_name = None
+        self.trace_duration = 0
+
+    def add_timing(self, name, duration):
+        if name not in self.stages:
+            self.stages[name] = [0, 0]
+        self.stages[name][0] += 1
+        self.stages[name][1] += duration
+
+    def stage(self, name):
+        """
+        Returns a context manager that measures the duration of the enclosed block.
+        """
+        if not self.enabled:
+            return self._NULL_CONTEXT
+        return self._measure(name)
+
+    def record(self, name, value):
+        """
+        Records the value of a counter, e.g. the number of candidates.
+        """
+        if self.enabled:
+            self.counters[name] = value
+
+    @contextmanager
+    def trace(self, name):
+        """
+        Traces a full computation: resets the collected timings, measures the total duration,
+        writes the cProfile/JSON traces (if configured) and prints a summary line.
+        Nested traces are measured as regular stages.
+        """
+        if not self.enabled or self._tracing:
+            with self.stage(name):
+                yield
+            return
+
+        self.reset()
+        self._tracing = True
+        profile = cProfile.Profile() if self.trace_directory is not None else None
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self.trace_name = name
+            self.trace_duration = time.perf_counter() - start
+            self._tracing = False
+
+            if profile is not None:
+                self._write_traces(name, profile)
+            print(self.get_summary())
+
+    def get_results(self):
+        """
+        Returns the collected timings and counters.
+
+        Returns:
+            Dictionary containing:
+                - 'name' and 'total_ms' of the last traced computation
+                - 'stages': stage name to 'calls' and 'total_ms'
+                - 'counters': counter name to value
+        """
+        return {
+            "name": self.trace_name,
+            "total_ms": self.trace_duration * 1000,
+            "stages": {
+                name: {"calls": calls, "total_ms": duration * 1000}
+                for name, (calls, duration) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def get_summary(self, separator=" | "):
+        """
+        Returns the collected timings and counters, slowest stages first.
+
+        Args:
+            separator (str, optional): Separator between the entries.
+                                       Defaults to " | " (single line).
+        """
+        results = self.get_results()
+        stages = sorted(results["stages"].items(),
+                        key=lambda item: item[1]["total_ms"], reverse=True)
+        summary = f"PROFILE {results['name']}: {results['total_ms']:.1f} ms"
+        for name, value in results["counters"].items():
+            summary += f"{separator}{name}={value}"
+        for name, stage in stages:
+            summary += f"{separator}{name} {stage['total_ms']:.1f} ms ({stage['calls']}x)"
+        return summary
+
+    @contextmanager
+    def _measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def _write_traces(self, name, profile):
+        os.makedirs(self.trace_directory, exist_ok=True)
+        self._num_traces += 1
+        base_path = os.path.join(self.trace_directory, f"{name}_{self._num_traces:04d}")
+
+        profile.dump_stats(base_path + ".prof")
+        with open(base_path + ".json", "w", encoding="utf-8") as file:
+            json.dump(self.get_results(), file, indent=2)
+
+
+# profiler shared by all instrumented stages
+PROFILER = Profiler.from_environment()
+
+
+def profiled(function):
+    """
+    Decorator that measures every call of the given function as stage of the shared profiler.
+    """
+    name = function.__qualname__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.enabled:
+            return function(*args, **kwargs)
+        with PROFILER.stage(name):
+            return function(*args, **kwargs)
+
+    return wrapper
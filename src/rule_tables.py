@@ -0,0 +1,109 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from src.constants import Constants
+from src.side import Side
+from src.side_type import SideType
+
+
+class RuleCompiler:
+    """
+    Compiles the rule dicts into dense lookup tables over all pairs of side types.
+
+    A table is indexed by two side types, e.g. `table[side_type][other_side_type]`,
+    which avoids scanning the lists of the rule dicts in the hot paths.
+    A mask holds one bit per side type (`1 << side_type`).
+    """
+
+    @staticmethod
+    def compile_table(rule: Callable[[SideType, SideType], object]) -> Tuple[Tuple, ...]:
+        """
+        Evaluates the given rule for all pairs of side types.
+        """
+        return tuple(tuple(rule(side_type, other) for other in SideType) for side_type in SideType)
+
+    @staticmethod
+    def compile_relation(relation: Dict[SideType, List[SideType]]) -> Tuple[Tuple[bool, ...], ...]:
+        """
+        Compiles a dict of side type to listed side types,
+        `table[side_type][other]` is True if `other` is listed for `side_type`.
+        """
+        return RuleCompiler.compile_table(
+            lambda side_type, other: other in relation.get(side_type, []))
+
+    @staticmethod
+    def compile_inverse_masks(relation: Dict[SideType, List[SideType]]) -> Tuple[int, ...]:
+        """
+        Compiles a dict of side type to listed side types,
+        `masks[other]` is the mask of the side types for which `other` is listed.
+        """
+        return tuple(RuleCompiler.get_mask(side_type for side_type, others in relation.items()
+                                           if other in others)
+                     for other in SideType)
+
+    @staticmethod
+    def compile_score_table(score_list: List[Tuple[float, Dict[SideType, List[SideType]]]]) \
+            -> Tuple[Tuple[float, ...], ...]:
+        """
+        Compiles a list of scores with the pairs of side types they apply to,
+        `table[side_type][other]` is the first score that applies to the pair in any direction,
+        0 if none applies.
+        """
+        def get_score(side_type, other):
+            for score, side_types_container in score_list:
+                if other in side_types_container.get(side_type, []) or \
+                        side_type in side_types_container.get(other, []):
+                    return score
+            return 0
+        return RuleCompiler.compile_table(get_score)
+
+    @staticmethod
+    def get_mask(side_types: Iterable[SideType]) -> int:
+        mask = 0
+        for side_type in side_types:
+            mask |= 1 << side_type
+        return mask
+
+    @staticmethod
+    def match_side_types(side_type: SideType, opp_side_type: SideType) -> Side.Placement:
+        """
+        Returns the placement of a side against an opposing side.
+        """
+        if SideType.UNKNOWN in [side_type, opp_side_type]:
+            return Side.Placement.UNKNOWN_MATCH
+
+        # some types only allow placement against certain types
+        if (
+            side_type in Constants.RESTRICTED_DICT
+            and opp_side_type not in Constants.RESTRICTED_DICT[side_type]
+        ) or (
+            opp_side_type in Constants.RESTRICTED_DICT
+            and side_type not in Constants.RESTRICTED_DICT[opp_side_type]
+        ):
+            return Side.Placement.NOT_POSSIBLE
+
+        if opp_side_type in Constants.PERFECT_MATCH_DICT[side_type]:
+            return Side.Placement.PERFECT_MATCH
+
+        return Side.Placement.IMPERFECT_MATCH
+
+
+class RuleTables:
+    """
+    Lookup tables compiled at import time from the rule dicts in Constants,
+    which remain the single source of truth, see RuleCompiler.
+    """
+
+    # side type, group type : True if the side type is compatible with the group type
+    COMPATIBLE_GROUP_TYPES = RuleCompiler.compile_relation(Constants.COMPATIBLE_GROUP_TYPES)
+    # side type, side type : True if the second side type perfectly matches the first one
+    PERFECT_MATCH_TABLE = RuleCompiler.compile_relation(Constants.PERFECT_MATCH_DICT)
+    # side type : mask of the types whose perfect matches contain the side type
+    PERFECT_MATCH_MASKS = RuleCompiler.compile_inverse_masks(Constants.PERFECT_MATCH_DICT)
+    RESTRICTED_TYPES_MASK = RuleCompiler.get_mask(Constants.RESTRICTED_DICT)
+    # side type, side type : side placement
+    SIDE_PLACEMENT_TABLE = RuleCompiler.compile_table(RuleCompiler.match_side_types)
+    # side type, side type : score
+    DIRECT_NEIGHBOR_COMPATIBILITY_TABLE = RuleCompiler.compile_score_table(
+        Constants.DIRECT_NEIGHBOR_COMPATIBILITY_SCORE)
+    OTHER_NEIGHBOR_COMPATIBILITY_TABLE = RuleCompiler.compile_score_table(
+        Constants.OTHER_NEIGHBOR_COMPATIBILITY_SCORE)
@@ -0,0 +1,183 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from src.rule_tables import RuleTables
+from src.side_type import SideType
+from src.tile import Tile
+from src.tile_evaluation import TileEvaluation
+from src.tile_subsection import TileSubsection
+
+
+class SeenTilesIndex:
+    """
+    Index of the side types of the played tiles, which allows to find the tiles
+    that match given side types in any orientation.
+
+    Every tile is assigned a slot. For each side and side type, the slots of the tiles
+    with that type at that side are kept as bitset (int). A query for an orientation
+    is the AND over all sides of the OR of the compatible types,
+    the number of matching tiles is the popcount of the OR over all orientations.
+
+    Additionally, the tiles are cataloged by the canonical rotation of their side types,
+    which allows statistics over the distinct tiles.
+    """
+
+    NUM_SIDES = len(TileSubsection.get_side_values())
+
+    def __init__(self):
+        # (x, y) : side types of the tile
+        self.side_types: Dict[Tuple[int, int], Tuple[SideType, ...]] = {}
+        # (x, y) : slot of the tile
+        self.slots: Dict[Tuple[int, int], int] = {}
+        # slot : (x, y), None for slots that have been freed
+        self.slot_coordinates: List[Tuple[int, int]] = []
+        self.free_slots: List[int] = []
+        # [side][side type] : bitset of the slots
+        self.bitsets: List[List[int]] = [[0] * len(SideType) for _ in range(self.NUM_SIDES)]
+        # canonical side types : coordinates of the tiles
+        self.catalog: Dict[Tuple[SideType, ...], Dict[Tuple[int, int], None]] = {}
+
+    def __eq__(self, other):
+        if isinstance(other, SeenTilesIndex):
+            return self.side_types == other.side_types
+        return False
+
+    def add_tile(self, tile: Tile):
+        if tile.coordinates in self.slots:
+            self.remove_tile(tile)
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.slot_coordinates[slot] = tile.coordinates
+        else:
+            slot = len(self.slot_coordinates)
+            self.slot_coordinates.append(tile.coordinates)
+        self.slots[tile.coordinates] = slot
+
+        side_types = tuple(tile.get_side(s).type for s in TileSubsection.get_side_values())
+        self.side_types[tile.coordinates] = side_types
+        bit = 1 << slot
+        for side, side_type in enumerate(side_types):
+            self.bitsets[side][side_type] |= bit
+        self.catalog.setdefault(self.get_canonical_side_types(side_types), {})[
+            tile.coordinates] = None
+
+    def remove_tile(self, tile: Tile):
+        if tile.coordinates not in self.slots:
+            return
+
+        slot = self.slots.pop(tile.coordinates)
+        bit = 1 << slot
+        side_types = self.side_types.pop(tile.coordinates)
+        for side, side_type in enumerate(side_types):
+            self.bitsets[side][side_type] &= ~bit
+
+        canonical_side_types = self.get_canonical_side_types(side_types)
+        coordinates = self.catalog[canonical_side_types]
+        del coordinates[tile.coordinates]
+        if not coordinates:
+            del self.catalog[canonical_side_types]
+        self.slot_coordinates[slot] = None
+        self.free_slots.append(slot)
+
+    def count_matching_tiles(self, side_types: List[SideType]) -> int:
+        """
+        Counts the tiles that perfectly match the given side types in any orientation.
+
+        Args:
+            side_types (List[SideType]): The side types to match, one per side.
+                UNKNOWN matches any side type.
+
+        Returns:
+            The number of matching tiles, 0 for invalid side types.
+        """
+        return self._match(side_types).bit_count()
+
+    def find_matching_tiles(self, side_types: List[SideType]) -> List[Tuple[int, int]]:
+        """
+        Returns the coordinates of the tiles that perfectly match the given side types
+        in any orientation, see `count_matching_tiles`.
+        """
+        matches = self._match(side_types)
+        coordinates = []
+        while matches:
+            lowest_bit = matches & -matches
+            coordinates.append(self.slot_coordinates[lowest_bit.bit_length() - 1])
+            matches ^= lowest_bit
+        return coordinates
+
+    def get_tile_histogram(self) -> Dict[Tuple[SideType, ...], int]:
+        """
+        Returns the number of tiles per canonical side types, see `get_canonical_side_types`.
+        """
+        return {side_types: len(coordinates) for side_types, coordinates in self.catalog.items()}
+
+    @classmethod
+    def matches(cls, tile_side_types, side_types) -> bool:
+        """
+        Checks whether a tile perfectly matches the given side types in any orientation,
+        see `count_matching_tiles`.
+
+        Args:
+            tile_side_types (List[SideType]): The side types of the tile, one per side.
+            side_types (List[SideType]): The side types to match, one per side.
+        """
+        # the result does not depend on the orientation of the tile,
+        # therefore it is cached per canonical side types
+        return cls._matches_canonical(cls.get_canonical_side_types(tuple(tile_side_types)),
+                                      tuple(side_types))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_canonical_side_types(side_types: Tuple[SideType, ...]) -> Tuple[SideType, ...]:
+        """
+        Returns the lexicographically minimal rotation of the side types,
+        which is the same for all orientations of a tile.
+        """
+        return min(side_types[i:] + side_types[:i] for i in range(len(side_types)))
+
+    @classmethod
+    @lru_cache(maxsize=100000)
+    def _matches_canonical(cls, canonical_side_types, side_types) -> bool:
+        return any(
+            all(side_type == SideType.UNKNOWN or
+                RuleTables.PERFECT_MATCH_TABLE[side_type][
+                    canonical_side_types[(position + rotation) % cls.NUM_SIDES]]
+                for position, side_type in enumerate(side_types))
+            for rotation in range(cls.NUM_SIDES)
+        )
+
+    def _match(self, side_types) -> int:
+        if not isinstance(side_types, list) or len(side_types) != self.NUM_SIDES or \
+                not self.slots:
+            return 0
+
+        # bitset of the tiles matching the side type at the given position
+        # for each side of the tiles, UNKNOWN side types are skipped
+        compatible = []
+        for side_type in side_types:
+            if side_type == SideType.UNKNOWN:
+                compatible.append(None)
+                continue
+            compatible_types = TileEvaluation.PERFECT_MATCH_DICT[side_type]
+            compatible.append([self._union(side, compatible_types)
+                               for side in range(self.NUM_SIDES)])
+
+        occupied_slots = self._union(0, SideType)
+        matches = 0
+        # the side at position p of an orientation is the side (p + rotation) of the tile
+        for rotation in range(self.NUM_SIDES):
+            orientation_matches = occupied_slots
+            for position, side_bitsets in enumerate(compatible):
+                if side_bitsets is not None:
+                    orientation_matches &= side_bitsets[(position + rotation) % self.NUM_SIDES]
+                    if not orientation_matches:
+                        break
+            matches |= orientation_matches
+        return matches
+
+    def _union(self, side, side_types) -> int:
+        bitset = 0
+        for side_type in side_types:
+            bitset |= self.bitsets[side][side_type]
+        return bitset
@@ -1,9 +1,8 @@
-import ast
-import copy
-from typing import Dict, Tuple, List
+import itertools
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Set, Tuple, List
 
-import pandas as pd
-from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
 
 from src.tile import Tile
 from src.side import Side
@@ -11,16 +10,23 @@ from src.tile_subsection import TileSubsection
 from src.side_type import SideType
 from src.tile_evaluation import TileEvaluation
 from src.tile_evaluation_factory import TileEvaluationFactory
+from src.tile_record import TileRecord
+from src.binary_session_file import BinarySessionFile
+from src.session_snapshot import SessionSnapshot
 from src.group import Group
+from src.group_extensions_index import GroupExtensionsIndex
 from src.database_access import DatabaseAccess
 from src.constants import DatabaseConstants
+from src.profiler import PROFILER, profiled
 
-from src.tree import Tree
+from src.open_coords_index import OpenCoordsIndex
+from src.open_coords_view import OpenCoordsView
+from src.seen_tiles_index import SeenTilesIndex
 
 
 class Session(QObject):
     # UI signals
-    dataframe_loaded = Signal(tuple)
+    tile_records_loaded = Signal(list)
     session_reset = Signal()
     session_updated = Signal(tuple)
     session_loaded = Signal()
@@ -35,17 +41,45 @@ class Session(QObject):
     candidate_rotated = Signal(tuple)
     watched_coordinates_changed = Signal(tuple)
     coordinates_selected = Signal(tuple)
-
-    def __init__(self, database_name=None, parent=None):
+    import_progress = Signal(tuple)
+    import_finished = Signal(bool)
+
+    # number of tiles that are placed in between progress updates when importing a session
+    IMPORT_CHUNK_SIZE = 250
+
+    class PlacementDelta:
+        """
+        Changes of the session state caused by the placement of a tile,
+        which allow to undo the placement without copying any state.
+        """
+
+        def __init__(self, tile):
+            self.tile: Tile = tile
+            # (coordinates, subsection, previous placement) of the neighbor sides facing the tile
+            self.neighbor_placements: List[Tuple[Tuple[int, int], TileSubsection,
+                                                 Side.Placement]] = []
+            # insertion number of the coordinates of the tile within the open coordinates,
+            # None if they have not been open before
+            self.removed_open_coords_order = None
+            # open coordinates that have been added next to the tile
+            self.added_open_coords: List[Tuple[int, int]] = []
+            # ids of groups that have been started by the tile
+            self.added_group_ids: List[str] = []
+            # groups that have been closed or merged by the tile
+            self.removed_groups: List[Group] = []
+            self.score: int = 0
+            # watched coordinates that have been occupied by the tile (if any)
+            self.unwatched_coords = None
+
+    def __init__(self, database_name=None, parent=None, defer_database_setup=False):
         super().__init__(parent)
 
         # (x, y) of tile : Tile
         self.played_tiles: Dict[Tuple[int, int], Tile] = {}
 
-        # stores the sides of played tiles in all orientation as a tree
-        # with the coordinates of the played tile at the leaf
-        # this allows very fast lookup
-        self.seen_tile_sides_tree = Tree()
+        # bitset index of the sides of played tiles,
+        # which allows very fast lookup of matching tiles in any orientation
+        self.seen_tiles_index = SeenTilesIndex()
 
         # group_id : Group
         self.groups: Dict[str, Group] = {}
@@ -54,12 +88,27 @@ class Session(QObject):
         self.groups_marked_for_deletion_at_coords: Dict[
             Tuple[int, int], List[Group]
         ] = {}
-
-        self.database = DatabaseAccess(database_name)
-
-        # (x, y) : None - coordinates that allow placement for future tiles
-        self.open_coords = {(0, 0): None}
-        self.previous_open_tiles = None
+        # ids of all groups in groups_marked_for_deletion_at_coords
+        self.marked_group_ids: Set[str] = set()
+        # groups by their possible extension coordinates, borrowed by the tile evaluation
+        self.group_extensions_index = GroupExtensionsIndex()
+
+        # with deferred setup, the tables are expected to be created through
+        # `database.create_tables_in_background()` once the application is shown
+        self.database = DatabaseAccess(database_name, defer_setup=defer_database_setup)
+
+        # (x, y) : insertion number - coordinates that allow placement for future tiles
+        self.open_coords = {(0, 0): 0}
+        # number of coordinates that have been added to the open coordinates
+        self.num_added_open_coords = 1
+        # open coordinates by the side types of their neighbors
+        self.open_coords_index = OpenCoordsIndex()
+        self.rebuild_open_coords_index()
+
+        # changes per placed tile in order of placement, which allow to undo the placements
+        self.placement_journal: List[Session.PlacementDelta] = []
+        # tiles that have been undone and may be placed again, the last undone tile at the end
+        self.redo_tiles: List[Tile] = []
 
         # (
         #    (x,y),
@@ -71,7 +120,9 @@ class Session(QObject):
         #   Number of tiles that have been played that would perfectly match at the coordinates
         # coordinates that are being watched by the user
         self.watched_open_coords = {}
-        self.watched_coords_cache = None
+        # (x, y) : side types of the neighbors of the watched coordinates,
+        # which allow to update the number of matching tiles without a lookup
+        self.watched_coords_side_types: Dict[Tuple[int, int], List[SideType]] = {}
 
         # score (without consideration of solved quests)
         self.score: int = 0
@@ -79,6 +130,9 @@ class Session(QObject):
         # Database ID of the corresponding autosave session
         self.autosave_id = -1
 
+        # (progress iterator, error message) of the import that is currently running
+        self.running_import = None
+
     def __enter__(self):
         return self
 
@@ -100,19 +154,25 @@ class Session(QObject):
 
     @Slot()
     def handle_reset_session(self):
+        self.cancel_import()
         self.reset()
         self.session_reset.emit()
 
     def reset(self):
         self.played_tiles = {}
-        self.seen_tile_sides_tree = Tree()
+        self.seen_tiles_index = SeenTilesIndex()
         self.groups = {}
         self.groups_marked_for_deletion_at_coords = {}
-        self.open_coords = {(0, 0): None}
-        self.previous_open_tiles = None
+        self.marked_group_ids = set()
+        self.group_extensions_index = GroupExtensionsIndex()
+        self.open_coords = {(0, 0): 0}
+        self.num_added_open_coords = 1
+        self.rebuild_open_coords_index()
+        self.placement_journal = []
+        self.redo_tiles = []
         self.coordinate_watch_candidate = None
         self.watched_open_coords = {}
-        self.watched_coords_cache = None
+        self.watched_coords_side_types = {}
         self.score = 0
         self.autosave_id = -1
 
@@ -129,9 +189,7 @@ class Session(QObject):
             coordinates in self.open_coords
             and coordinates not in self.watched_open_coords
         ):
-            self.watched_open_coords[coordinates] = (
-                self.get_num_played_tiles_matching_perfectly(coordinates)
-            )
+            self._count_watched_coordinates(coordinates)
             return True
         return False
 
@@ -146,6 +204,7 @@ class Session(QObject):
     def unwatch_coordinates(self, coordinates):
         if coordinates in self.watched_open_coords:
             del self.watched_open_coords[coordinates]
+            del self.watched_coords_side_types[coordinates]
             return True
         return False
 
@@ -169,8 +228,8 @@ class Session(QObject):
     @Slot(str)
     def handle_get_all_sessions_from_database(self, origin):
         try:
-            sessions_df = self.get_all_sessions_from_database()
-            self.sessions_loaded_from_database.emit((sessions_df, origin))
+            sessions = self.get_all_sessions_from_database()
+            self.sessions_loaded_from_database.emit((sessions, origin))
         except Exception as e:
             self.trigger_message_display.emit(
                 ("Error", "Error loading sessions from database:\n" + str(e))
@@ -207,7 +266,9 @@ class Session(QObject):
             )
 
     def save_to_database(self, session_name):
-        self.database.save_session(session_name, self)
+        session_id = self.database.save_session(session_name, self)
+        # allows to resume the session without replaying all tiles
+        self.database.save_session_snapshot(session_id, SessionSnapshot.capture(self))
 
     @Slot(str)
     def handle_save_session_to_csv(self, file_name):
@@ -229,21 +290,34 @@ class Session(QObject):
         if file_name is None or not file_name:
             raise ValueError("No file name specified")
 
-        list_of_tile_dicts = []
-        # id,coordinates,side_type_seq,center_type,quest_type
-        for i, tile in enumerate(self.played_tiles.values()):
-            tile_dict = {}
-            tile_dict["id"] = str(i)
-            tile_dict["coordinates"] = str(tile.coordinates)
-            tile_dict["side_type_seq"] = tile.get_side_type_seq()
-            tile_dict["center_type"] = tile.get_center().type.to_character()
-            tile_dict["quest_type"] = (
-                tile.quest.type.to_character() if tile.quest is not None else ""
+        TileRecord.write_csv(file_name, self.get_tile_records())
+
+    @Slot(str)
+    def handle_save_session_to_binary(self, file_name):
+        try:
+            self.save_to_binary(file_name)
+            self.trigger_message_display.emit(
+                ("Success", f"Session successfully saved to {file_name}")
+            )
+        except Exception as e:
+            self.trigger_message_display.emit(
+                ("Error", f"An error occured, could not save to {file_name}:\n{e}")
             )
-            list_of_tile_dicts.append(tile_dict)
 
-        data = pd.DataFrame(list_of_tile_dicts)
-        data.to_csv(file_name, index=False)
+    def save_to_binary(self, file_name):
+        if file_name is None or not file_name:
+            raise ValueError("No file name specified")
+
+        BinarySessionFile.write(file_name, self.get_tile_records(), self.watched_open_coords)
+
+    def get_tile_records(self) -> List[TileRecord]:
+        return [TileRecord.from_tile(tile) for tile in self.played_tiles.values()]
+
+    def to_dataframe(self):
+        """
+        Exports the played tiles as pandas DataFrame with the CSV columns (requires pandas).
+        """
+        return TileRecord.to_dataframe(self.get_tile_records())
 
     @Slot(tuple)
     def handle_load_session_from_database(self, args):
@@ -252,91 +326,237 @@ class Session(QObject):
 
             if load_tile_by_tile:
                 # no autosave when using tile by tile as this is for debugging purposes only
-                tile_data, watched_coords_data = self.database.load_session(session_id)
-                self.dataframe_loaded.emit(tile_data)
+                tile_records, _ = self.database.load_session(session_id)
+                self.tile_records_loaded.emit(tile_records)
             else:
-                self.load_from_database(session_id, load_simulated)
-                self.session_updated.emit(self)
-                self.session_loaded.emit()
+                self.start_import(self.iterate_load_from_database(session_id, load_simulated),
+                                  "Error loading from database:\n")
         except Exception as e:
             self.trigger_message_display.emit(
                 ("Error", "Error loading from database:\n" + str(e))
             )
 
     def load_from_database(self, session_id, simulate_tile_placement):
-        tile_data, watched_coords_data = self.database.load_session(session_id)
-        if tile_data is None or tile_data.empty:
+        for _ in self.iterate_load_from_database(session_id, simulate_tile_placement):
+            pass
+
+    def iterate_load_from_database(self, session_id, simulate_tile_placement) \
+            -> Iterator[Tuple[int, int]]:
+        """
+        Loads a session from the database, placing the tiles chunk by chunk.
+        Unless simulating, the derived state is restored at once from the snapshot
+        of the session, if there is a valid one.
+
+        Yields:
+            Tuple of the number of loaded tiles and the total number of tiles after each chunk.
+
+        Raises:
+            ValueError: If the session does not exist or does not contain any tiles.
+        """
+        num_tiles = self.database.count_session_tiles(session_id)
+        if num_tiles == 0:
             raise ValueError(f"Error while reading session with id {session_id}")
 
         self.reset()
-        self._load_tile_dataframe(tile_data, simulate_tile_placement)
+        record_chunks = self.database.iterate_session_tiles(session_id, self.IMPORT_CHUNK_SIZE)
+        snapshot = None if simulate_tile_placement \
+            else self.database.fetch_session_snapshot(session_id)
+        restored = False
+        if snapshot is not None:
+            tile_records = [record for chunk in record_chunks for record in chunk]
+            if snapshot.is_valid_for(tile_records):
+                snapshot.restore(self, tile_records)
+                restored = True
+                yield (num_tiles, num_tiles)
+            else:
+                # outdated or corrupted snapshot, replay the placement of all tiles
+                record_chunks = self._iterate_chunks(tile_records, self.IMPORT_CHUNK_SIZE)
+        if not restored:
+            yield from self._iterate_load_tile_records(
+                record_chunks, num_tiles, simulate_tile_placement
+            )
         if not simulate_tile_placement:
-            self._load_watched_coordinates_dataframe(watched_coords_data)
+            self._load_watched_coordinates(self.database.fetch_watched_coordinates(session_id))
 
     @Slot(str)
     def handle_load_session_from_csv(self, file_name):
-        try:
-            self.load_from_csv(file_name, simulate_tile_placement=False)
-            self.session_updated.emit(self)
-            self.session_loaded.emit()
-        except Exception as e:
-            self.trigger_message_display.emit(
-                (
-                    "Error",
-                    "An error occured:\n" + str(e) + "\n" + "Could not load ",
-                    file_name,
-                )
-            )
+        self.start_import(self.iterate_load_from_csv(file_name, simulate_tile_placement=False),
+                          f"An error occured, could not load {file_name}:\n")
 
     def load_from_csv(self, file_name, simulate_tile_placement):
+        for _ in self.iterate_load_from_csv(file_name, simulate_tile_placement):
+            pass
+
+    def iterate_load_from_csv(self, file_name, simulate_tile_placement) \
+            -> Iterator[Tuple[int, int]]:
+        """
+        Loads a session from a CSV file, placing the tiles chunk by chunk.
+        The file is streamed, only the tiles of the current chunk are kept in memory.
+
+        Yields:
+            Tuple of the number of loaded tiles and the total number of tiles after each chunk.
+
+        Raises:
+            ValueError: If no file name is specified or the file does not contain any tiles.
+            FileNotFoundError: If the file does not exist.
+        """
         if file_name is None or not file_name:
             raise ValueError("No file name specified")
 
-        data = pd.read_csv(file_name)
-        if data is None or data.empty:
+        num_tiles = TileRecord.count_csv(file_name)
+        if num_tiles == 0:
             raise ValueError(f"File {file_name} is empty or could not be read")
-        data.set_index("id", inplace=True)
 
         self.reset()
-        self._load_tile_dataframe(data, simulate_tile_placement)
+        yield from self._iterate_load_tile_records(
+            self._iterate_chunks(TileRecord.read_csv(file_name), self.IMPORT_CHUNK_SIZE),
+            num_tiles, simulate_tile_placement
+        )
+
+    @Slot(str)
+    def handle_load_session_from_binary(self, file_name):
+        self.start_import(self.iterate_load_from_binary(file_name, simulate_tile_placement=False),
+                          f"An error occured, could not load {file_name}:\n")
+
+    def load_from_binary(self, file_name, simulate_tile_placement):
+        for _ in self.iterate_load_from_binary(file_name, simulate_tile_placement):
+            pass
+
+    def iterate_load_from_binary(self, file_name, simulate_tile_placement) \
+            -> Iterator[Tuple[int, int]]:
+        """
+        Loads a session from a binary session file, placing the tiles chunk by chunk.
+        The file is memory mapped, only the tiles of the current chunk are decoded.
+
+        Yields:
+            Tuple of the number of loaded tiles and the total number of tiles after each chunk.
+
+        Raises:
+            ValueError: If no file name is specified, the file is not a valid binary session
+                        file or does not contain any tiles.
+            FileNotFoundError: If the file does not exist.
+        """
+        if file_name is None or not file_name:
+            raise ValueError("No file name specified")
+
+        session_file = BinarySessionFile(file_name)
+        if session_file.num_tiles == 0:
+            raise ValueError(f"File {file_name} does not contain any tiles")
+
+        self.reset()
+        yield from self._iterate_load_tile_records(
+            session_file.iterate_tile_records(self.IMPORT_CHUNK_SIZE),
+            session_file.num_tiles, simulate_tile_placement
+        )
+        if not simulate_tile_placement:
+            self._load_watched_coordinates(session_file.get_watched_coordinates())
+
+    def start_import(self, progress_iterator: Iterator[Tuple[int, int]], error_message):
+        """
+        Starts an import that places the tiles chunk by chunk in between processing UI events.
+        Progress is reported through `import_progress`, the end through `import_finished`.
+
+        Args:
+            progress_iterator (Iterator): Import that places a chunk on each iteration,
+                                          e.g. `iterate_load_from_csv`.
+            error_message (str): Message to display in front of errors raised by the import.
+        """
+        self.cancel_import()
+        self.running_import = (progress_iterator, error_message)
+        QTimer.singleShot(0, self.handle_import_next_chunk)
+
+    @Slot()
+    def handle_import_next_chunk(self):
+        if self.import_next_chunk():
+            # allows the UI to show the partially loaded board and to cancel the import
+            QTimer.singleShot(0, self.handle_import_next_chunk)
+
+    def import_next_chunk(self) -> bool:
+        """
+        Places the next chunk of tiles of the running import.
+
+        Returns:
+            True if there are more chunks to import, False otherwise.
+        """
+        if self.running_import is None:
+            return False
+
+        progress_iterator, error_message = self.running_import
+        try:
+            progress = next(progress_iterator, None)
+        except Exception as e:
+            self._finish_import(completed=False)
+            self.trigger_message_display.emit(("Error", error_message + str(e)))
+            return False
+
+        if progress is None:
+            self._finish_import(completed=True)
+            return False
+
+        self.session_updated.emit(self)
+        self.import_progress.emit(progress)
+        return True
+
+    @Slot()
+    def handle_cancel_import(self):
+        self.cancel_import()
+
+    def cancel_import(self):
+        """
+        Cancels the running import (if any), keeping the tiles that have been placed so far.
+        """
+        if self.running_import is not None:
+            self._finish_import(completed=False)
+
+    def _finish_import(self, completed):
+        self.running_import = None
+        self.session_updated.emit(self)
+        self.session_loaded.emit()
+        self.import_finished.emit(completed)
+
+    @staticmethod
+    def _iterate_chunks(iterable, chunk_size):
+        iterator = iter(iterable)
+        while chunk := list(itertools.islice(iterator, chunk_size)):
+            yield chunk
 
     @Slot(tuple)
     def handle_compute_candidates(self, args):
-        side_types, center_type, quest_type = args
+        with PROFILER.trace("compute_candidates"):
+            side_types, center_type, quest_type = args
 
-        # consider single char sequence for ease of use
-        if len(side_types) == 1:
-            center_type = side_types
+            # consider single char sequence for ease of use
+            if len(side_types) == 1:
+                center_type = side_types
 
-        if not quest_type:
-            quest_type = None
+            if not quest_type:
+                quest_type = None
 
-        candidates = self.compute_candidate_tiles(side_types, center_type, quest_type)
-        if len(candidates) == 0:
-            self.trigger_display_help.emit()
-            return
-
-        rated_candidates = self.compute_tile_ratings(candidates)
-        best_candidate_per_coords = {}
-        for idx, candidate in enumerate(rated_candidates):
-            # candidate list is ordered by rating,
-            # therefore the first candidate we encounter has the highest rating
-            if candidate.tile.coordinates in best_candidate_per_coords:
-                continue
-            best_candidate_per_coords[candidate.tile.coordinates] = (idx, candidate)
+            candidates = self.compute_candidate_tiles(side_types, center_type, quest_type)
+            if len(candidates) == 0:
+                self.trigger_display_help.emit()
+                return
 
-        self.candidate_tiles_computed.emit(
-            (rated_candidates, best_candidate_per_coords, self.open_coords)
-        )
+            rated_candidates = self.compute_tile_ratings(candidates)
+            best_candidate_per_coords = {}
+            for idx, candidate in enumerate(rated_candidates):
+                # candidate list is ordered by rating,
+                # therefore the first candidate we encounter has the highest rating
+                if candidate.tile.coordinates in best_candidate_per_coords:
+                    continue
+                best_candidate_per_coords[candidate.tile.coordinates] = (idx, candidate)
+
+            self.candidate_tiles_computed.emit(
+                (rated_candidates, best_candidate_per_coords, self.open_coords)
+            )
 
-        self.similar_tiles_seen.emit(
-            len(
-                self.seen_tile_sides_tree.find_matching_tiles(
+            self.similar_tiles_seen.emit(
+                self.seen_tiles_index.count_matching_tiles(
                     [candidates[0].get_side(s).type for s in TileSubsection.get_side_values()]
                 )
             )
-        )
 
+    @profiled
     def compute_candidate_tiles(self, side_type_seq, center_type, quest_type=None):
         if not Tile.is_valid_side_sequence(side_type_seq) or not SideType.is_valid(
             center_type
@@ -348,44 +568,95 @@ class Session(QObject):
         if len(self.played_tiles) == 0:
             return [self.prepare_candidate(side_type_seq, center_type, (0, 0))]
 
-        # iterate over all open tiles and create candidate tiles by adding all possible orientations
-        candidates = []
-        for coords in self.open_coords.keys():
-            open_tile = Tile(
-                side_types=side_type_seq, coordinates=coords, center_type=center_type
-            )
-            for candidate in open_tile.create_all_orientations(include_self=True):
-                self._update_tile_side_placements(candidate)
-                if candidate.get_placement() != Tile.Placement.NOT_POSSIBLE:
-                    self._update_group_participation(candidate)
-                    candidates.append(candidate)
+        # look up the open coordinates where the orientations of the tile may be placed
+        # and only create candidate tiles for those
+        PROFILER.record("open_coords", len(self.open_coords))
+        orientations = Tile(
+            side_types=side_type_seq, coordinates=None, center_type=center_type
+        ).create_all_orientations(include_self=True)
+        placements = self.open_coords_index.find_placements(
+            [tuple(o.get_side(s).type for s in TileSubsection.get_side_values())
+             for o in orientations]
+        )
+        # keep the order of the open coordinates and orientations
+        placements.sort(key=lambda placement: (self.open_coords[placement[0]], placement[1]))
 
+        candidates = []
+        for coords, orientation_idx, _ in placements:
+            # copy the orientation, as rotated tiles keep the connected subsection groups
+            # of the original tile
+            candidate = orientations[orientation_idx].get_copy_at(coords)
+            self._update_tile_side_placements(candidate)
+            self._update_group_participation(candidate)
+            candidates.append(candidate)
+
+        PROFILER.record("candidates", len(candidates))
         return candidates
 
-    def _update_open_tiles(self, tile):
+    def _update_open_tiles(self, delta: PlacementDelta, undo_tile_placement=False):
+        tile = delta.tile
+        if undo_tile_placement:
+            for coords in delta.added_open_coords:
+                del self.open_coords[coords]
+            self.num_added_open_coords -= len(delta.added_open_coords)
+            if delta.removed_open_coords_order is not None:
+                self._restore_open_coords(tile.coordinates, delta.removed_open_coords_order)
+            return
+
         if not self.open_coords or tile.coordinates not in self.open_coords:
             return
 
-        del self.open_coords[tile.coordinates]
+        delta.removed_open_coords_order = self.open_coords.pop(tile.coordinates)
         for s in TileSubsection.get_side_values():
-            if (
-                neighbor_coords := tile.get_neighbor_coords(s)
-            ) not in self.played_tiles:
-                self.open_coords[neighbor_coords] = None
+            neighbor_coords = tile.get_neighbor_coords(s)
+            if neighbor_coords not in self.played_tiles and neighbor_coords not in self.open_coords:
+                self.open_coords[neighbor_coords] = self.num_added_open_coords
+                self.num_added_open_coords += 1
+                delta.added_open_coords.append(neighbor_coords)
+
+    def rebuild_open_coords_index(self):
+        self.open_coords_index = OpenCoordsIndex()
+        for coords in self.open_coords:
+            self.open_coords_index.update(coords, self._get_open_coords_side_types(coords))
+
+    def _update_open_coords_index(self, coordinates):
+        # the side types of the neighbors only change for the coordinates
+        # of the placed or removed tile and its neighbors
+        for coords in [coordinates] + [Tile.get_coordinates(coordinates, s)
+                                       for s in TileSubsection.get_side_values()]:
+            if coords in self.open_coords:
+                self.open_coords_index.update(coords, self._get_open_coords_side_types(coords))
+            else:
+                self.open_coords_index.remove(coords)
+
+    def _restore_open_coords(self, coordinates, order):
+        # re-insert at the previous position, so that the candidates are computed
+        # in the same order as before the placement
+        if not self.open_coords or next(reversed(self.open_coords.values())) < order:
+            self.open_coords[coordinates] = order
+            return
+
+        open_coords = {}
+        for coords, coords_order in self.open_coords.items():
+            if order is not None and coords_order > order:
+                open_coords[coordinates] = order
+                order = None
+            open_coords[coords] = coords_order
+        self.open_coords = open_coords
 
     def compute_open_coords_for_tile(self, tile):
         if not self.open_coords or not tile or tile.coordinates not in self.open_coords:
-            return {}
+            return OpenCoordsView({})
 
-        open_coords_copy = copy.copy(self.open_coords)
-        del open_coords_copy[tile.coordinates]
+        # view instead of a copy, as this is computed for every candidate coordinates
+        added_coords = {}
         for s in TileSubsection.get_side_values():
             if (
                 neighbor_coords := tile.get_neighbor_coords(s)
             ) not in self.played_tiles:
-                open_coords_copy[neighbor_coords] = None
+                added_coords[neighbor_coords] = None
 
-        return open_coords_copy
+        return OpenCoordsView(self.open_coords, {tile.coordinates}, added_coords)
 
     def prepare_candidate(self, side_types, center_type, coordinates, quest_type=None):
         candidate = Tile(
@@ -399,6 +670,7 @@ class Session(QObject):
 
         return candidate
 
+    @profiled
     def compute_tile_ratings(self, candidate_tiles):
         tile_evaluation = TileEvaluationFactory.create(candidate_tiles, self)
 
@@ -450,12 +722,17 @@ class Session(QObject):
             return 0
         return round((self.get_perfect_placement_count() / total_closed) * 100, 2)
 
+    @profiled
     def autosave(self, tile: Tile, undo_tile_placement: bool = False):
+        # operations are appended to the journal of the autosave,
+        # which is compacted into the saved tiles from time to time
         if self.autosave_id >= 0:
             if undo_tile_placement:
-                self.database.remove_last_placed_tile(self.autosave_id)
+                self.database.journal_undo(self.autosave_id, score=self.score)
             else:
-                self.database.add_placed_tile(self.autosave_id, tile)
+                self.database.journal_placed_tiles(
+                    self.autosave_id, [tile], score=self.score
+                )
         else:
             autosave_ids = self.database.find_session_ids_by_name(
                 DatabaseConstants.AUTOSAVE_NAME
@@ -463,10 +740,10 @@ class Session(QObject):
             if len(autosave_ids) > 0:
                 # reuse same autosave for all games
                 self.autosave_id = autosave_ids[0]
-                self.database.delete_session_and_related(
-                    self.autosave_id, leave_empty_session=True
+                self.database.journal_placed_tiles(
+                    self.autosave_id, self.played_tiles.values(), reset=True,
+                    score=self.score
                 )
-                self.database.fill_session_tiles(self.autosave_id, self.played_tiles)
             else:
                 self.autosave_id = self.database.save_session(
                     DatabaseConstants.AUTOSAVE_NAME,
@@ -477,19 +754,26 @@ class Session(QObject):
     @Slot(tuple)
     def handle_place_candidate(self, tile):
         if tile is not None:
-            self.place_candidate(tile)
-            try:
-                self.autosave(tile)
-            except Exception as e:
-                print(f"ERROR: Autosaving session was not successful: {e}")
-            self.handle_tile_placed(tile)
+            with PROFILER.trace("place_candidate"):
+                self.place_candidate(tile)
+                try:
+                    self.autosave(tile)
+                except Exception as e:
+                    print(f"ERROR: Autosaving session was not successful: {e}")
+                self.handle_tile_placed(tile)
 
     @Slot(tuple)
     def handle_tile_placed(self, tile):
         self.session_updated.emit(self)
         self.tile_placed.emit(tile)
 
+    @profiled
     def place_candidate(self, tile: Tile, quest_type=None):
+        self._place_tile(tile)
+        # a new placement discards the undone tiles
+        self.redo_tiles = []
+
+    def _place_tile(self, tile: Tile):
         if tile is None:
             raise ValueError("Candidate is not valid")
         if tile.coordinates in self.played_tiles:
@@ -497,24 +781,27 @@ class Session(QObject):
                 "Candidate coordinates invalid. There is already a tile at that position"
             )
 
-        self._update_tile_neighbor_placements(tile)
+        delta = Session.PlacementDelta(tile)
+        self._update_tile_neighbor_placements(delta)
         self.played_tiles[tile.coordinates] = tile
-        self._update_groups(tile)
-        self._update_score(tile)
+        self._update_groups(delta)
+        self._update_score(delta)
         self._update_seen_tiles(tile)
-        self._update_watched_coordinates()
+        self._update_watched_coordinates(delta)
+        self._update_open_tiles(delta)
+        self._update_open_coords_index(tile.coordinates)
 
-        self.previous_open_tiles = copy.copy(self.open_coords)
-        self._update_open_tiles(tile)
+        self.placement_journal.append(delta)
 
     @Slot()
     def handle_undo_last_tile(self):
         if len(self.played_tiles) > 1:
-            undone_tile = self.undo_last_tile()
-            try:
-                self.autosave(undone_tile, undo_tile_placement=True)
-            except Exception as e:
-                print(f"ERROR: Autosaving session was not successful: {e}")
+            with PROFILER.trace("undo_last_tile"):
+                undone_tile = self.undo_last_tile()
+                try:
+                    self.autosave(undone_tile, undo_tile_placement=True)
+                except Exception as e:
+                    print(f"ERROR: Autosaving session was not successful: {e}")
 
             self.session_updated.emit(self)
             self.tile_undone.emit(undone_tile)
@@ -529,17 +816,64 @@ class Session(QObject):
                 )
             )
 
+    @profiled
     def undo_last_tile(self):
-        coordinates, tile = self.played_tiles.popitem()
-        self._update_tile_neighbor_placements(tile, undo_tile_placement=True)
-        self._update_groups(tile, undo_tile_placement=True)
-        self._update_score(tile, undo_tile_placement=True)
+        """
+        Undoes the placement of the last tile, which may be placed again through `redo_last_tile`.
+
+        Returns:
+            The undone tile.
+
+        Raises:
+            ValueError: If there is no placement to undo.
+        """
+        if not self.placement_journal:
+            raise ValueError("No tile placement to undo")
+
+        delta = self.placement_journal.pop()
+        tile = delta.tile
+        del self.played_tiles[tile.coordinates]
+        self._update_tile_neighbor_placements(delta, undo_tile_placement=True)
+        self._update_groups(delta, undo_tile_placement=True)
+        self._update_score(delta, undo_tile_placement=True)
         self._update_seen_tiles(tile, undo_tile_placement=True)
-        self._update_watched_coordinates(undo_tile_placement=True)
+        self._update_watched_coordinates(delta, undo_tile_placement=True)
+        self._update_open_tiles(delta, undo_tile_placement=True)
+        self._update_open_coords_index(tile.coordinates)
 
-        self.open_coords = self.previous_open_tiles
-        self.previous_open_tiles = None
+        self.redo_tiles.append(tile)
+        return tile
 
+    @Slot()
+    def handle_redo_last_tile(self):
+        if self.redo_tiles:
+            with PROFILER.trace("redo_last_tile"):
+                tile = self.redo_last_tile()
+                try:
+                    self.autosave(tile)
+                except Exception as e:
+                    print(f"ERROR: Autosaving session was not successful: {e}")
+                self.handle_tile_placed(tile)
+
+    @profiled
+    def redo_last_tile(self):
+        """
+        Places the last undone tile again.
+
+        Returns:
+            The placed tile, None if there is no undone tile.
+        """
+        if not self.redo_tiles:
+            return None
+
+        undone_tile = self.redo_tiles.pop()
+        # prepare again, as the group participation depends on the current groups
+        tile = self.prepare_candidate(
+            undone_tile.get_side_type_seq(),
+            undone_tile.get_center().type.to_character(),
+            undone_tile.coordinates,
+        )
+        self._place_tile(tile)
         return tile
 
     @Slot(tuple)
@@ -580,6 +914,11 @@ class Session(QObject):
     def get_num_played_tiles_matching_perfectly(self, open_coords):
         # computes the number of tiles that have already been played that would
         # match all known sides of the open position
+        return self.seen_tiles_index.count_matching_tiles(
+            self._get_open_coords_side_types(open_coords)
+        )
+
+    def _get_open_coords_side_types(self, open_coords):
         open_coords_side_types = []
         for subsection in TileSubsection.get_side_values():
             neighbor_coords = Tile.get_coordinates(open_coords, subsection)
@@ -591,72 +930,75 @@ class Session(QObject):
                         .get_side(Tile.get_opposing(subsection))
                         .type
                 )
+        return open_coords_side_types
 
-        return len(
-            self.seen_tile_sides_tree.find_matching_tiles(open_coords_side_types)
-        )
+    def _count_watched_coordinates(self, coordinates):
+        side_types = self._get_open_coords_side_types(coordinates)
+        self.watched_coords_side_types[coordinates] = side_types
+        self.watched_open_coords[coordinates] = \
+            self.seen_tiles_index.count_matching_tiles(side_types)
 
-    def _update_score(self, tile: Tile, undo_tile_placement: bool = False):
-        tile_score = 60 * tile.get_num_perfectly_closed(self.played_tiles) + \
-                     10 * tile.get_num_sides(Side.Placement.PERFECT_MATCH)
+    def _update_score(self, delta: PlacementDelta, undo_tile_placement: bool = False):
+        if undo_tile_placement:
+            self.score -= delta.score
+            return
 
-        self.score += -tile_score if undo_tile_placement else tile_score
+        tile = delta.tile
+        delta.score = 60 * tile.get_num_perfectly_closed(self.played_tiles) + \
+                      10 * tile.get_num_sides(Side.Placement.PERFECT_MATCH)
+        self.score += delta.score
 
     def _update_seen_tiles(self, tile: Tile, undo_tile_placement: bool = False):
         if undo_tile_placement:
-            self.seen_tile_sides_tree.remove_tile(tile)
+            self.seen_tiles_index.remove_tile(tile)
         else:
-            self.seen_tile_sides_tree.add_tile(tile)
+            self.seen_tiles_index.add_tile(tile)
 
-    def _update_watched_coordinates(self, undo_tile_placement: bool = False):
-        if not undo_tile_placement:
-            self.watched_coords_cache = None
-
-        for coords in self.watched_open_coords.keys():
-            # update the amount of seen tiles that would perfectly match
-            self.watched_open_coords[coords] = (
-                self.get_num_played_tiles_matching_perfectly(coords)
+    def _update_watched_coordinates(self, delta: PlacementDelta,
+                                    undo_tile_placement: bool = False):
+        tile = delta.tile
+        if undo_tile_placement:
+            # restore watch status of the coordinates of the undone tile
+            if delta.unwatched_coords is not None:
+                self._count_watched_coordinates(delta.unwatched_coords)
+        elif tile.coordinates in self.watched_open_coords:
+            # remove from the watched coordinates list, as it now contains a tile
+            self.unwatch_coordinates(tile.coordinates)
+            delta.unwatched_coords = tile.coordinates
+
+        # update the amount of seen tiles that would perfectly match:
+        # the known sides only change for the neighbors of the tile,
+        # for all other coordinates only the tile itself is added or removed
+        neighbor_coords = {tile.get_neighbor_coords(s) for s in TileSubsection.get_side_values()}
+        tile_side_types = [tile.get_side(s).type for s in TileSubsection.get_side_values()]
+        for coords, side_types in self.watched_coords_side_types.items():
+            if coords in neighbor_coords:
+                self._count_watched_coordinates(coords)
+            elif coords != delta.unwatched_coords and \
+                    SeenTilesIndex.matches(tile_side_types, side_types):
+                self.watched_open_coords[coords] += -1 if undo_tile_placement else 1
+
+        if delta.unwatched_coords is not None:
+            self.watched_coordinates_changed.emit(
+                (self.watched_open_coords, delta.unwatched_coords, undo_tile_placement)
             )
 
-            if not undo_tile_placement:
-                # if a watched coordinate now contains a tile, cache it
-                # as we might need to restore it in the undo case.
-                if coords in self.played_tiles:
-                    self.watched_coords_cache = coords
-
-        if self.watched_coords_cache is not None:
-            if not undo_tile_placement:
-                # remove from the watched coordinates list
-                del self.watched_open_coords[self.watched_coords_cache]
-                self.watched_coordinates_changed.emit(
-                    (self.watched_open_coords, self.watched_coords_cache, False)
-                )
-            else:
-                # restore watch status
-                self.watched_open_coords[self.watched_coords_cache] = (
-                    self.get_num_played_tiles_matching_perfectly(
-                        self.watched_coords_cache
-                    )
-                )
-                self.watched_coordinates_changed.emit(
-                    (self.watched_open_coords, self.watched_coords_cache, True)
-                )
-                self.watched_coords_cache = None
-
-    def _load_tile_dataframe(self, dataframe, simulate_tile_placement):
-        self.played_tiles = {}
-        self.seen_tile_sides_tree = Tree()
-        self.groups = {}
+    def _iterate_load_tile_records(self, record_chunks: Iterable[List[TileRecord]],
+                                   num_tiles, simulate_tile_placement):
+        num_loaded = 0
+        for chunk in record_chunks:
+            self._load_tile_records(chunk, simulate_tile_placement)
+            num_loaded += len(chunk)
+            yield (num_loaded, num_tiles)
 
-        for index, row in dataframe.iterrows():
+    def _load_tile_records(self, tile_records: Iterable[TileRecord], simulate_tile_placement):
+        for record in tile_records:
             tile = None
             # when simulating, do not consider coordinates, where tiles have been place but
             # instead compute best candidate and always just place that at the suggested coordinates
             if simulate_tile_placement:
                 candidates = self.compute_candidate_tiles(
-                    row["side_type_seq"],
-                    row["center_type"],
-                    None if pd.isna(row["quest_type"]) else row["quest_type"],
+                    record.side_type_seq, record.center_type, record.quest_type
                 )
                 if candidates is not None and candidates:
                     rated_candidates = self.compute_tile_ratings(candidates)
@@ -665,88 +1007,101 @@ class Session(QObject):
 
             else:
                 tile = self.prepare_candidate(
-                    row["side_type_seq"],
-                    row["center_type"],
-                    ast.literal_eval(row["coordinates"]),
+                    record.side_type_seq, record.center_type, record.coordinates
                 )
 
-                self.place_candidate(
-                    tile, None if pd.isna(row["quest_type"]) else row["quest_type"]
-                )
+                self.place_candidate(tile, record.quest_type)
 
-    def _load_watched_coordinates_dataframe(self, dataframe):
-        if dataframe is None or dataframe.empty:
-            return
+    def _load_watched_coordinates(self, watched_coords: Iterable[Tuple[int, int]]):
+        for coordinates in watched_coords:
+            self.watch_coordinates(coordinates)
 
-        for index, row in dataframe.iterrows():
-            self.watch_coordinates(ast.literal_eval(row["coordinates"]))
+    def rebuild_group_extensions_index(self):
+        self.group_extensions_index = GroupExtensionsIndex()
+        for group in self.groups.values():
+            self.group_extensions_index.update(group)
+
+    @profiled
+    def _update_groups(self, delta: PlacementDelta, undo_tile_placement: bool = False):
+        tile = delta.tile
 
-    def _update_groups(self, tile: Tile, undo_tile_placement: bool = False):
         def mark_group_for_deletion(group_id):
-            if group_id in [
-                g.id
-                for groups in self.groups_marked_for_deletion_at_coords.values()
-                for g in groups
-            ]:
+            if group_id in self.marked_group_ids:
                 return
 
-            if tile.coordinates not in self.groups_marked_for_deletion_at_coords:
-                self.groups_marked_for_deletion_at_coords[tile.coordinates] = []
-
-            self.groups_marked_for_deletion_at_coords[tile.coordinates].append(
+            self.marked_group_ids.add(group_id)
+            self.groups_marked_for_deletion_at_coords.setdefault(tile.coordinates, []).append(
                 self.groups[group_id]
             )
 
+        def unmark_groups(coordinates):
+            for group in self.groups_marked_for_deletion_at_coords.pop(coordinates):
+                self.marked_group_ids.discard(group.id)
+
         if undo_tile_placement:
+            # add groups again that were closed or merged by the undone tile
+            for group in delta.removed_groups:
+                self.groups[group.id] = group
+
             # remove new groups
-            ids_to_delete = []
-            for group_id, group in self.groups.items():
-                if group.start_tile.coordinates == tile.coordinates:
-                    ids_to_delete.append(group_id)
-            for group_id in ids_to_delete:
-                del self.groups[group_id]
-
-            # add groups again that were marked for deletion by the undone tile
+            for group_id in delta.added_group_ids:
+                if group_id in self.groups:
+                    del self.groups[group_id]
+                    self.group_extensions_index.remove(group_id)
+
             if tile.coordinates in self.groups_marked_for_deletion_at_coords:
-                for group in self.groups_marked_for_deletion_at_coords[
-                    tile.coordinates
-                ]:
-                    self.groups[group.id] = group
-                del self.groups_marked_for_deletion_at_coords[tile.coordinates]
+                unmark_groups(tile.coordinates)
 
         else:
+            for group_participation in tile.group_participation.values():
+                # new groups receive their persistent id when being committed to the session
+                group_participation.group.make_persistent()
+            tile.group_participation = {
+                gp.group.id: gp for gp in tile.group_participation.values()
+            }
+
             for group_id, group_participation in tile.group_participation.items():
                 # transfer all new groups
                 if group_id not in self.groups:
                     self.groups[group_id] = group_participation.group
+                    delta.added_group_ids.append(group_id)
 
                 # mark all groups that have been merged with other for deletion
                 for consumed_group_id in group_participation.group.consumed_groups:
                     if consumed_group_id in self.groups:
                         mark_group_for_deletion(consumed_group_id)
 
-        # recompute groups to ensure consistency
+        # only the groups that contain the tile or one of its neighbors may reach the
+        # coordinates of the tile, all other groups are unaffected by its (un)placement
+        affected_coordinates = {tile.coordinates} | {
+            tile.get_neighbor_coords(s) for s in TileSubsection.get_side_values()
+        }
         for group in self.groups.values():
+            if group.tile_coordinates.isdisjoint(affected_coordinates):
+                continue
+
             group.compute(self.played_tiles)
+            self.group_extensions_index.update(group)
 
             # mark groups for deletion that are closed by the placed tile
             if len(group.possible_extensions) == 0:
                 mark_group_for_deletion(group.id)
 
-        final_deletion = []
-        for coordinates, groups in self.groups_marked_for_deletion_at_coords.items():
-            # delete all groups that have been marked
-            for group in groups:
-                if group.id in self.groups:
-                    del self.groups[group.id]
-
-            # final deletion may only be done once the next tile has been placed,
-            # as the last played tile may still be undone
-            if tile.coordinates != coordinates:
-                final_deletion.append(coordinates)
-
-        for coordinates in final_deletion:
-            del self.groups_marked_for_deletion_at_coords[coordinates]
+        # delete the groups that have been marked by the tile, groups marked by
+        # previous tiles have already been deleted when those were placed
+        for group in self.groups_marked_for_deletion_at_coords.get(tile.coordinates, []):
+            if group.id in self.groups:
+                del self.groups[group.id]
+                self.group_extensions_index.remove(group.id)
+                if not undo_tile_placement:
+                    # keep the group to restore it when undoing the tile
+                    delta.removed_groups.append(group)
+
+        # final deletion may only be done once the next tile has been placed,
+        # as the last played tile may still be undone
+        for coordinates in [c for c in self.groups_marked_for_deletion_at_coords
+                            if c != tile.coordinates]:
+            unmark_groups(coordinates)
 
     def _update_tile_side_placements(self, tile):
         for subsection in TileSubsection.get_side_values():
@@ -759,22 +1114,29 @@ class Session(QObject):
                     side.type, opposing_side.type
                 )
 
-    def _update_tile_neighbor_placements(self, tile, undo_tile_placement=False):
+    def _update_tile_neighbor_placements(self, delta: PlacementDelta, undo_tile_placement=False):
+        if undo_tile_placement:  # tile has been removed due to undo
+            # restore the previous placements to ensure the undone tile's coordinate
+            # is considered again
+            for coordinates, subsection, placement in delta.neighbor_placements:
+                self.played_tiles[coordinates].get_side(subsection).placement = placement
+            return
+
+        tile = delta.tile
         for subsection in TileSubsection.get_side_values():
             side = tile.get_side(subsection)
-            opposing_side = self._get_tile_side(
-                tile.get_neighbor_coords(subsection), Tile.get_opposing(subsection)
-            )
+            neighbor_coords = tile.get_neighbor_coords(subsection)
+            opposing_subsection = Tile.get_opposing(subsection)
+            opposing_side = self._get_tile_side(neighbor_coords, opposing_subsection)
             if opposing_side is not None:
-                if undo_tile_placement:  # tile will be removed due to undo
-                    # reset to unknown to ensure the undone tile's coordinate is considered again
-                    opposing_side.placement = Side.Placement.UNKNOWN_MATCH
-                else:
-                    opposing_side.placement = (
-                        TileEvaluation.compute_side_placement_match(
-                            opposing_side.type, side.type
-                        )
+                delta.neighbor_placements.append(
+                    (neighbor_coords, opposing_subsection, opposing_side.placement)
+                )
+                opposing_side.placement = (
+                    TileEvaluation.compute_side_placement_match(
+                        opposing_side.type, side.type
                     )
+                )
 
     def _get_tile_side(self, coordinates, subsection):
         if coordinates in self.played_tiles:
@@ -783,4 +1145,5 @@ class Session(QObject):
         return None
 
     def _update_group_participation(self, tile):
-        Group.update_group_participation(self.groups, self.played_tiles, tile)
+        # candidates are computed against a read-only view of the board
+        Group.update_group_participation(self.groups, MappingProxyType(self.played_tiles), tile)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import zlib
+from typing import Iterable, List, NamedTuple
+
+from src.group import Group
+from src.side import Side
+from src.side_type import SideType
+from src.tile import Tile
+from src.tile_record import TileRecord
+from src.seen_tiles_index import SeenTilesIndex
+from src.tile_subsection import TileSubsection
+
+
+class SessionSnapshot(NamedTuple):
+    """
+    Versioned snapshot of the state of a session that is derived from its tiles:
+    side placements, groups, open coordinates, score and the placement journal.
+    Allows to restore a session without replaying the placement of all tiles.
+
+    The group participation of the played tiles is not part of the snapshot,
+    as it is recomputed whenever a group is computed. The index of seen tiles
+    is rebuilt from the tiles, which is cheap.
+    """
+
+    VERSION = 3
+
+    version: int
+    tiles_checksum: str  # checksum of the tile records the snapshot has been captured for
+    checksum: str  # checksum of the data
+    data: bytes  # compressed JSON of the derived state
+
+    @classmethod
+    def capture(cls, session) -> "SessionSnapshot":
+        """
+        Captures the derived state of a session.
+
+        Args:
+            session (Session): The session to capture.
+        """
+        state = {
+            "placements": [
+                [tile.get_side(s).placement.value for s in TileSubsection.get_side_values()]
+                for tile in session.played_tiles.values()
+            ],
+            "groups": [cls._encode_group(group) for group in session.groups.values()],
+            "marked_groups": [
+                [coordinates, [cls._encode_group(group) for group in groups]]
+                for coordinates, groups in session.groups_marked_for_deletion_at_coords.items()
+            ],
+            "open_coords": list(session.open_coords.items()),
+            "num_added_open_coords": session.num_added_open_coords,
+            "placement_journal": [cls._encode_placement_delta(delta)
+                                  for delta in session.placement_journal],
+            "score": session.score,
+        }
+        data = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+        return cls(cls.VERSION, cls.compute_tiles_checksum(session.get_tile_records()),
+                   hashlib.sha256(data).hexdigest(), data)
+
+    @staticmethod
+    def compute_tiles_checksum(tile_records: Iterable[TileRecord]) -> str:
+        tiles_hash = hashlib.sha256()
+        for record in tile_records:
+            tiles_hash.update(",".join(record.to_strings()).encode("utf-8") + b"\n")
+        return tiles_hash.hexdigest()
+
+    def is_valid_for(self, tile_records: List[TileRecord]) -> bool:
+        """
+        Checks whether the snapshot may be restored for the given tiles,
+        i.e. it is of the current version, not corrupted and not stale.
+        """
+        return self.version == self.VERSION and \
+            hashlib.sha256(self.data).hexdigest() == self.checksum and \
+            self.compute_tiles_checksum(tile_records) == self.tiles_checksum
+
+    def restore(self, session, tile_records: List[TileRecord]):
+        """
+        Restores the tiles and the derived state of a session.
+
+        Args:
+            session (Session): The session to restore, any previous state is replaced.
+            tile_records (List[TileRecord]): The tiles of the session in order of placement.
+
+        Raises:
+            ValueError: If the snapshot is not valid for the given tiles.
+        """
+        if not self.is_valid_for(tile_records):
+            raise ValueError("Snapshot is outdated or corrupted")
+
+        state = json.loads(zlib.decompress(self.data))
+
+        played_tiles = {}
+        for record, placements in zip(tile_records, state["placements"]):
+            tile = Tile(record.side_type_seq, record.center_type, record.coordinates)
+            for subsection, placement in zip(TileSubsection.get_side_values(), placements):
+                tile.get_side(subsection).placement = Side.Placement(placement)
+            played_tiles[record.coordinates] = tile
+
+        session.played_tiles = played_tiles
+        session.groups = {
+            group.id: group
+            for group in (self._decode_group(g, played_tiles) for g in state["groups"])
+        }
+        session.groups_marked_for_deletion_at_coords = {
+            tuple(coordinates): [self._decode_group(g, played_tiles) for g in groups]
+            for coordinates, groups in state["marked_groups"]
+        }
+        session.marked_group_ids = {
+            group.id
+            for groups in session.groups_marked_for_deletion_at_coords.values()
+            for group in groups
+        }
+        session.rebuild_group_extensions_index()
+        session.open_coords = {tuple(c): order for c, order in state["open_coords"]}
+        session.num_added_open_coords = state["num_added_open_coords"]
+        session.rebuild_open_coords_index()
+        session.placement_journal = [
+            self._decode_placement_delta(session.PlacementDelta, d, played_tiles)
+            for d in state["placement_journal"]
+        ]
+        session.redo_tiles = []
+        session.seen_tiles_index = SeenTilesIndex()
+        for tile in played_tiles.values():
+            session.seen_tiles_index.add_tile(tile)
+        session.score = state["score"]
+
+    @staticmethod
+    def _encode_group(group: Group):
+        return {
+            "id": group.id,
+            "type": int(group.type),
+            "start": group.start_tile.coordinates,
+            "start_subsections": [int(s) for s in group.start_tile_subsections],
+            "tile_coordinates": list(group.tile_coordinates),
+            "size": group.size,
+            "possible_extensions": [
+                [coordinates, [int(s) for s in subsections]]
+                for coordinates, subsections in group.possible_extensions.items()
+            ],
+            "consumed_groups": group.consumed_groups,
+        }
+
+    @staticmethod
+    def _decode_group(state, played_tiles) -> Group:
+        group = Group(played_tiles[tuple(state["start"])], SideType(state["type"]),
+                      [TileSubsection(s) for s in state["start_subsections"]], state["id"])
+        group.tile_coordinates = {tuple(c) for c in state["tile_coordinates"]}
+        group.fingerprint = Group.compute_fingerprint(group.tile_coordinates)
+        group.size = state["size"]
+        group.possible_extensions = {
+            tuple(coordinates): [TileSubsection(s) for s in subsections]
+            for coordinates, subsections in state["possible_extensions"]
+        }
+        group.consumed_groups = state["consumed_groups"]
+        return group
+
+    @classmethod
+    def _encode_placement_delta(cls, delta):
+        return {
+            "tile": delta.tile.coordinates,
+            "neighbor_placements": [
+                [coordinates, int(subsection), placement.value]
+                for coordinates, subsection, placement in delta.neighbor_placements
+            ],
+            "removed_open_coords_order": delta.removed_open_coords_order,
+            "added_open_coords": delta.added_open_coords,
+            "added_group_ids": delta.added_group_ids,
+            "removed_groups": [cls._encode_group(group) for group in delta.removed_groups],
+            "score": delta.score,
+            "unwatched_coords": delta.unwatched_coords,
+        }
+
+    @classmethod
+    def _decode_placement_delta(cls, delta_class, state, played_tiles):
+        delta = delta_class(played_tiles[tuple(state["tile"])])
+        delta.neighbor_placements = [
+            (tuple(coordinates), TileSubsection(subsection), Side.Placement(placement))
+            for coordinates, subsection, placement in state["neighbor_placements"]
+        ]
+        delta.removed_open_coords_order = state["removed_open_coords_order"]
+        delta.added_open_coords = [tuple(c) for c in state["added_open_coords"]]
+        delta.added_group_ids = state["added_group_ids"]
+        delta.removed_groups = [cls._decode_group(g, played_tiles)
+                                for g in state["removed_groups"]]
+        delta.score = state["score"]
+        if state["unwatched_coords"] is not None:
+            delta.unwatched_coords = tuple(state["unwatched_coords"])
+        return delta
@@ -6,6 +6,7 @@ from src.tile_subsection import TileSubsection
 from src.side import Side
 from src.side_type import SideType
 from src.constants import Constants
+from src.rule_tables import RuleTables
 
 class Tile:
     _opposite_dict = {
@@ -39,19 +40,50 @@ class Tile:
         self.quest = None
         self.group_participation: Dict[str, Tile.GroupParticipation] = {}
         # store locally as optimization
-        self._neighbor_coordinates = {}
-        if self.coordinates is not None:
-            self._neighbor_coordinates = {
-                TileSubsection.TOP: (coordinates[0], coordinates[1] + 4),
-                TileSubsection.UPPER_RIGHT: (coordinates[0] + 3, coordinates[1] + 2),
-                TileSubsection.LOWER_RIGHT: (coordinates[0] + 3, coordinates[1] - 2),
-                TileSubsection.BOTTOM: (coordinates[0], coordinates[1] - 4),
-                TileSubsection.LOWER_LEFT: (coordinates[0] - 3, coordinates[1] - 2),
-                TileSubsection.UPPER_LEFT: (coordinates[0] - 3, coordinates[1] + 2),
-                TileSubsection.CENTER: (coordinates[0], coordinates[1]),
-            }
+        self._neighbor_coordinates = self._compute_neighbor_coordinates(coordinates)
         self._connected_subsection_groups = self._compute_connected_subsection_groups()
 
+    @staticmethod
+    def _compute_neighbor_coordinates(coordinates):
+        if coordinates is None:
+            return {}
+
+        return {
+            TileSubsection.TOP: (coordinates[0], coordinates[1] + 4),
+            TileSubsection.UPPER_RIGHT: (coordinates[0] + 3, coordinates[1] + 2),
+            TileSubsection.LOWER_RIGHT: (coordinates[0] + 3, coordinates[1] - 2),
+            TileSubsection.BOTTOM: (coordinates[0], coordinates[1] - 4),
+            TileSubsection.LOWER_LEFT: (coordinates[0] - 3, coordinates[1] - 2),
+            TileSubsection.UPPER_LEFT: (coordinates[0] - 3, coordinates[1] + 2),
+            TileSubsection.CENTER: (coordinates[0], coordinates[1]),
+        }
+
+    def get_copy_at(self, coordinates):
+        '''
+        Returns a new Tile instance with the same sides at the given coordinates.
+        The connected subsection groups are kept, as they may differ from the groups
+        computed from the side type sequence (e.g. for rotated tiles).
+        '''
+        cls = self.__class__
+        new_tile = cls.__new__(cls)
+
+        new_tile._subsections = {}
+        for subsection, side in self._subsections.items():
+            new_side = Side(side.type, side.isolated)
+            new_side.placement = side.placement
+            new_tile._subsections[subsection] = new_side
+
+        new_tile.coordinates = coordinates
+        new_tile.quest = None
+        new_tile.group_participation = {}
+        new_tile._neighbor_coordinates = self._compute_neighbor_coordinates(coordinates)
+        new_tile._connected_subsection_groups = [
+            (side_type, list(subsections))
+            for side_type, subsections in self._connected_subsection_groups
+        ]
+
+        return new_tile
+
     def get_rotation(self):
         ''' Returns a new Tile instance that is rotated clockwise by one subsection. '''
         cls = self.__class__
@@ -400,7 +432,7 @@ class Tile:
 
     def _iterate_subsection_sides(self, side_type, start_idx, curr_idx):
         subsection = TileSubsection.at_index(curr_idx)
-        if self.get_side(subsection).type in Constants.COMPATIBLE_GROUP_TYPES[side_type] and \
+        if RuleTables.COMPATIBLE_GROUP_TYPES[side_type][self.get_side(subsection).type] and \
             abs(start_idx - curr_idx) < len(TileSubsection.get_side_values()):
             return [subsection] +\
                    self._iterate_subsection_sides(
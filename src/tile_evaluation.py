@@ -1,89 +1,45 @@
+from enum import IntEnum
 from typing import List, Dict, Tuple
 
 import numpy as np
 
+from src.constants import Constants
 from src.side import Side
 from src.side_type import SideType
 from src.tile_subsection import TileSubsection
 from src.tile import Tile
 from src.group import Group
-from src.constants import Constants
+from src.profiler import profiled
+from src.rule_tables import RuleTables
 
 
 class TileEvaluation:
-    PERFECT_MATCH_DICT = {
-        SideType.WOODS: [SideType.WOODS],
-        SideType.HOUSE: [SideType.HOUSE],
-        SideType.GREEN: [SideType.GREEN, SideType.PONDS, SideType.STATION],
-        SideType.CROPS: [SideType.CROPS],
-        SideType.PONDS: [
-            SideType.PONDS,
-            SideType.GREEN,
-            SideType.STATION,
-            SideType.RIVER,
-        ],
-        SideType.STATION: [
-            SideType.STATION,
-            SideType.GREEN,
-            SideType.PONDS,
-            SideType.RIVER,
-            SideType.TRAIN,
-        ],
-        SideType.RIVER: [SideType.RIVER, SideType.PONDS, SideType.STATION],
-        SideType.TRAIN: [SideType.TRAIN, SideType.STATION],
-    }
-
-    RESTRICTED_DICT = {
-        SideType.RIVER: [SideType.RIVER, SideType.PONDS, SideType.STATION],
-        SideType.TRAIN: [SideType.TRAIN, SideType.STATION],
-    }
-
-    # using the neighbor compatibilty score we can handle types
-    # that are not covered by any other rating mechanism
-    _DIRECT_NEIGHBOR_COMPATIBILITY_SCORE = [
-        (
-            1,
-            {
-                SideType.STATION: [SideType.RIVER, SideType.TRAIN],
-                SideType.GREEN: [SideType.GREEN],
-            },
-        ),
-        (
-            0.5,
-            {
-                SideType.STATION: [SideType.STATION, SideType.PONDS],
-                SideType.GREEN: [SideType.PONDS, SideType.STATION],
-            },
-        ),
-        (
-            -0.5,
-            {
-                SideType.STATION: [SideType.WOODS, SideType.HOUSE, SideType.CROPS]
-            }
-        ),
-    ]
-    _OTHER_NEIGHBOR_COMPATIBILITY_SCORE = [
-        (
-            1,
-            {
-                SideType.STATION: [SideType.RIVER, SideType.TRAIN],
-                SideType.GREEN: [SideType.GREEN],
-            },
-        ),
-        (
-            0.5,
-            {
-                SideType.STATION: [SideType.STATION, SideType.PONDS],
-                SideType.GREEN: [SideType.PONDS, SideType.STATION],
-            },
-        ),
-        (
-            -0.5,
-            {
-                SideType.STATION: [SideType.WOODS, SideType.HOUSE, SideType.CROPS]
-            }
-        ),
-    ]
+    class Feature(IntEnum):
+        """ Columns of the raw feature matrix, one row per candidate tile. """
+        NUM_PERFECT_SIDES = 0
+        NUM_IMPERFECT_SIDES = 1
+        NUM_UNKNOWN_SIDES = 2
+        TILE_PLACEMENT_SCORE = 3
+        GROUP_AGGREGATION_SIZE = 4
+        EXTENDS_RESTRICTED_GROUP = 5
+        PERSPECTIVE_GROUP_EXTENSION_SCORE = 6
+        NEIGHBOR_GROUP_INTERFERENCE_SCORE = 7
+        NEIGHBOR_COMPATIBILITY_SCORE = 8
+        RT_EXTENSION_SURROUNDING_TILE_COUNT = 9
+        NEIGHBOR_TYPE_DEMOTION = 10
+
+    class Rating(IntEnum):
+        """ Columns of the rating matrix, one row per candidate tile. """
+        TILE_PLACEMENT = 0
+        GROUP = 1
+        NEIGHBOR_COMPATIBILITY = 2
+        NEIGHBOR_TYPE_DEMOTION = 3
+        RESTRICTED_TYPE_ORIENTATION = 4
+        NEIGHBOR_GROUP_INTERFERENCE = 5
+
+    # rule dicts, see Constants, compiled into lookup tables by RuleTables
+    PERFECT_MATCH_DICT = Constants.PERFECT_MATCH_DICT
+    RESTRICTED_DICT = Constants.RESTRICTED_DICT
 
     _BASE_VALUE = 100
 
@@ -145,7 +101,7 @@ class TileEvaluation:
     _RESTRICTED_TYPE_ORIENTATION_NUM_RINGS = 2
 
     def __init__(self, candidate_tiles, open_coords_per_candidate,
-                 played_tiles, groups):
+                 played_tiles, groups, group_extensions_index):
         self.rating_details: List[TileEvaluation.RatingDetails] = []
         if candidate_tiles is not None:
             for tile, open_coords in list(
@@ -161,48 +117,44 @@ class TileEvaluation:
         # group id to group
         self.groups: Dict[str, Group] = groups
 
-        # possible extension coordinates to list of group ids that may be extend at this coordinate
-        # stored once in order to allow quick lookup by coordinates
-        self.possible_group_extensions: Dict[Tuple[int, int], List[str]] = {}
-
-        for group in self.groups.values():
-            for coords in group.possible_extensions.keys():
-                if coords not in self.possible_group_extensions:
-                    self.possible_group_extensions[coords] = []
-                self.possible_group_extensions[coords].append(group.id)
-
-        self._prepare()
-        self._compute()
-
-    def get_rated_tiles(self):
-        return sorted(
-            [
-                TileEvaluation.RatedTile(rating_detail)
-                for rating_detail in self.rating_details
-            ],
-            key=lambda rd: rd.rating,
-            reverse=True,
-        )
+        # possible extension coordinates to ids of the groups that may be extended at this
+        # coordinate, borrowed from the index that the session maintains for the groups
+        self.possible_group_extensions: Dict[Tuple[int, int], Dict[str, None]] = \
+            group_extensions_index.group_ids
+        # same for the groups of restricted types only
+        self.possible_restricted_group_extensions: Dict[Tuple[int, int], Dict[str, None]] = \
+            group_extensions_index.restricted_group_ids
+
+        # stage one: raw features per candidate (rows) and feature type (columns)
+        self.features = self._prepare()
+        # stage two: normalized and weighted ratings per candidate (rows) and rating type (columns)
+        self.ratings = self._compute(self.features)
+        # overall rating per candidate, summed in the same order as for the rated tile
+        self.total_ratings = np.zeros(len(self.ratings))
+        for rating in TileEvaluation.Rating:
+            self.total_ratings += self.ratings[:, rating]
+
+        for r, rating_row in zip(self.rating_details, self.ratings):
+            r.ratings = rating_row
+
+    def get_rated_tiles(self, max_count=None):
+        """
+        Returns the rated tiles ordered descending by their rating.
+        Rated tiles are only created for the (at most) `max_count` best rated candidates.
+        """
+        # stable sort in order to keep the candidate order for equal ratings
+        order = np.argsort(-self.total_ratings, kind="stable")
+        if max_count is not None:
+            order = order[:max_count]
+
+        return [
+            TileEvaluation.RatedTile(self.rating_details[idx])
+            for idx in order
+        ]
 
     @staticmethod
     def compute_side_placement_match(side_type, opp_side_type):
-        if SideType.UNKNOWN in [side_type, opp_side_type]:
-            return Side.Placement.UNKNOWN_MATCH
-
-        # some types only allow placement against certain types
-        if (
-            side_type in TileEvaluation.RESTRICTED_DICT
-            and opp_side_type not in TileEvaluation.RESTRICTED_DICT[side_type]
-        ) or (
-            opp_side_type in TileEvaluation.RESTRICTED_DICT
-            and side_type not in TileEvaluation.RESTRICTED_DICT[opp_side_type]
-        ):
-            return Side.Placement.NOT_POSSIBLE
-
-        if opp_side_type in TileEvaluation.PERFECT_MATCH_DICT[side_type]:
-            return Side.Placement.PERFECT_MATCH
-
-        return Side.Placement.IMPERFECT_MATCH
+        return RuleTables.SIDE_PLACEMENT_TABLE[side_type][opp_side_type]
 
     def get_distant_groups_for_tile(self, tile, open_coords):
         distant_groups = {}
@@ -227,26 +179,27 @@ class TileEvaluation:
                     )
 
                 # possibly remove open tiles to hop onto
-                local_open_tiles = dict(open_coords)
+                removed_open_tiles = []
                 for s in TileSubsection.get_side_values():
                     side_type = tile.get_side(s).type
                     coords = tile.get_neighbor_coords(s)
-                    if coords not in local_open_tiles:
+                    if coords not in open_coords:
                         continue
                     if side_type not in self.RESTRICTED_DICT:
                         continue
 
                     # remove open tiles
                     # * that are incompatible directions (due to restricted types) for the given group
-                    if side_type not in Constants.COMPATIBLE_GROUP_TYPES[gp.group.type]:
-                        del local_open_tiles[coords]
+                    if not RuleTables.COMPATIBLE_GROUP_TYPES[gp.group.type][side_type]:
+                        removed_open_tiles.append(coords)
 
                     # remove open tiles
                     # that are also of a restricted, compatible type
                     # as we expect to be able to connect to these compatible types,
                     # before we will reach a further away compatible type
                     elif s != subsection:
-                        del local_open_tiles[coords]
+                        removed_open_tiles.append(coords)
+                local_open_tiles = open_coords.without(removed_open_tiles)
 
                 for distant_group_id, paths in self.get_distant_groups(
                     local_open_tiles,
@@ -381,22 +334,20 @@ class TileEvaluation:
     def _skip_path_to_group(self, origin_group, distant_group, dist, path_coords):
         # distant groups of a different type will only be collected if they are direct neighbors
         if (
-            distant_group.type not in Constants.COMPATIBLE_GROUP_TYPES[origin_group.type]
+            not RuleTables.COMPATIBLE_GROUP_TYPES[origin_group.type][distant_group.type]
             and dist > 0
         ):
             return True
 
         for i, coord in enumerate(path_coords):
             # search for path coordinates that intersect with other groups possible extension points
-            if coord not in self.possible_group_extensions:
+            # do not consider any extension to a group that "crosses" a restricted type
+            # as a restricted type will definitively block the extension
+            if coord not in self.possible_restricted_group_extensions:
                 continue
 
-            for group_id in self.possible_group_extensions[coord]:
-                # do not consider any extension to a group that "crosses" a restricted type
-                # as a restricted type will definitively block the extension
+            for group_id in self.possible_restricted_group_extensions[coord]:
                 crossing_group_type = self.groups[group_id].type
-                if crossing_group_type not in self.RESTRICTED_DICT:
-                    continue
 
                 # skip paths were the destination groups
                 # are not directly adjacent to the direct open neighbor tile and
@@ -405,21 +356,70 @@ class TileEvaluation:
                 #   but we are not the last coordinate in the paths
                 is_last_coord = i == len(path_coords) - 1
                 if (
-                    crossing_group_type
-                    not in Constants.COMPATIBLE_GROUP_TYPES[origin_group.type]
+                    not RuleTables.COMPATIBLE_GROUP_TYPES[origin_group.type][crossing_group_type]
                     or not is_last_coord
                 ) and dist > 0:
                     return True
 
         return False
 
+    @profiled
     def _prepare(self):
-        for r in self.rating_details:
+        features = np.zeros((len(self.rating_details), len(TileEvaluation.Feature)))
+        for r, row in zip(self.rating_details, features):
+            self._prepare_tile_placement_score(r)
             self._prepare_neighbor_compatibility_score(r)
             self._prepare_group_aggregation(r)
             self._prepare_restricted_type_orientation_score(r)
             self._prepare_distant_group_consideration(r)
+            self._prepare_neighbor_type_demotion(r)
+
+            total_group_size, involved_group_types = r.group_aggregation
+            row[:] = (
+                r.tile.get_num_sides(Side.Placement.PERFECT_MATCH),
+                r.tile.get_num_sides(Side.Placement.IMPERFECT_MATCH),
+                r.tile.get_num_sides(Side.Placement.UNKNOWN_MATCH),
+                r.tile_placement_score,
+                total_group_size,
+                any(Group.is_type_restricted(t) for t in involved_group_types),
+                r.perspective_group_extension_score,
+                r.neighbor_group_interference_score,
+                r.neighbor_compatibility_score,
+                r.rt_extension_surrounding_tile_count,
+                r.neighbor_type_demotion_score,
+            )
+
+        return features
+
+    @profiled
+    def _prepare_tile_placement_score(self, rating):
+        rating.tile_placement_score = 0
+        for subsection in TileSubsection.get_side_values():
+            neighbor_coords = rating.tile.get_neighbor_coords(subsection)
+            tile_placement = Tile.Placement.UNKNOWN
+
+            side = rating.tile.get_side(subsection)
+            if neighbor_coords in self.played_tiles:
+                neigbor_tile = self.played_tiles[neighbor_coords]
+                if side.placement == Side.Placement.IMPERFECT_MATCH:
+                    # when placing imperfectly, consider if the neighboring tile
+                    # that we place against has already been imperfect before or
+                    # would only be ruined through the candidate tile
+                    tile_placement = neigbor_tile.get_placement()
+                elif side.placement == Side.Placement.PERFECT_MATCH:
+                    # when placing perfectly, see if the neighboring tile that we place against
+                    # would be perfectly closed by the candidate tile
+                    tile_placement = (
+                        neigbor_tile.get_placement_considering_neighbor_tile(
+                            rating.tile
+                        )
+                    )
 
+            rating.tile_placement_score += self._BASE_RATING[side.placement][
+                tile_placement
+            ]
+
+    @profiled
     def _prepare_neighbor_compatibility_score(self, rating):
         def get_side_types(subsection, n_subsection):
             if (
@@ -437,19 +437,11 @@ class TileEvaluation:
                 rating.open_neighbor_side_types[subsection][n_subsection],
             )
 
-        def get_score(score_list, subsection, n_subsection):
+        def get_score(score_table, subsection, n_subsection):
             side_type, n_side_type = get_side_types(subsection, n_subsection)
             if side_type is not None and n_side_type is not None:
-                for score, side_types_container in score_list:
-                    # score applies both ways (bidirectional)
-                    if (
-                        side_type in side_types_container
-                        and n_side_type in side_types_container[side_type]
-                    ) or (
-                        n_side_type in side_types_container
-                        and side_type in side_types_container[n_side_type]
-                    ):
-                        return score
+                # score applies both ways (bidirectional), see RuleCompiler.compile_score_table
+                return score_table[side_type][n_side_type]
             return 0
 
         rating.neighbor_compatibility_score = 0
@@ -463,13 +455,14 @@ class TileEvaluation:
             )
             for n_subsection in TileSubsection.get_side_values():
                 if n_subsection in direct_neighbor_subsections:
-                    score_list = self._DIRECT_NEIGHBOR_COMPATIBILITY_SCORE
+                    score_table = RuleTables.DIRECT_NEIGHBOR_COMPATIBILITY_TABLE
                 else:
-                    score_list = self._OTHER_NEIGHBOR_COMPATIBILITY_SCORE
+                    score_table = RuleTables.OTHER_NEIGHBOR_COMPATIBILITY_TABLE
                 rating.neighbor_compatibility_score += get_score(
-                    score_list, subsection, n_subsection
+                    score_table, subsection, n_subsection
                 )
 
+    @profiled
     def _prepare_group_aggregation(self, rating):
         total_size = 0
         extension_group_types = []
@@ -499,7 +492,14 @@ class TileEvaluation:
 
         rating.group_aggregation = (total_size, list(set(extension_group_types)))
 
+    @profiled
     def _prepare_restricted_type_orientation_score(self, rating):
+        """
+        Checks the groups that the candidate tile participates in and counts the played tiles
+        in the surrounding area of all possible extensions.
+        Only applies for restricted types, as we usually try to build away from other types
+        to keep as many options open as possible.
+        """
         rating.rt_extension_surrounding_tile_count = 0
         for gp in rating.tile.group_participation.values():
             if not Group.is_type_restricted(gp.group.type):
@@ -530,6 +530,7 @@ class TileEvaluation:
                     )
                 )
 
+    @profiled
     def _prepare_distant_group_consideration(self, rating):
         rating.perspective_group_extension_score = 0
         rating.neighbor_group_interference_score = 0
@@ -549,7 +550,7 @@ class TileEvaluation:
                 distant_group = self.groups[distant_group_id]
                 factor = 1.0
 
-                if distant_group.type in Constants.COMPATIBLE_GROUP_TYPES[extension_type]:
+                if RuleTables.COMPATIBLE_GROUP_TYPES[extension_type][distant_group.type]:
                     # boost restricted type extension
                     if Group.is_type_restricted(distant_group.type):
                         factor = self._GROUP_SIZE_BOOST_FACTOR[distant_group.type][
@@ -588,121 +589,17 @@ class TileEvaluation:
                         factor * distant_group.size
                     )
 
-    def _compute(self):
-        def get_min_max(container):
-            sorted_container = sorted(container, reverse=True)
-            return (
-                [sorted_container[pos] for pos in [-1, 0]] if sorted_container else None
-            )
-
-        group_min_max = get_min_max(
-            [
-                r.group_aggregation[0] + r.perspective_group_extension_score
-                for r in self.rating_details
-            ]
-        )
-        neighbor_compatibility_min_max = get_min_max(
-            [r.neighbor_compatibility_score for r in self.rating_details]
-        )
-        restricted_type_orientation_min_max = get_min_max(
-            [r.rt_extension_surrounding_tile_count for r in self.rating_details]
-        )
-        interference_group_min_max = get_min_max(
-            [r.neighbor_group_interference_score for r in self.rating_details]
-        )
-
-        for r in self.rating_details:
-            self._compute_tile_placement_rating(r)
-            self._compute_group_sizes_rating(r, group_min_max)
-            self._compute_neighbor_type_demotion_rating(r)
-            self._compute_neighbor_compatibility_rating(
-                r, neighbor_compatibility_min_max
-            )
-            self._compute_restricted_type_orientation(
-                r, restricted_type_orientation_min_max
-            )
-            self._compute_group_interference_rating(r, interference_group_min_max)
-
-    def _compute_normalized_rating(
-        self, val_min_max, value, rating_min_max, boost_factor=1.0, invert=False
-    ):
-        min_val, max_val = val_min_max
-        if min_val == max_val:
-            return 0  # rating should not be considered at all as all tiles have the same value
-
-        normalized_factor = (value - min_val) / (max_val - min_val)
-        if invert:
-            normalized_factor = 1 - normalized_factor
-
-        min_rating, max_rating = rating_min_max
-        return int(
-            min_rating + normalized_factor * boost_factor * (max_rating - min_rating)
-        )
-
-    def _compute_tile_placement_rating(self, rating):
-        rating.tile_placement_rating = 0
-        for subsection in TileSubsection.get_side_values():
-            neighbor_coords = rating.tile.get_neighbor_coords(subsection)
-            tile_placement = Tile.Placement.UNKNOWN
-
-            side = rating.tile.get_side(subsection)
-            if neighbor_coords in self.played_tiles:
-                neigbor_tile = self.played_tiles[neighbor_coords]
-                if side.placement == Side.Placement.IMPERFECT_MATCH:
-                    # when placing imperfectly, consider if the neighboring tile
-                    # that we place against has already been imperfect before or
-                    # would only be ruined through the candidate tile
-                    tile_placement = neigbor_tile.get_placement()
-                elif side.placement == Side.Placement.PERFECT_MATCH:
-                    # when placing perfectly, see if the neighboring tile that we place against
-                    # would be perfectly closed by the candidate tile
-                    tile_placement = (
-                        neigbor_tile.get_placement_considering_neighbor_tile(
-                            rating.tile
-                        )
-                    )
-
-            rating.tile_placement_rating += self._BASE_RATING[side.placement][
-                tile_placement
-            ]
-
-        # assign a bonus, if the candidate is directly closed and therefore plugs a hole
-        if rating.tile.get_num_sides(Side.Placement.UNKNOWN_MATCH) == 0:
-            rating.tile_placement_rating += self._PLUG_HOLE_VALUE
-
-    def _compute_group_sizes_rating(self, rating, min_max_group_size):
-        total_group_size, involved_group_types = rating.group_aggregation
-
-        # we combine the group size (actual group size increase) with the
-        # perspective group size increase to calculate the group rating
-        total_group_size += rating.perspective_group_extension_score
-
-        boost_factor = 1.0
-        # boost groups of restricted types as extending them
-        # should be a priority as restricted type tiles are rare
-        if any(
-            Group.is_type_restricted(involved_type)
-            for involved_type in involved_group_types
-        ):
-            boost_factor = self._GROUP_SIZE_RATING_RESTRICTED_BOOST_FACTOR
-
-        rating.group_rating = self._compute_normalized_rating(
-            min_max_group_size,
-            total_group_size,
-            (self._GROUP_SIZE_MIN_RATING, self._GROUP_SIZE_MAX_RATING),
-            boost_factor=boost_factor,
-        )
-
-    def _compute_neighbor_type_demotion_rating(self, rating):
-        rating.neighbor_type_demotion_rating = 0
+    @profiled
+    def _prepare_neighbor_type_demotion(self, rating):
+        rating.neighbor_type_demotion_score = 0
         for subsection in TileSubsection.get_all_values():
             if subsection not in rating.open_neighbor_side_types:
                 continue
 
             num_known_sides = 0
             num_station_compatible_sides = 0
-            different_types = {}  # actual different types
-            different_types_reduced = []  # compatibility considered
+            different_types_mask = 0  # actual different types
+            different_types_reduced_mask = 0  # compatibility considered
             for n_subsection, n_type in rating.open_neighbor_side_types[
                 subsection
             ].items():
@@ -713,12 +610,9 @@ class TileEvaluation:
 
                 num_known_sides += 1
 
-                different_types[n_type] = None
-                if not any(
-                    n_type in self.PERFECT_MATCH_DICT[known_type]
-                    for known_type in different_types_reduced
-                ):
-                    different_types_reduced.append(n_type)
+                different_types_mask |= 1 << n_type
+                if not RuleTables.PERFECT_MATCH_MASKS[n_type] & different_types_reduced_mask:
+                    different_types_reduced_mask |= 1 << n_type
 
                 if (
                     SideType.is_equivalent_to_green(n_type)
@@ -726,33 +620,32 @@ class TileEvaluation:
                 ):
                     num_station_compatible_sides += 1
 
-            if len(different_types) == 0:
+            if different_types_mask == 0:
                 continue
 
             side = rating.tile.get_side(subsection)
+            # mask of the types that the side perfectly matches
+            side_matching_types_mask = RuleTables.PERFECT_MATCH_MASKS[side.type]
+            different_restricted_types_mask = \
+                different_types_mask & RuleTables.RESTRICTED_TYPES_MASK
 
             # there are no tiles with more than 4 different types
             # therefore apply a demotion if the candidate tile would add a new type,
             # thereby exceeding the threshold
-            if len(different_types_reduced) > 3 and not any(
-                side.type in self.PERFECT_MATCH_DICT[known_type]
-                for known_type in different_types_reduced
-            ):
-                rating.neighbor_type_demotion_rating += self._TYPE_DEMOTION_RATING_VALUE
+            if different_types_reduced_mask.bit_count() > 3 and \
+                    not side_matching_types_mask & different_types_reduced_mask:
+                rating.neighbor_type_demotion_score += self._TYPE_DEMOTION_RATING_VALUE
 
             # if the candidate tile would introduce a restricted type that is not yet present
             # for the open tile, we know that only a station will perfectly match there
             # therefore apply a demotion if a station would not perfectly match the open tile
             if (
-                any(
-                    restricted_type in different_types
-                    for restricted_type in self.RESTRICTED_DICT
-                )
+                different_restricted_types_mask
                 and side.type in self.RESTRICTED_DICT
-                and side.type not in different_types
+                and not (1 << side.type) & different_types_mask
                 and num_station_compatible_sides < num_known_sides
             ):
-                rating.neighbor_type_demotion_rating += self._TYPE_DEMOTION_RATING_VALUE
+                rating.neighbor_type_demotion_score += self._TYPE_DEMOTION_RATING_VALUE
 
             # if the open tile that the candidate side faces contains a restricted type, apply a
             # demotion as we usually want to avoid blocking restricted types in their extension
@@ -760,66 +653,67 @@ class TileEvaluation:
             # is already covered by the evaluation above
             elif (
                 side.type in self.RESTRICTED_DICT
-                and not any(
-                    restricted_type in different_types
-                    for restricted_type in self.RESTRICTED_DICT
-                )
-                and not any(
-                    side.type in self.PERFECT_MATCH_DICT[known_type]
-                    for known_type in different_types
-                )
+                and not different_restricted_types_mask
+                and not side_matching_types_mask & different_types_mask
             ):
                 # scale by the number of known sides, as it gets increasingly difficult to
                 # extend the restricted type, the fewer options we have
-                rating.neighbor_type_demotion_rating += (
+                rating.neighbor_type_demotion_score += (
                     self._TYPE_DEMOTION_RATING_VALUE * (num_known_sides / 5)
                 )
             elif (
                 side.type not in self.RESTRICTED_DICT
-                and any(
-                    restricted_type in different_types
-                    for restricted_type in self.RESTRICTED_DICT
-                )
-                and not any(
-                    side.type in self.PERFECT_MATCH_DICT[known_type]
-                    for known_type in different_types
-                    if known_type in self.RESTRICTED_DICT
-                )
+                and different_restricted_types_mask
+                and not side_matching_types_mask & different_restricted_types_mask
             ):
                 # scale by the number of known sides, as it gets increasingly difficult to
                 # extend the restricted type, the fewer options we have
-                rating.neighbor_type_demotion_rating += (
+                rating.neighbor_type_demotion_score += (
                     self._TYPE_DEMOTION_RATING_VALUE * (num_known_sides / 5)
                 )
 
-    def _compute_neighbor_compatibility_rating(
-        self, rating, min_max_neighbor_compatibility_score
-    ):
-        if rating.tile.get_num_sides(Side.Placement.UNKNOWN_MATCH) == 0:
-            rating.neighbor_compatibility_rating = 0
-            return
+    @profiled
+    def _compute(self, features):
+        ratings = np.zeros((len(features), len(TileEvaluation.Rating)))
+        if len(features) == 0:
+            return ratings
 
-        rating.neighbor_compatibility_rating = self._compute_normalized_rating(
-            min_max_neighbor_compatibility_score,
-            rating.neighbor_compatibility_score,
-            (
-                self._NEIGHBOR_COMPATIBILITY_MIN_RATING,
-                self._NEIGHBOR_COMPATIBILITY_MAX_RATING,
+        ratings[:, self.Rating.TILE_PLACEMENT] = self._compute_tile_placement_ratings(features)
+
+        # we combine the group size (actual group size increase) with the
+        # perspective group size increase to calculate the group rating
+        # groups of restricted types are boosted as extending them
+        # should be a priority as restricted type tiles are rare
+        ratings[:, self.Rating.GROUP] = self._compute_normalized_ratings(
+            features[:, self.Feature.GROUP_AGGREGATION_SIZE]
+            + features[:, self.Feature.PERSPECTIVE_GROUP_EXTENSION_SCORE],
+            (self._GROUP_SIZE_MIN_RATING, self._GROUP_SIZE_MAX_RATING),
+            boost_factor=np.where(
+                features[:, self.Feature.EXTENDS_RESTRICTED_GROUP] != 0,
+                self._GROUP_SIZE_RATING_RESTRICTED_BOOST_FACTOR,
+                1.0,
             ),
         )
 
-    def _compute_restricted_type_orientation(
-        self, rating, min_max_played_neighbor_count
-    ):
-        """
-        Checks the groups that the candidate tile participates in and counts the played tiles
-        in the surrounding area of all possible extensions.
-        Only applies for restricted types, as we usually try to build away from other types
-        to keep as many options open as possible.
-        """
-        rating.restricted_type_orientation_rating = self._compute_normalized_rating(
-            min_max_played_neighbor_count,
-            rating.rt_extension_surrounding_tile_count,
+        # a candidate without any open sides has no open neighbors to be compatible with
+        ratings[:, self.Rating.NEIGHBOR_COMPATIBILITY] = np.where(
+            features[:, self.Feature.NUM_UNKNOWN_SIDES] == 0,
+            0,
+            self._compute_normalized_ratings(
+                features[:, self.Feature.NEIGHBOR_COMPATIBILITY_SCORE],
+                (
+                    self._NEIGHBOR_COMPATIBILITY_MIN_RATING,
+                    self._NEIGHBOR_COMPATIBILITY_MAX_RATING,
+                ),
+            ),
+        )
+
+        ratings[:, self.Rating.NEIGHBOR_TYPE_DEMOTION] = \
+            features[:, self.Feature.NEIGHBOR_TYPE_DEMOTION]
+
+        # prefer building restricted types towards open space (fewer surrounding tiles)
+        ratings[:, self.Rating.RESTRICTED_TYPE_ORIENTATION] = self._compute_normalized_ratings(
+            features[:, self.Feature.RT_EXTENSION_SURROUNDING_TILE_COUNT],
             (
                 self._RESTRICTED_TYPE_ORIENTATION_MIN_RATING,
                 self._RESTRICTED_TYPE_ORIENTATION_MAX_RATING,
@@ -827,18 +721,38 @@ class TileEvaluation:
             invert=True,
         )
 
-    def _compute_group_interference_rating(
-        self, rating, min_max_neighbor_group_interference_score
-    ):
-        rating.neighbor_group_interference_rating = self._compute_normalized_rating(
-            min_max_neighbor_group_interference_score,
-            rating.neighbor_group_interference_score,
+        ratings[:, self.Rating.NEIGHBOR_GROUP_INTERFERENCE] = self._compute_normalized_ratings(
+            features[:, self.Feature.NEIGHBOR_GROUP_INTERFERENCE_SCORE],
             (
                 self._NEIGHBOR_GROUP_INTERFERENCE_MIN_RATING,
                 self._NEIGHBOR_GROUP_INTERFERENCE_MAX_RATING,
             ),
         )
 
+        return ratings
+
+    @staticmethod
+    def _compute_normalized_ratings(values, rating_min_max, boost_factor=1.0, invert=False):
+        min_val, max_val = values.min(), values.max()
+        if min_val == max_val:
+            # rating should not be considered at all as all tiles have the same value
+            return np.zeros(len(values))
+
+        normalized_factor = (values - min_val) / (max_val - min_val)
+        if invert:
+            normalized_factor = 1 - normalized_factor
+
+        min_rating, max_rating = rating_min_max
+        return np.trunc(
+            min_rating + normalized_factor * boost_factor * (max_rating - min_rating)
+        )
+
+    def _compute_tile_placement_ratings(self, features):
+        # assign a bonus, if the candidate is directly closed and therefore plugs a hole
+        return features[:, self.Feature.TILE_PLACEMENT_SCORE] + np.where(
+            features[:, self.Feature.NUM_UNKNOWN_SIDES] == 0, self._PLUG_HOLE_VALUE, 0
+        )
+
     class RatingDetails:
         def __init__(self, candidate_tile, played_tiles, open_coords):
             # tile that we are evaluating
@@ -876,39 +790,24 @@ class TileEvaluation:
             # of the sides of the candidate tile
             self.neighbor_group_interference_score: int = 0
 
-            # RATINGS
-            # -------
-            # evaluates the placement of the candidate tile regarding unknown,
-            # imperfect or perfect placement of sides
-            self.tile_placement_rating = 0
-
-            # evalues the participation of the candidate in
-            # (existing) groups and the increase of the group sizes
-            self.group_rating = 0
-
-            # evaluates open neighboring tiles at the candidate tile sides
-            # and considers all adjacent types of the open tiles
-            # regarding their compatibility with the candidate tile sides
-            self.neighbor_compatibility_rating = 0
-
-            # evaluates whether the candidate tile side types introduce a "tricky" situation,
-            # that makes future play difficult. In that case, a demotion will be applied
-            self.neighbor_type_demotion_rating = 0
+            # sum of the ratings for the placement of each side of the candidate tile
+            # regarding unknown, imperfect or perfect placement
+            self.tile_placement_score = 0
 
-            # evaluates the orientation of restricted types
-            # within the candidate tile to prefer building restricted
-            # types towards more open spaces, rather than towards existing tile placements
-            self.restricted_type_orientation_rating = 0
+            # sum of all demotions for "tricky" situations that the candidate tile would introduce
+            self.neighbor_type_demotion_score = 0
 
-            # evaluates whether a candidate tile interferes with a group of a different type
-            # that is neighboring an open tile that is adjacent to the candidate tile
-            # tries to avoid positioning tiles in a way that they block other groups
-            self.neighbor_group_interference_rating = 0
+            # RATINGS
+            # -------
+            # row of the rating matrix of the tile evaluation, assigned once all candidates
+            # have been rated. The individual ratings are only extracted on access
+            self.ratings = None
 
             self.open_neighbor_side_types = self._prepare_neighbor_evaluation(
                 played_tiles
             )
 
+        @profiled
         def _prepare_neighbor_evaluation(self, played_tiles):
             # collect open neighbor tile side information
             open_neighbor_side_types: Dict[
@@ -948,6 +847,60 @@ class TileEvaluation:
 
             return open_neighbor_side_types
 
+        def _get_rating(self, rating):
+            return self.ratings[rating].item()
+
+        @property
+        def tile_placement_rating(self):
+            """
+            Evaluates the placement of the candidate tile regarding unknown,
+            imperfect or perfect placement of sides.
+            """
+            return self._get_rating(TileEvaluation.Rating.TILE_PLACEMENT)
+
+        @property
+        def group_rating(self):
+            """
+            Evaluates the participation of the candidate in
+            (existing) groups and the increase of the group sizes.
+            """
+            return int(self._get_rating(TileEvaluation.Rating.GROUP))
+
+        @property
+        def neighbor_compatibility_rating(self):
+            """
+            Evaluates open neighboring tiles at the candidate tile sides
+            and considers all adjacent types of the open tiles
+            regarding their compatibility with the candidate tile sides.
+            """
+            return int(self._get_rating(TileEvaluation.Rating.NEIGHBOR_COMPATIBILITY))
+
+        @property
+        def neighbor_type_demotion_rating(self):
+            """
+            Evaluates whether the candidate tile side types introduce a "tricky" situation,
+            that makes future play difficult. In that case, a demotion will be applied.
+            """
+            return self._get_rating(TileEvaluation.Rating.NEIGHBOR_TYPE_DEMOTION)
+
+        @property
+        def restricted_type_orientation_rating(self):
+            """
+            Evaluates the orientation of restricted types within the candidate tile
+            to prefer building restricted types towards more open spaces,
+            rather than towards existing tile placements.
+            """
+            return int(self._get_rating(TileEvaluation.Rating.RESTRICTED_TYPE_ORIENTATION))
+
+        @property
+        def neighbor_group_interference_rating(self):
+            """
+            Evaluates whether a candidate tile interferes with a group of a different type
+            that is neighboring an open tile that is adjacent to the candidate tile.
+            Tries to avoid positioning tiles in a way that they block other groups.
+            """
+            return int(self._get_rating(TileEvaluation.Rating.NEIGHBOR_GROUP_INTERFERENCE))
+
     class RatedTile:
         INVALID_RATING = np.iinfo(np.int32).min
 
@@ -967,3 +920,4 @@ class TileEvaluation:
             if isinstance(other, TileEvaluation.RatedTile):
                 return self.tile == other.tile and self.rating == other.rating
             return False
+
@@ -13,4 +13,5 @@ class TileEvaluationFactory:
                 open_tiles_per_candidate.append(open_tiles_per_coordinates[candidate.coordinates])
 
         return TileEvaluation(candidate_tiles, open_tiles_per_candidate,
-                              session.played_tiles, session.groups)
+                              session.played_tiles, session.groups,
+                              session.group_extensions_index)
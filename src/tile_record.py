@@ -0,0 +1,121 @@
+import csv
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+class TileRecord(NamedTuple):
+    """
+    Persisted representation of a placed tile, as stored in CSV files and the database.
+    """
+
+    CSV_COLUMNS = ["id", "coordinates", "side_type_seq", "center_type", "quest_type"]
+
+    coordinates: Tuple[int, int]
+    side_type_seq: str
+    center_type: str
+    quest_type: Optional[str] = None  # character of the quest type, None without quest
+
+    @classmethod
+    def from_tile(cls, tile):
+        return cls(
+            tile.coordinates,
+            tile.get_side_type_seq(),
+            tile.get_center().type.to_character(),
+            tile.quest.type.to_character() if tile.quest is not None else None,
+        )
+
+    @classmethod
+    def from_strings(cls, coordinates, side_type_seq, center_type, quest_type):
+        """
+        Creates a record from the string values as persisted.
+
+        Args:
+            coordinates (str): The coordinates in the format "(x, y)".
+            side_type_seq (str): The side type sequence.
+            center_type (str): The center type character.
+            quest_type (str): The quest type character, empty or None without quest.
+        """
+        return cls(
+            cls.parse_coordinates(coordinates), side_type_seq, center_type, quest_type or None
+        )
+
+    @staticmethod
+    def parse_coordinates(coordinates) -> Tuple[int, int]:
+        """
+        Parses coordinates in the format "(x, y)".
+
+        Raises:
+            ValueError: If the coordinates are malformed.
+        """
+        values = coordinates.strip().strip("()").split(",")
+        if len(values) != 2:
+            raise ValueError(f"Invalid coordinates {coordinates}")
+        return (int(values[0]), int(values[1]))
+
+    @classmethod
+    def read_csv(cls, file_name) -> Iterator["TileRecord"]:
+        """
+        Reads the records of a CSV session file row by row.
+
+        Args:
+            file_name (str): The path of the CSV file.
+
+        Raises:
+            ValueError: If the file does not contain the expected columns.
+            FileNotFoundError: If the file does not exist.
+        """
+        with open(file_name, newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            if reader.fieldnames is None or \
+                    any(c not in reader.fieldnames for c in cls.CSV_COLUMNS[1:]):
+                raise ValueError(f"File {file_name} does not contain a session")
+
+            for row in reader:
+                yield cls.from_strings(
+                    row["coordinates"], row["side_type_seq"], row["center_type"],
+                    row["quest_type"]
+                )
+
+    @staticmethod
+    def count_csv(file_name) -> int:
+        """
+        Counts the records of a CSV session file without keeping them in memory.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        with open(file_name, newline="", encoding="utf-8") as file:
+            return max(sum(1 for _ in csv.reader(file)) - 1, 0)  # without header
+
+    @classmethod
+    def write_csv(cls, file_name, records: Iterable["TileRecord"]):
+        """
+        Writes the records as CSV session file.
+
+        Args:
+            file_name (str): The path of the CSV file.
+            records (Iterable[TileRecord]): The records to write.
+        """
+        with open(file_name, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(cls.CSV_COLUMNS)
+            for i, record in enumerate(records):
+                writer.writerow([i, *record.to_strings()])
+
+    def to_strings(self):
+        """
+        Returns the values as persisted: coordinates, side type sequence, center and quest type.
+        """
+        return (str(self.coordinates), self.side_type_seq, self.center_type,
+                self.quest_type or "")
+
+    @classmethod
+    def to_dataframe(cls, records: Iterable["TileRecord"]):
+        """
+        Exports the records as pandas DataFrame with the CSV columns (requires pandas).
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        return pd.DataFrame(
+            [[i, *record.to_strings()] for i, record in enumerate(records)],
+            columns=cls.CSV_COLUMNS,
+        ).set_index("id")
@@ -2,6 +2,7 @@ from PySide6.QtWidgets import QTableWidgetItem, QVBoxLayout
 from PySide6.QtCore import Qt, Slot, Signal
 
 from src.side import Side
+from src.profiler import profiled
 from src.ui.constants import UIConstants
 
 from src.ui.candidate_table_widget import CandidateTableWidget, NumericTableWidgetItem
@@ -127,6 +128,7 @@ class CandidateList(CandidateTableWidget):
             self._select_row_by_candidate_index(0)
             self.trigger_focus_selection.emit()
 
+    @profiled
     def update_table(self):
         self._clear_table()
         for row_index, candidate in enumerate(self.candidates):
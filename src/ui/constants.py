@@ -27,6 +27,7 @@ class UIConstants:
         SELECTED = "SELECTED"
 
     TITLE = "Dorftipster - Dorfromantik tile placement helper"
+    BINARY_SESSION_EXTENSION = ".dtsb"
     NEXT_TILE_TITLE = "Next tile definition"
     NEXT_TILE_SIDE_SEQ_TITLE = "Side types"
     NEXT_TILE_CENTER_TITLE = "Center type"
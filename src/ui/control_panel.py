@@ -36,6 +36,7 @@ class ControlPanel(QWidget):
         self.setup_ui()
         self.place_button.setEnabled(False)
         self.undo_button.setEnabled(False)
+        self.redo_button.setEnabled(False)
         self.session = session
 
         self.submitted_tile_sequence = None
@@ -77,6 +78,8 @@ class ControlPanel(QWidget):
         place_undo_layout.addWidget(self.place_button)
         self.undo_button = QPushButton("Undo last tile")
         place_undo_layout.addWidget(self.undo_button)
+        self.redo_button = QPushButton("Redo tile")
+        place_undo_layout.addWidget(self.redo_button)
         layout.addLayout(place_undo_layout)
 
         info_layout = QHBoxLayout()
@@ -138,6 +141,7 @@ class ControlPanel(QWidget):
         self.next_tile_center.clear()
         self.place_button.setEnabled(False)
         self.undo_button.setEnabled(False)
+        self.redo_button.setEnabled(False)
 
         self.submitted_tile_sequence = None
         self.submitted_tile_center = None
@@ -146,6 +150,10 @@ class ControlPanel(QWidget):
     def set_undo_button_enabled(self, enabled):
         self.undo_button.setEnabled(enabled)
 
+    @Slot(bool)
+    def set_redo_button_enabled(self, enabled):
+        self.redo_button.setEnabled(enabled)
+
     @Slot(bool)
     def set_place_button_enabled(self, enabled):
         self.place_button.setEnabled(enabled)
@@ -177,5 +185,3 @@ class ControlPanel(QWidget):
         else:
             self.place_button.setEnabled(False)
             self.compute_button.setFocus()
-
-        self.undo_button.setEnabled(False)
@@ -0,0 +1,113 @@
+import os
+import pytest
+
+from src.binary_session_file import BinarySessionFile
+from src.session import Session
+from src.tile_record import TileRecord
+
+def test_round_trip():
+    file = "./tests/data/__test_binary_session__.dtsb"
+    records = [
+        TileRecord((0, 0), "GGGGGG", "G"),
+        TileRecord((0, 4), "W(G)WGWG", "W", "W"),
+        TileRecord((-3, -2), "RRGG(T)S", "R", "R"),
+        TileRecord((-32768, 32767), "?(P)HCWG", "?"),
+    ]
+    BinarySessionFile.write(file, records, [(0, 8), (-3, 2)])
+    assert os.path.getsize(file) == BinarySessionFile.HEADER_DTYPE.itemsize \
+        + 4 * BinarySessionFile.TILE_DTYPE.itemsize + 2 * BinarySessionFile.WATCHED_DTYPE.itemsize
+
+    session_file = BinarySessionFile(file)
+    assert session_file.num_tiles == 4
+    assert session_file.get_tile_records() == records
+    assert [r for chunk in session_file.iterate_tile_records(3) for r in chunk] == records
+    assert session_file.get_watched_coordinates() == [(0, 8), (-3, 2)]
+
+    # single type sequences are expanded to all sides
+    BinarySessionFile.write(file, [TileRecord((0, 0), "G", "G")])
+    session_file = BinarySessionFile(file)
+    assert session_file.get_tile_records() == [TileRecord((0, 0), "GGGGGG", "G")]
+    assert not session_file.get_watched_coordinates()
+
+    del session_file
+    os.remove(file)
+
+def test_invalid_files():
+    file = "./tests/data/__test_binary_session__.dtsb"
+
+    with pytest.raises(ValueError):
+        BinarySessionFile.write(file, [TileRecord((0, 40000), "GGGGGG", "G")])
+    with pytest.raises(ValueError):
+        BinarySessionFile.write(file, [TileRecord((0, 0), "GGGG", "G")])
+
+    with open(file, "wb") as f:
+        f.write(b"DTSB")
+    with pytest.raises(ValueError):
+        BinarySessionFile(file)
+
+    with open(file, "wb") as f:
+        f.write(b"id,coordinates,side_type_seq,center_type,quest_type\n")
+    with pytest.raises(ValueError):
+        BinarySessionFile(file)
+
+    BinarySessionFile.write(file, [TileRecord((0, 0), "GGGGGG", "G")])
+    with open(file, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        BinarySessionFile(file)
+
+    with pytest.raises(FileNotFoundError):
+        BinarySessionFile("non existing file path")
+
+    os.remove(file)
+
+def test_session_round_trip():
+    file = "./tests/data/__test_binary_session__.dtsb"
+    database = "./tests/data/__test_binary_session__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    with Session(database) as session:
+        session.load_from_csv("./tests/data/group_isolated_side.csv", simulate_tile_placement=False)
+        session.watch_coordinates(list(session.open_coords)[0])
+        session.save_to_binary(file)
+
+        loaded_session = Session(database)
+        loaded_session.load_from_binary(file, simulate_tile_placement=False)
+        assert loaded_session.get_tile_records() == session.get_tile_records()
+        assert loaded_session.played_tiles == session.played_tiles
+        assert loaded_session.watched_open_coords == session.watched_open_coords
+
+        # binary -> database -> binary
+        loaded_session.save_to_database("binary")
+        session_id = loaded_session.get_all_sessions_from_database()[0].id
+        database_session = Session(database)
+        database_session.load_from_database(session_id, simulate_tile_placement=False)
+        database_session.save_to_binary(file + "2")
+        with open(file, "rb") as f, open(file + "2", "rb") as f2:
+            assert f.read() == f2.read()
+
+        simulated_session = Session()
+        simulated_session.load_from_binary(file, simulate_tile_placement=True)
+        assert len(simulated_session.played_tiles) == len(session.played_tiles)
+        assert not simulated_session.watched_open_coords
+
+    os.remove(file)
+    os.remove(file + "2")
+    os.remove(database)
+
+def test_session_errors():
+    file = "./tests/data/__test_binary_session__.dtsb"
+    session = Session()
+
+    with pytest.raises(ValueError):
+        session.save_to_binary(None)
+    with pytest.raises(ValueError):
+        session.load_from_binary("", simulate_tile_placement=False)
+
+    BinarySessionFile.write(file, [])
+    with pytest.raises(ValueError):
+        session.load_from_binary(file, simulate_tile_placement=False)
+
+    os.remove(file)
@@ -0,0 +1,79 @@
+import os
+import pytest
+
+from src.session import Session
+from src.side_type import SideType
+from src.tile import Tile
+
+from benchmarks.board_generator import BoardGenerator, main
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        BoardGenerator(landscape_weights={})
+
+    with pytest.raises(ValueError):
+        BoardGenerator(river_probability=0.5, train_probability=0.5, station_probability=0.1)
+
+def test_side_type_sequences_deterministic():
+    sequences = BoardGenerator(seed=1).generate_side_type_sequences(200)
+    assert len(sequences) == 200
+    assert sequences == BoardGenerator(seed=1).generate_side_type_sequences(200)
+    assert sequences != BoardGenerator(seed=2).generate_side_type_sequences(200)
+
+    for sequence, center_type in sequences:
+        assert Tile.is_valid_side_sequence(sequence)
+        assert SideType.is_valid(center_type)
+
+def test_side_type_distribution():
+    generator = BoardGenerator(seed=3,
+                               landscape_weights={SideType.WOODS: 1},
+                               river_probability=0.2,
+                               train_probability=0.2,
+                               station_probability=0.1,
+                               isolation_probability=0.5)
+    sequences = generator.generate_side_type_sequences(500)
+    side_chars = "".join(sequence for sequence, _ in sequences)
+
+    assert set(side_chars) == set("WRT()")
+    assert any(center_type == SideType.STATION.to_character() for _, center_type in sequences)
+
+def test_build_session_compact():
+    generator = BoardGenerator(seed=4, river_probability=0.2, train_probability=0.1)
+    session = generator.build_session(150)
+
+    assert len(session.played_tiles) == 150
+    for tile in session.played_tiles.values():
+        assert tile.get_placement() != Tile.Placement.NOT_POSSIBLE
+
+    # same seed yields the same board
+    assert list(session.played_tiles) == list(generator.build_session(150).played_tiles)
+
+def test_build_session_fallback_station():
+    generator = BoardGenerator(seed=5)
+    generator._MAX_DRAW_ATTEMPTS = 0
+    session = generator.build_session(5)
+
+    assert len(session.played_tiles) == 5
+    assert all(tile.get_center().type == SideType.STATION
+               for coordinates, tile in session.played_tiles.items() if coordinates != (0, 0))
+
+def test_build_session_best_candidate():
+    session = BoardGenerator(seed=6).build_session(10, BoardGenerator.Policy.BEST_CANDIDATE)
+    assert len(session.played_tiles) == 10
+
+def test_export_csv():
+    file = "./tests/data/__test_board_generator__.csv"
+    session = BoardGenerator(seed=7).export_csv(file, 50)
+
+    loaded_session = Session()
+    loaded_session.load_from_csv(file, simulate_tile_placement=False)
+    assert list(loaded_session.played_tiles) == list(session.played_tiles)
+    assert loaded_session.score == session.score
+
+    os.remove(file)
+
+    main(["--tiles", "20", "--seed", "8", "--output", file])
+    loaded_session.load_from_csv(file, simulate_tile_placement=False)
+    assert len(loaded_session.played_tiles) == 20
+
+    os.remove(file)
@@ -1,7 +1,12 @@
+import sqlite3
 import pytest
 import os
 
 from src.database_access import DatabaseAccess
+from src.session import Session
+from src.side_type import SideType
+from src.tile import Tile
+from src.tile_record import TileRecord
 
 def test_no_connection():
     database_access = DatabaseAccess()
@@ -21,6 +26,15 @@ def test_no_connection():
     with pytest.raises(RuntimeError):
         database_access.delete_session_and_related("some name")
 
+    with pytest.raises(RuntimeError):
+        database_access.create_tables_in_background()
+
+    with pytest.raises(RuntimeError):
+        list(database_access.iterate_session_tiles("some_id"))
+
+    with pytest.raises(RuntimeError):
+        database_access.count_session_tiles("some_id")
+
 def test_invalid_input():
     database = "./tests/data/__test_save_load__.db"
 
@@ -49,6 +63,29 @@ def test_invalid_input():
 
     os.remove(database)
 
+def test_deferred_setup(capsys):
+    database = "./tests/data/__test_deferred_setup__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    with DatabaseAccess(database, defer_setup=True) as database_access:
+        assert not os.path.exists(database)
+
+        database_access.create_tables_in_background()
+        # waits for the tables to be created
+        assert not database_access.find_session_ids_by_name("some name")
+        assert database_access.setup_thread is None
+
+    os.remove(database)
+
+    # errors during the background setup are only reported
+    database_access = DatabaseAccess("./tests/data/missing/__test_deferred_setup__.db",
+                                     defer_setup=True)
+    database_access.create_tables_in_background()
+    database_access.wait_for_setup()
+    assert "ERROR" in capsys.readouterr().out
+
 def test_find_session():
     database = "./tests/data/__test_save_load__.db"
 
@@ -58,4 +95,275 @@ def test_find_session():
     with DatabaseAccess(database) as database_access:
         assert not database_access.find_session_ids_by_name("some name")
 
-    os.remove(database)
\ No newline at end of file
+    os.remove(database)
+def create_previous_schema(database, placed_tiles_coordinates):
+    with sqlite3.connect(database) as conn:
+        conn.execute('''CREATE TABLE sessions (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT, name VARCHAR(255), save_date DATE)''')
+        conn.execute('''CREATE TABLE tiles (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT, side_type_seq VARCHAR(6),
+                        center_type VARCHAR(1), quest_type VARCHAR(1), session_id INTEGER)''')
+        conn.execute('''CREATE TABLE placed_tiles (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT, coordinates VARCHAR(15),
+                        num_perfect_sides INTEGER, num_imperfect_sides INTEGER,
+                        num_unknown_sides INTEGER, tile_id INTEGER)''')
+        conn.execute('''CREATE TABLE watched_coordinates (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT, coordinates VARCHAR(15),
+                        session_id INTEGER)''')
+        conn.execute("INSERT INTO sessions (name, save_date) VALUES ('old', '2024-01-01')")
+        for tile_id, (coordinates, seq) in enumerate(
+                zip(placed_tiles_coordinates, ["GGGGGG", "W(G)WGWG"]), start=1):
+            conn.execute("INSERT INTO tiles (side_type_seq, center_type, quest_type, session_id) "
+                         "VALUES (?, ?, '', 1)", (seq, seq[0]))
+            conn.execute("INSERT INTO placed_tiles (coordinates, num_perfect_sides, "
+                         "num_imperfect_sides, num_unknown_sides, tile_id) "
+                         "VALUES (?, 0, 0, 6, ?)", (coordinates, tile_id))
+        conn.execute("INSERT INTO watched_coordinates (coordinates, session_id) "
+                     "VALUES ('(3, -2)', 1)")
+
+def test_coordinate_columns_migration():
+    database = "./tests/data/__test_migration__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    create_previous_schema(database, ["(0, 0)", "(0, -4)"])
+
+    with DatabaseAccess(database) as database_access:
+        database_access.create_tables()  # migrates only once
+
+        tile_records, watched_coords = database_access.load_session(1)
+        assert tile_records == [TileRecord((0, 0), "GGGGGG", "G"),
+                                TileRecord((0, -4), "W(G)WGWG", "W")]
+        assert watched_coords == [(3, -2)]
+        assert database_access.fetch_all_sessions() == \
+            [DatabaseAccess.SessionInfo(1, "old", "2024-01-01", 2, None)]
+
+        assert database_access.fetch_tiles_in_region(1, (-3, -4), (3, -1)) == tile_records[1:]
+        assert not database_access.fetch_tiles_in_region(2, (-3, -4), (3, 4))
+
+    os.remove(database)
+
+    # invalid coordinates keep the previous schema
+    create_previous_schema(database, ["(0, 0)", "(a, b)"])
+    with pytest.raises(ValueError):
+        DatabaseAccess(database)
+
+    with sqlite3.connect(database) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(placed_tiles)")]
+        assert "coordinates" in columns
+        assert conn.execute("SELECT COUNT(*) FROM placed_tiles").fetchone()[0] == 2
+
+    os.remove(database)
+
+    # failing catalog migration keeps the previous sessions table
+    create_previous_schema(database, ["(0, 0)", "(0, -4)"])
+    with sqlite3.connect(database) as conn:
+        conn.execute("ALTER TABLE sessions ADD COLUMN score INTEGER")
+    with pytest.raises(sqlite3.OperationalError):
+        DatabaseAccess(database)
+
+    with sqlite3.connect(database) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+        assert "tile_count" not in columns
+
+    os.remove(database)
+
+def test_bulk_insert():
+    database = "./tests/data/__test_bulk_insert__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    session = Session()
+    session.load_from_csv("./tests/data/group.csv", simulate_tile_placement=False)
+    session.watch_coordinates(list(session.open_coords)[0])
+    records = session.get_tile_records()
+
+    with DatabaseAccess(database) as database_access:
+        first_id = database_access.save_session("first", session)
+        second_id = database_access.save_session("second", session,
+                                                 save_watched_coordinates=False)
+        database_access.journal_undo(first_id)
+
+        assert database_access.load_session(first_id) == \
+            (records[:-1], list(session.watched_open_coords))
+        assert database_access.load_session(second_id) == (records, [])
+
+        # refill the first session, keeping the second one untouched
+        database_access.fill_session_tiles(first_id, session.played_tiles, replace=True)
+        assert database_access.load_session(first_id) == (records, [])
+        database_access.add_watched_coordinates(first_id, (0, 8))
+        database_access.conn.commit()
+        assert database_access.load_session(first_id) == (records, [(0, 8)])
+        database_access.fill_session_tiles(second_id, {})
+        assert database_access.load_session(second_id) == (records, [])
+
+        # single tile operations
+        database_access.journal_placed_tiles(second_id, list(session.played_tiles.values())[:1])
+        assert database_access.load_session(second_id) == (records + records[:1], [])
+        database_access.delete_session_and_related(second_id, leave_empty_session=True)
+        database_access.journal_undo(second_id)
+        assert database_access.load_session(second_id) == ([], [])
+
+    os.remove(database)
+
+def count_journal_entries(database):
+    conn = sqlite3.connect(database)
+    try:
+        return conn.execute('SELECT COUNT(seq) FROM session_journal').fetchone()[0]
+    finally:
+        conn.close()
+
+def test_session_journal(monkeypatch):
+    database = "./tests/data/__test_session_journal__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    session = Session()
+    session.load_from_csv("./tests/data/group.csv", simulate_tile_placement=False)
+    tiles = list(session.played_tiles.values())
+    records = session.get_tile_records()
+
+    with DatabaseAccess(database) as database_access:
+        database_access.JOURNAL_COMPACTION_INTERVAL = 5
+        session_id = database_access.save_session("journal", session)
+
+        # undo saved tiles, place and undo journaled tiles
+        database_access.journal_undo(session_id)
+        database_access.journal_undo(session_id)
+        database_access.journal_placed_tiles(session_id, [tiles[-2]])
+        database_access.journal_placed_tiles(session_id, tiles[:2])
+        assert count_journal_entries(database) == 0  # compacted
+        assert database_access.load_session(session_id)[0] == records[:-1] + records[:2]
+
+        database_access.journal_placed_tiles(session_id, [tiles[2]])
+        database_access.journal_undo(session_id)
+        database_access.journal_undo(session_id)
+        assert count_journal_entries(database) == 3
+        assert database_access.count_session_tiles(session_id) == len(records)
+        assert count_journal_entries(database) == 0
+
+        # reset discards all previous tiles
+        database_access.journal_placed_tiles(session_id, tiles[:2], reset=True)
+        database_access.journal_undo(session_id)
+        assert count_journal_entries(database) == 4
+        assert [s.number_of_tiles for s in database_access.fetch_all_sessions()] == [1]
+
+        database_access.journal_placed_tiles(session_id, [tiles[0]], reset=True)
+        database_access.journal_undo(session_id)
+        database_access.journal_undo(session_id)
+        database_access.journal_placed_tiles(session_id, [tiles[1]])
+        assert database_access.fetch_tiles_in_region(session_id, (-100, -100), (100, 100)) \
+            == [records[1]]
+
+    with DatabaseAccess(database) as database_access:
+        database_access.journal_undo(session_id)
+        database_access.journal_placed_tiles(session_id, [tiles[2]])
+        assert count_journal_entries(database) == 2
+
+    # journaled operations are recovered when opening the database
+    database_access = DatabaseAccess(database)
+    assert count_journal_entries(database) == 0
+    assert database_access.load_session(session_id)[0] == [records[2]]
+
+    # failing operations keep the journal
+    with pytest.raises(sqlite3.ProgrammingError):
+        database_access._append_to_journal(session_id, [(DatabaseAccess.JournalOperation.UNDO,)])
+    database_access.journal_placed_tiles(session_id, [tiles[3]])
+    def fail_insert(*_):
+        raise sqlite3.OperationalError("insert failed")
+
+    with monkeypatch.context() as m:
+        m.setattr(DatabaseAccess, "_insert_tile_rows", fail_insert)
+        with pytest.raises(sqlite3.OperationalError):
+            database_access.compact_journal()
+    assert count_journal_entries(database) == 1
+
+    database_access.delete_session_and_related(session_id)
+    assert count_journal_entries(database) == 0
+    database_access.close_connection()
+
+    os.remove(database)
+
+def test_session_catalog():
+    database = "./tests/data/__test_session_catalog__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    session = Session()
+    session.load_from_csv("./tests/data/group.csv", simulate_tile_placement=False)
+    tiles = list(session.played_tiles.values())
+    num_tiles = len(tiles)
+
+    def get_summary(database_access):
+        return [(s.name, s.number_of_tiles, s.score) for s in database_access.fetch_all_sessions()]
+
+    with DatabaseAccess(database) as database_access:
+        assert not database_access.fetch_all_sessions()
+
+        # empty sessions are listed as well
+        database_access.save_session("empty", Session())
+        session_id = database_access.save_session("game", session)
+        assert get_summary(database_access) == [("empty", 0, 0), ("game", num_tiles, session.score)]
+
+        database_access.journal_undo(session_id)
+        database_access.compact_journal(session_id)
+        assert get_summary(database_access)[1] == ("game", num_tiles - 1, session.score)
+        database_access.fill_session_tiles(session_id, {(0, 0): tiles[0]}, score=5)
+        assert get_summary(database_access)[1] == ("game", num_tiles, 5)
+
+        database_access.journal_placed_tiles(session_id, tiles[:2], score=7)
+        database_access.journal_undo(session_id, score=6)
+        database_access.journal_undo(session_id)
+        database_access.journal_undo(session_id)
+        assert get_summary(database_access)[1] == ("game", num_tiles - 1, 6)
+
+        database_access.journal_placed_tiles(session_id, tiles[:3], reset=True, score=3)
+        assert get_summary(database_access)[1] == ("game", 3, 3)
+
+        database_access.fill_session_tiles(session_id, session.played_tiles, replace=True)
+        assert get_summary(database_access)[1] == ("game", num_tiles, 3)
+
+        database_access.delete_session_and_related(session_id, leave_empty_session=True)
+        assert get_summary(database_access)[1] == ("game", 0, 3)
+        database_access.delete_session_and_related(session_id)
+        assert get_summary(database_access) == [("empty", 0, 0)]
+
+    os.remove(database)
+
+def test_tile_histogram():
+    database = "./tests/data/__test_tile_histogram__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    sessions = []
+    for file in ["./tests/data/group.csv", "./tests/data/group_isolated_side.csv"]:
+        session = Session()
+        session.load_from_csv(file, simulate_tile_placement=False)
+        sessions.append(session)
+
+    with DatabaseAccess(database) as database_access:
+        assert database_access.fetch_tile_histogram() == {}
+
+        session_ids = [database_access.save_session(str(i), s) for i, s in enumerate(sessions)]
+        for session_id, session in zip(session_ids, sessions):
+            assert database_access.fetch_tile_histogram(session_id) == \
+                session.seen_tiles_index.get_tile_histogram()
+
+        # isolated sides are not distinguished, rotations are counted together
+        database_access.journal_placed_tiles(session_ids[0], [
+            Tile("(G)WWWWW", "W", (30, 30)), Tile("WWW(G)WW", "W", (30, 34))
+        ])
+        expected_histogram = {}
+        for session in sessions:
+            for side_types, count in session.seen_tiles_index.get_tile_histogram().items():
+                expected_histogram[side_types] = expected_histogram.get(side_types, 0) + count
+        woods_green = tuple([SideType.WOODS] * 5 + [SideType.GREEN])
+        expected_histogram[woods_green] = expected_histogram.get(woods_green, 0) + 2
+        assert database_access.fetch_tile_histogram() == expected_histogram
+
+    os.remove(database)
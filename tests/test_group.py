@@ -55,7 +55,15 @@ def test_init():
         (-3,2) : [TileSubsection.LOWER_RIGHT],
     }
     assert sorted(group.possible_extensions) == sorted(expected_possible_extensions)
+    assert group.has_temporary_id()
+    assert Group(tile, group_type, subsections).id != group.id
+
+    group.make_persistent()
+    assert not group.has_temporary_id()
     assert group.id and len(group.id) == 8
+    persistent_id = group.id
+    group.make_persistent()
+    assert group.id == persistent_id
 
 def test_eq():
     session = Session()
@@ -81,6 +89,37 @@ def test_eq():
         assert group_i != "string"
 
 
+def test_fingerprint():
+    session = Session()
+    session.load_from_csv("./tests/data/group_merge.csv", simulate_tile_placement=False)
+
+    num_equal_groups = 0
+    for group in session.groups.values():
+        assert group.fingerprint == Group.compute_fingerprint(group.tile_coordinates)
+
+        # the same group computed from any of its tiles has the same fingerprint
+        for coordinates in group.tile_coordinates:
+            tile = session.played_tiles[coordinates]
+            subsections = group.get_group_connected_tile_subsections(
+                tile, next(s for s in TileSubsection.get_side_values()
+                           if tile.get_side(s).type in Constants.COMPATIBLE_GROUP_TYPES[group.type]))
+            other_group = Group(tile, group.type, subsections)
+            other_group.compute(session.played_tiles)
+            if other_group.tile_coordinates == group.tile_coordinates:
+                assert other_group.fingerprint == group.fingerprint
+                assert other_group == group
+                num_equal_groups += 1
+    assert num_equal_groups > len(session.groups)
+
+    # equal fingerprints are confirmed by the coordinates
+    group = next(iter(session.groups.values()))
+    other_group = Group(group.start_tile, group.type, group.start_tile_subsections)
+    other_group.compute(session.played_tiles)
+    assert other_group == group
+    other_group.tile_coordinates = {(100, 100)}
+    assert other_group != group
+
+
 def test_lt():
     groups = [
         Group(start_tile=Tile([SideType.WOODS], SideType.WOODS, (0,4)), side_type=SideType.WOODS, subsections=TileSubsection.get_all_values()),
@@ -378,6 +417,7 @@ def test_group_merge():
 
     def assert_initial_marked_for_deletion():
         assert len(session.groups_marked_for_deletion_at_coords) == 0
+        assert len(session.marked_group_ids) == 0
 
     def assert_after_place(actual_groups):
         assert_group_expectation(actual_groups, after_place_group_expectation)
@@ -403,6 +443,7 @@ def test_group_merge():
             assert g_id in group_ids_marked_for_deletion
         for g_id in houses_group_ids[1:]:
             assert g_id in group_ids_marked_for_deletion
+        assert session.marked_group_ids == set(group_ids_marked_for_deletion)
 
     def prepare_candidate():
         # prepare a tile that connects the groups at (3,-2)
@@ -438,6 +479,7 @@ def test_group_merge():
     assert woods_group_ids[0] in session.groups
     assert houses_group_ids[0] in session.groups
     assert len(session.groups_marked_for_deletion_at_coords) == 0
+    assert len(session.marked_group_ids) == 0
 
 def test_group_closed():
     session = Session()
@@ -471,6 +513,7 @@ def test_group_closed():
         assert first_group.id in session.groups
         assert second_group.id in session.groups
         assert len(session.groups_marked_for_deletion_at_coords) == 0
+        assert len(session.marked_group_ids) == 0
 
     def assert_after_place(group_expectation, relevant_group, tile_coords):
         assert_group_expectation(session.groups, group_expectation)
@@ -478,6 +521,8 @@ def test_group_closed():
         assert len(session.groups_marked_for_deletion_at_coords) == 1
         assert tile_coords in session.groups_marked_for_deletion_at_coords
         assert relevant_group.id in [group.id for group in session.groups_marked_for_deletion_at_coords[tile_coords]]
+        assert session.marked_group_ids == \
+            {group.id for group in session.groups_marked_for_deletion_at_coords[tile_coords]}
 
     assert_initial()
 
@@ -1004,4 +1049,21 @@ def test_group_isolated_side():
                 },
                 [(0,-4)])
         ]
-    assert_group_expectation(session.groups, after_place_group_expectation)
\ No newline at end of file
+    assert_group_expectation(session.groups, after_place_group_expectation)
+
+def test_group_ids():
+    session = Session()
+    session.place_candidate(session.prepare_candidate([SideType.GREEN], SideType.GREEN, (0,0)))
+
+    candidates = session.compute_candidate_tiles("GGWWWW", SideType.WOODS)
+    assert candidates
+    for candidate in candidates:
+        for group_id, gp in candidate.group_participation.items():
+            assert group_id == gp.group.id
+            # groups of candidates only receive a persistent id when being placed
+            assert gp.group.has_temporary_id() == (group_id not in session.groups)
+
+    session.place_candidate(candidates[0])
+    assert all(not group.has_temporary_id() for group in session.groups.values())
+    assert all(group_id == group.id for group_id, group in session.groups.items())
+    assert all(group_id in session.groups for group_id in candidates[0].group_participation)
@@ -0,0 +1,66 @@
+from src.group import Group
+from src.group_extensions_index import GroupExtensionsIndex
+from src.session import Session
+from src.side_type import SideType
+from src.tile import Tile
+
+def test_update_remove():
+    index = GroupExtensionsIndex()
+    green_tile = Tile([SideType.GREEN], SideType.GREEN, (0,0))
+    river_tile = Tile([SideType.RIVER, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN], SideType.RIVER, (0,4))
+    green_group = Group(green_tile, SideType.GREEN, [], "green")
+    river_group = Group(river_tile, SideType.RIVER, [], "river")
+
+    index.update(green_group)
+    index.update(river_group)
+    assert index.group_ids[(0,4)] == {"green": None}
+    assert index.group_ids[(0,8)] == {"river": None}
+    assert set(index.restricted_group_ids) == set(river_group.possible_extensions)
+    assert index.restricted_group_ids[(0,8)] == {"river": None}
+
+    # shared extension coordinates
+    shared_coords = next(c for c in green_group.possible_extensions
+                         if c in river_group.possible_extensions)
+    assert index.group_ids[shared_coords] == {"green": None, "river": None}
+
+    # only the changed extension coordinates are updated
+    del green_group.possible_extensions[shared_coords]
+    index.update(green_group)
+    assert index.group_ids[shared_coords] == {"river": None}
+    assert shared_coords not in index.extensions["green"]
+
+    index.remove("river")
+    index.remove("river")  # removing a group that is not indexed is ignored
+    assert not index.restricted_group_ids
+    assert shared_coords not in index.group_ids
+    assert set(index.group_ids) == set(green_group.possible_extensions)
+
+def test_session_group_extensions_index():
+    session = Session()
+    session.load_from_csv("./tests/data/group_river_ponds_train_station.csv", simulate_tile_placement=False)
+
+    def assert_index():
+        expected = GroupExtensionsIndex()
+        for group in session.groups.values():
+            expected.update(group)
+
+        def as_sets(index):
+            return {coords: set(group_ids) for coords, group_ids in index.items()}
+        assert as_sets(session.group_extensions_index.group_ids) == as_sets(expected.group_ids)
+        assert as_sets(session.group_extensions_index.restricted_group_ids) == \
+            as_sets(expected.restricted_group_ids)
+        assert session.group_extensions_index.extensions.keys() == session.groups.keys()
+
+    assert_index()
+    assert session.group_extensions_index.restricted_group_ids
+
+    num_tiles = len(session.played_tiles)
+    for _ in range(num_tiles - 1):
+        session.undo_last_tile()
+        assert_index()
+    for _ in range(num_tiles - 1):
+        session.redo_last_tile()
+        assert_index()
+
+    session.reset()
+    assert not session.group_extensions_index.group_ids
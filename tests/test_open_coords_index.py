@@ -0,0 +1,87 @@
+from src.open_coords_index import OpenCoordsIndex
+from src.session import Session
+from src.side_type import SideType
+from src.tile import Tile
+
+def test_update_remove():
+    index = OpenCoordsIndex()
+    green_pattern = [SideType.GREEN] + [SideType.UNKNOWN] * 5
+    river_pattern = [SideType.RIVER] + [SideType.UNKNOWN] * 5
+
+    index.update((0,0), green_pattern)
+    index.update((0,4), green_pattern)
+    index.update((3,2), river_pattern)
+    assert index.patterns[(0,0)] == tuple(green_pattern)
+    assert index.buckets == {tuple(green_pattern): {(0,0): None, (0,4): None},
+                             tuple(river_pattern): {(3,2): None}}
+
+    # moves the coordinates to the bucket of the new pattern
+    index.update((0,0), river_pattern)
+    index.update((0,0), river_pattern)
+    assert index.buckets == {tuple(green_pattern): {(0,4): None},
+                             tuple(river_pattern): {(3,2): None, (0,0): None}}
+
+    index.remove((0,4))
+    index.remove((0,4))  # removing coordinates that are not indexed is ignored
+    assert tuple(green_pattern) not in index.buckets
+    assert (0,4) not in index.patterns
+
+def test_get_placement():
+    unknown = (SideType.UNKNOWN,) * 6
+    green = (SideType.GREEN,) * 6
+    assert OpenCoordsIndex.get_placement(green, unknown) == Tile.Placement.PERFECT
+    assert OpenCoordsIndex.get_placement(green, green) == Tile.Placement.PERFECTLY_CLOSED
+    assert OpenCoordsIndex.get_placement(green, (SideType.WOODS,) + unknown[1:]) == \
+        Tile.Placement.IMPERFECT
+    assert OpenCoordsIndex.get_placement(green, (SideType.RIVER,) + unknown[1:]) == \
+        Tile.Placement.NOT_POSSIBLE
+    assert OpenCoordsIndex.get_placement((SideType.TRAIN,) + green[1:], (SideType.TRAIN,) + unknown[1:]) == \
+        Tile.Placement.PERFECT
+
+def test_find_placements():
+    index = OpenCoordsIndex()
+    index.update((0,0), [SideType.RIVER] + [SideType.UNKNOWN] * 5)
+    index.update((0,4), [SideType.UNKNOWN] * 6)
+    index.update((3,2), [SideType.UNKNOWN, SideType.UNKNOWN, SideType.UNKNOWN, SideType.RIVER, SideType.UNKNOWN, SideType.UNKNOWN])
+
+    river_tile = (SideType.RIVER, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN)
+    rotated_river_tile = river_tile[3:] + river_tile[:3]
+    assert sorted(index.find_placements([river_tile, rotated_river_tile])) == [
+        ((0,0), 0, Tile.Placement.PERFECT),
+        ((0,4), 0, Tile.Placement.PERFECT),
+        ((0,4), 1, Tile.Placement.PERFECT),
+        ((3,2), 1, Tile.Placement.PERFECT),
+    ]
+    # the river sides prune all open coordinates with a known river side
+    assert index.find_placements([(SideType.GREEN,) * 6]) == [((0,4), 0, Tile.Placement.PERFECT)]
+
+def test_session_open_coords_index():
+    session = Session()
+    session.load_from_csv("./tests/data/group_ponds_river_merge.csv", simulate_tile_placement=False)
+
+    def assert_index():
+        assert session.open_coords_index.patterns == \
+            {coords: tuple(session._get_open_coords_side_types(coords))
+             for coords in session.open_coords}
+
+    assert_index()
+    candidates = session.compute_candidate_tiles("RRGGGG", SideType.RIVER)
+    assert candidates
+    for candidate in candidates:
+        assert candidate.get_placement() != Tile.Placement.NOT_POSSIBLE
+        # only candidates that continue the river can be placed
+        assert all(session.open_coords_index.patterns[candidate.coordinates][i] in
+                   [SideType.RIVER, SideType.PONDS, SideType.STATION, SideType.UNKNOWN]
+                   for i in range(6) if candidate.get_side_type_seq()[i] == "R")
+
+    session.place_candidate(candidates[0])
+    assert_index()
+    # placement apart from the open coordinates
+    session.place_candidate(session.prepare_candidate("GGGGGG", SideType.GREEN, (60, 60)))
+    assert_index()
+    session.undo_last_tile()
+    session.undo_last_tile()
+    assert_index()
+
+    session.reset()
+    assert session.open_coords_index.patterns == {(0,0): (SideType.UNKNOWN,) * 6}
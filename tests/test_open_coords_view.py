@@ -0,0 +1,25 @@
+from src.open_coords_view import OpenCoordsView
+
+def test_view():
+    base = {(0,0): 0, (0,4): 1, (3,2): 2}
+    view = OpenCoordsView(base, {(0,0), (9,9)}, {(0,8): None, (0,4): None})
+
+    # hidden coordinates that are not part of the base and added coordinates
+    # that are already part of the base are ignored
+    assert list(view) == [(0,4), (3,2), (0,8)]
+    assert len(view) == 3
+    assert view == {(0,4): 1, (3,2): 2, (0,8): None}
+    assert (0,0) not in view
+    assert (0,8) in view
+    assert view[(3,2)] == 2
+    assert view.get((0,0)) is None
+    assert view.get((1,1), 5) == 5
+
+    narrowed_view = view.without([(0,8), (3,2)])
+    assert narrowed_view == {(0,4): 1}
+    assert narrowed_view.base is base
+    # the original view is not affected
+    assert len(view) == 3
+
+    assert OpenCoordsView({}) == {}
+    assert OpenCoordsView(base) == base
@@ -0,0 +1,126 @@
+import json
+import os
+
+from src.profiler import Profiler, PROFILER, profiled
+from src.session import Session
+
+def test_disabled_profiler():
+    profiler = Profiler()
+    assert profiler.stage("stage") is profiler.stage("other stage")
+    with profiler.stage("stage"):
+        pass
+    profiler.record("counter", 1)
+    with profiler.trace("trace"):
+        pass
+
+    results = profiler.get_results()
+    assert results["name"] is None
+    assert len(results["stages"]) == 0
+    assert len(results["counters"]) == 0
+
+def test_stages_and_counters():
+    profiler = Profiler(enabled=True)
+    for _ in range(3):
+        with profiler.stage("stage"):
+            pass
+    profiler.record("counter", 1)
+    profiler.record("counter", 2)
+
+    results = profiler.get_results()
+    assert results["stages"]["stage"]["calls"] == 3
+    assert results["stages"]["stage"]["total_ms"] >= 0
+    assert results["counters"] == {"counter": 2}
+
+    profiler.reset()
+    assert len(profiler.get_results()["stages"]) == 0
+
+def test_trace(capsys):
+    profiler = Profiler(enabled=True)
+    with profiler.stage("stale stage"):
+        pass
+
+    with profiler.trace("trace"):
+        with profiler.trace("nested trace"):
+            profiler.record("counter", 5)
+
+    results = profiler.get_results()
+    assert results["name"] == "trace"
+    assert results["total_ms"] > 0
+    assert "stale stage" not in results["stages"]
+    assert results["stages"]["nested trace"]["calls"] == 1
+    assert results["counters"] == {"counter": 5}
+
+    summary = profiler.get_summary()
+    assert summary.startswith("PROFILE trace: ")
+    assert "counter=5" in summary
+    assert "nested trace" in summary
+    assert len(profiler.get_summary(separator="\n").splitlines()) == 3
+    assert capsys.readouterr().out == summary + "\n"
+
+def test_trace_files(tmp_path):
+    profiler = Profiler(enabled=True, trace_directory=str(tmp_path / "traces"))
+    for _ in range(2):
+        with profiler.trace("trace"):
+            with profiler.stage("stage"):
+                pass
+
+    for num_trace in [1, 2]:
+        base_path = tmp_path / "traces" / f"trace_{num_trace:04d}"
+        assert os.path.isfile(f"{base_path}.prof")
+        with open(f"{base_path}.json", encoding="utf-8") as file:
+            results = json.load(file)
+        assert results["name"] == "trace"
+        assert results["stages"]["stage"]["calls"] == 1
+
+def test_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv(Profiler.ENV_ENABLE, raising=False)
+    monkeypatch.delenv(Profiler.ENV_TRACE_DIRECTORY, raising=False)
+    assert not Profiler.from_environment().enabled
+
+    monkeypatch.setenv(Profiler.ENV_ENABLE, "0")
+    assert not Profiler.from_environment().enabled
+
+    monkeypatch.setenv(Profiler.ENV_ENABLE, "1")
+    profiler = Profiler.from_environment()
+    assert profiler.enabled
+    assert profiler.trace_directory is None
+
+    monkeypatch.delenv(Profiler.ENV_ENABLE)
+    monkeypatch.setenv(Profiler.ENV_TRACE_DIRECTORY, str(tmp_path))
+    profiler = Profiler.from_environment()
+    assert profiler.enabled
+    assert profiler.trace_directory == str(tmp_path)
+
+def test_profiled_session():
+    @profiled
+    def function(value):
+        return value * 2
+
+    enabled = PROFILER.enabled
+    try:
+        PROFILER.enabled = False
+        PROFILER.reset()
+        assert function(2) == 4
+        assert len(PROFILER.get_results()["stages"]) == 0
+
+        PROFILER.enabled = True
+        assert function(3) == 6
+        assert PROFILER.get_results()["stages"][function.__qualname__]["calls"] == 1
+
+        session = Session()
+        session.start()
+        with PROFILER.trace("compute_candidates"):
+            candidates = session.compute_candidate_tiles("GGGGGG", "G")
+            session.compute_tile_ratings(candidates)
+
+        results = PROFILER.get_results()
+        assert results["counters"]["candidates"] == len(candidates)
+        assert results["counters"]["open_coords"] == len(session.open_coords)
+        assert "Session.compute_candidate_tiles" in results["stages"]
+        assert "TileEvaluation._compute" in results["stages"]
+
+        session.place_candidate(candidates[0])
+        assert "Session._update_groups" in PROFILER.get_results()["stages"]
+    finally:
+        PROFILER.enabled = enabled
+        PROFILER.reset()
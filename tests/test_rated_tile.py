@@ -23,3 +23,24 @@ def test_rated_tile_eq():
                TileEvaluation.RatedTile(tile_evaluation.rating_details[i])
         assert TileEvaluation.RatedTile(tile_evaluation.rating_details[i]) != "str"
         assert TileEvaluation.RatedTile(tile_evaluation.rating_details[i]) != SideType.CROPS
+
+def test_rated_tiles_max_count():
+    session = Session()
+    session.load_from_csv("./tests/data/perspective_group_extensions.csv", simulate_tile_placement=False)
+
+    candidate_tiles = session.compute_candidate_tiles(
+        [SideType.PONDS, SideType.PONDS, SideType.CROPS, SideType.TRAIN, SideType.PONDS, SideType.PONDS],
+        SideType.PONDS)
+
+    tile_evaluation = TileEvaluationFactory.create(candidate_tiles, session)
+    assert tile_evaluation.features.shape == (len(tile_evaluation.rating_details),
+                                              len(TileEvaluation.Feature))
+    assert tile_evaluation.ratings.shape == (len(tile_evaluation.rating_details),
+                                             len(TileEvaluation.Rating))
+
+    rated_tiles = tile_evaluation.get_rated_tiles()
+    assert len(rated_tiles) == len(tile_evaluation.rating_details)
+    assert [rt.rating for rt in rated_tiles] == sorted(tile_evaluation.total_ratings, reverse=True)
+
+    best_rated_tiles = tile_evaluation.get_rated_tiles(max_count=3)
+    assert best_rated_tiles == rated_tiles[:3]
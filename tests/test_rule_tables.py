@@ -0,0 +1,42 @@
+from src.constants import Constants
+from src.rule_tables import RuleCompiler, RuleTables
+from src.side import Side
+from src.side_type import SideType
+from src.tile_evaluation import TileEvaluation
+
+def test_relation_tables():
+    for side_type in SideType:
+        for other in SideType:
+            assert RuleTables.COMPATIBLE_GROUP_TYPES[side_type][other] == \
+                (side_type in Constants.COMPATIBLE_GROUP_TYPES and
+                 other in Constants.COMPATIBLE_GROUP_TYPES[side_type])
+            assert RuleTables.PERFECT_MATCH_TABLE[side_type][other] == \
+                (other in Constants.PERFECT_MATCH_DICT.get(side_type, []))
+            # masks of the types for which the side type is listed
+            assert bool(RuleTables.PERFECT_MATCH_MASKS[other] & (1 << side_type)) == \
+                RuleTables.PERFECT_MATCH_TABLE[side_type][other]
+            assert TileEvaluation.compute_side_placement_match(side_type, other) == \
+                RuleCompiler.match_side_types(side_type, other)
+
+    assert TileEvaluation.compute_side_placement_match(SideType.RIVER, SideType.GREEN) == \
+        Side.Placement.NOT_POSSIBLE
+    assert RuleTables.RESTRICTED_TYPES_MASK == (1 << SideType.RIVER) | (1 << SideType.TRAIN)
+    assert RuleCompiler.get_mask([]) == 0
+    # the rule dicts of the tile evaluation are the compiled ones
+    assert TileEvaluation.PERFECT_MATCH_DICT is Constants.PERFECT_MATCH_DICT
+    assert TileEvaluation.RESTRICTED_DICT is Constants.RESTRICTED_DICT
+
+def test_score_table():
+    score_list = [
+        (1, {SideType.STATION: [SideType.RIVER], SideType.GREEN: [SideType.GREEN]}),
+        (0.5, {SideType.STATION: [SideType.RIVER, SideType.PONDS]}),
+    ]
+    table = RuleCompiler.compile_score_table(score_list)
+
+    # the first score applies, in both directions
+    assert table[SideType.STATION][SideType.RIVER] == 1
+    assert table[SideType.RIVER][SideType.STATION] == 1
+    assert table[SideType.PONDS][SideType.STATION] == 0.5
+    assert table[SideType.GREEN][SideType.GREEN] == 1
+    assert table[SideType.GREEN][SideType.STATION] == 0
+    assert table[SideType.UNKNOWN][SideType.UNKNOWN] == 0
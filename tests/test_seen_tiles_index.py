@@ -0,0 +1,168 @@
+from src.seen_tiles_index import SeenTilesIndex
+from src.tile import Tile
+from src.side_type import SideType
+from src.tile_subsection import TileSubsection
+
+def get_side_types(tile):
+    return [tile.get_side(s).type for s in TileSubsection.get_side_values()]
+
+def test_index_eq():
+    index1 = SeenTilesIndex()
+    index2 = SeenTilesIndex()
+    assert index1 == index2
+
+    # different type
+    assert index1 != SideType.GREEN
+    assert index1 != "some string"
+
+    tile0 = Tile([SideType.GREEN], SideType.GREEN, (0,0))
+    tile1 = Tile([SideType.GREEN], SideType.GREEN, (0,0))
+    tile2 = Tile([SideType.GREEN], SideType.GREEN, (0,4))
+    tile3 = Tile([SideType.GREEN, SideType.WOODS, SideType.CROPS, SideType.HOUSE, SideType.WOODS, SideType.HOUSE], SideType.HOUSE, (0,0))
+
+    index1.add_tile(tile0)
+    index2.add_tile(tile1)
+    assert index1 == index2
+
+    index1.remove_tile(tile0)
+    index2.remove_tile(tile1)
+    assert index1 == index2
+
+    index1.add_tile(tile1)
+    index2.add_tile(tile2)
+    assert index1 != index2
+
+    index1.remove_tile(tile1)
+    index2.remove_tile(tile2)
+    assert index1 == index2
+
+    index1.add_tile(tile1)
+    index2.add_tile(tile3)
+    assert index1 != index2
+
+def test_add_remove_tile():
+    index = SeenTilesIndex()
+
+    types = [
+        SideType.GREEN,
+        SideType.WOODS,
+        SideType.CROPS,
+        SideType.HOUSE
+    ]
+
+    tile = Tile([types[0], types[1], types[2], types[3], types[0], types[1]], types[2], (0,0))
+    index.add_tile(tile)
+
+    # matches in all orientations, but is only counted once
+    for orientation in tile.create_all_orientations():
+        assert index.find_matching_tiles(get_side_types(orientation)) == [(0,0)]
+        assert index.count_matching_tiles(get_side_types(orientation)) == 1
+
+    # adding the tile again does not duplicate it
+    index.add_tile(tile)
+    assert index.count_matching_tiles(get_side_types(tile)) == 1
+
+    index.remove_tile(tile)
+    assert index.count_matching_tiles(get_side_types(tile)) == 0
+    assert index == SeenTilesIndex()
+
+    # removing a tile that is not indexed is ignored
+    index.remove_tile(tile)
+
+def test_matching_tiles():
+    index = SeenTilesIndex()
+    tiles = [
+        Tile([SideType.GREEN], SideType.GREEN, (0,0)),
+        Tile([SideType.WOODS, SideType.WOODS, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN], SideType.WOODS, (0,4)),
+        Tile([SideType.RIVER, SideType.GREEN, SideType.GREEN, SideType.RIVER, SideType.GREEN, SideType.GREEN], SideType.RIVER, (3,2)),
+        Tile([SideType.PONDS], SideType.PONDS, (3,-2)),
+    ]
+    for tile in tiles:
+        index.add_tile(tile)
+
+    unknown = [SideType.UNKNOWN] * 6
+    assert index.count_matching_tiles(unknown) == 4
+    assert sorted(index.find_matching_tiles(unknown)) == sorted(t.coordinates for t in tiles)
+
+    # green matches green, ponds and station sides
+    assert sorted(index.find_matching_tiles([SideType.GREEN] + [SideType.UNKNOWN] * 5)) == \
+        [(0,0), (0,4), (3,-2), (3,2)]
+    assert sorted(index.find_matching_tiles([SideType.GREEN] * 6)) == [(0,0), (3,-2)]
+    # ponds sides match river, therefore the river tile as well as the ponds tile
+    assert sorted(index.find_matching_tiles(
+        [SideType.RIVER, SideType.UNKNOWN, SideType.UNKNOWN, SideType.RIVER, SideType.UNKNOWN, SideType.UNKNOWN])) == \
+        [(3,-2), (3,2)]
+    # adjacent woods sides only match the woods tile, in any orientation
+    assert index.find_matching_tiles(
+        [SideType.UNKNOWN, SideType.UNKNOWN, SideType.UNKNOWN, SideType.UNKNOWN, SideType.WOODS, SideType.WOODS]) == [(0,4)]
+    assert index.count_matching_tiles([SideType.TRAIN] + [SideType.UNKNOWN] * 5) == 0
+
+    # slots of removed tiles are reused
+    index.remove_tile(tiles[0])
+    assert index.count_matching_tiles(unknown) == 3
+    index.add_tile(Tile([SideType.CROPS], SideType.CROPS, (0,-4)))
+    assert len(index.slot_coordinates) == 4
+    assert sorted(index.find_matching_tiles(unknown)) == [(0,-4), (0,4), (3,-2), (3,2)]
+    assert index.find_matching_tiles([SideType.CROPS] * 6) == [(0,-4)]
+
+def test_error_cases():
+    index = SeenTilesIndex()
+
+    assert not index.find_matching_tiles("some gargabe")
+    for i in range(6+1):
+        # invalid input or valid input but empty index
+        assert not index.find_matching_tiles([SideType.CROPS]*i)
+        assert index.count_matching_tiles([SideType.CROPS]*i) == 0
+
+    index.add_tile(Tile([SideType.CROPS], SideType.CROPS, (0,0)))
+    assert index.count_matching_tiles([SideType.CROPS]*5) == 0
+    assert index.count_matching_tiles([SideType.CROPS]*6) == 1
+
+def test_tile_catalog():
+    index = SeenTilesIndex()
+    woods_green = [SideType.WOODS, SideType.WOODS, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN]
+    tiles = [
+        Tile(woods_green, SideType.WOODS, (0,0)),
+        Tile(woods_green[3:] + woods_green[:3], SideType.GREEN, (0,4)),  # rotated
+        Tile([SideType.GREEN], SideType.GREEN, (0,8)),
+    ]
+    for tile in tiles:
+        index.add_tile(tile)
+
+    canonical_woods_green = tuple(woods_green)
+    for orientation in tiles[1].create_all_orientations():
+        assert SeenTilesIndex.get_canonical_side_types(tuple(get_side_types(orientation))) == \
+            canonical_woods_green
+
+    assert index.catalog == {canonical_woods_green: {(0,0): None, (0,4): None},
+                             (SideType.GREEN,) * 6: {(0,8): None}}
+    assert index.get_tile_histogram() == {canonical_woods_green: 2, (SideType.GREEN,) * 6: 1}
+
+    index.remove_tile(tiles[0])
+    assert index.get_tile_histogram() == {canonical_woods_green: 1, (SideType.GREEN,) * 6: 1}
+    index.remove_tile(tiles[1])
+    assert index.get_tile_histogram() == {(SideType.GREEN,) * 6: 1}
+
+def test_tile_matches():
+    index = SeenTilesIndex()
+    tiles = [
+        Tile([SideType.GREEN], SideType.GREEN, (0,0)),
+        Tile([SideType.WOODS, SideType.WOODS, SideType.GREEN, SideType.GREEN, SideType.GREEN, SideType.GREEN], SideType.WOODS, (0,4)),
+        Tile([SideType.RIVER, SideType.GREEN, SideType.GREEN, SideType.RIVER, SideType.GREEN, SideType.GREEN], SideType.RIVER, (3,2)),
+    ]
+    for tile in tiles:
+        index.add_tile(tile)
+
+    # a single tile matches exactly if it is found by the index
+    patterns = [
+        [SideType.UNKNOWN] * 6,
+        [SideType.GREEN] * 6,
+        [SideType.WOODS] + [SideType.UNKNOWN] * 5,
+        [SideType.UNKNOWN, SideType.WOODS, SideType.UNKNOWN, SideType.UNKNOWN, SideType.UNKNOWN, SideType.WOODS],
+        [SideType.PONDS, SideType.UNKNOWN, SideType.UNKNOWN, SideType.RIVER, SideType.UNKNOWN, SideType.UNKNOWN],
+    ]
+    for pattern in patterns:
+        matching_coordinates = index.find_matching_tiles(pattern)
+        for tile in tiles:
+            assert SeenTilesIndex.matches(get_side_types(tile), pattern) == \
+                (tile.coordinates in matching_coordinates)
@@ -1,9 +1,10 @@
+import copy
 import filecmp
 import os
+import subprocess
+import sys
 import pytest
 
-import pandas as pd
-
 from src.side import Side
 from src.side_type import SideType
 from src.session import Session
@@ -106,6 +107,57 @@ def test_quest_tile_place_undo():
     session.undo_last_tile()
     assert len(session.groups) == 0
 
+def test_multi_level_undo_redo():
+    session = Session()
+    session.load_from_csv("./tests/data/group_isolated_side.csv", simulate_tile_placement=False)
+    session.watch_coordinates(list(session.open_coords)[0])
+
+    def state():
+        return copy.deepcopy((
+            session.get_tile_records(),
+            [(g.size, g.tile_coordinates, g.possible_extensions) for g in session.groups.values()],
+            list(session.open_coords.items()), session.score, session.watched_open_coords,
+            session.seen_tiles_index
+        ))
+
+    states = [state()]
+    for side_type_seq, coordinates in [("WWHHGG", (0, -8)), ("GGGRRG", (-3, -10)),
+                                       ("WWWWWW", (3, -6))]:
+        session.place_candidate(
+            session.prepare_candidate(side_type_seq, SideType.GREEN, coordinates))
+        states.append(state())
+
+    # undo several placements
+    for expected_state in reversed(states[:-1]):
+        session.undo_last_tile()
+        assert state() == expected_state
+    assert len(session.redo_tiles) == 3
+
+    # redo restores the same state
+    for expected_state in states[1:]:
+        assert session.redo_last_tile() is not None
+        assert state() == expected_state
+    assert session.redo_last_tile() is None
+
+    # placement apart from the open coordinates
+    session.place_candidate(session.prepare_candidate("GGGGGG", SideType.GREEN, (30, 30)))
+    assert list(session.open_coords.items()) == states[-1][2]
+    session.undo_last_tile()
+    assert state() == states[-1]
+
+    # a new placement discards the undone tiles
+    undone_tile = session.undo_last_tile()
+    session.place_candidate(session.prepare_candidate(
+        undone_tile.get_side_type_seq(), undone_tile.get_center().type.to_character(),
+        undone_tile.coordinates))
+    assert state() == states[-1]
+    assert not session.redo_tiles
+
+    while session.played_tiles:
+        session.undo_last_tile()
+    with pytest.raises(ValueError):
+        session.undo_last_tile()
+
 def test_no_database():
     session = Session(database_name=None)
     session.start()
@@ -137,6 +189,42 @@ def test_load_from_empty_database():
 
     os.remove(database)
 
+def test_deferred_database_setup():
+    database = "./tests/data/__test_deferred_database__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    with Session(database, defer_database_setup=True) as session:
+        assert not os.path.exists(database)
+
+        session.database.create_tables_in_background()
+        session.start()
+        session.save_to_database("some name")
+        assert len(session.get_all_sessions_from_database()) == 1
+
+    os.remove(database)
+
+def test_no_pandas_import():
+    # pandas is only required for the optional DataFrame export
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import os, sys; from src.session import Session; session = Session(); "
+         "session.load_from_csv('./tests/data/group.csv', simulate_tile_placement=False); "
+         "session.save_to_csv('./tests/data/__test_no_pandas__.csv'); "
+         "os.remove('./tests/data/__test_no_pandas__.csv'); "
+         "print('pandas' in sys.modules)"],
+        capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+def test_to_dataframe():
+    session = Session()
+    session.load_from_csv("./tests/data/group.csv", simulate_tile_placement=False)
+
+    dataframe = session.to_dataframe()
+    assert dataframe.shape == (len(session.played_tiles), 4)
+    assert list(dataframe["coordinates"]) == [str(c) for c in session.played_tiles]
+
 def test_load_from_empty_csv():
     session = Session()
     with pytest.raises(ValueError):
@@ -195,10 +283,10 @@ def test_save_load_delete():
         session_name = "test_session"
         session.save_to_database(session_name)
 
-        sessions_df = session.get_all_sessions_from_database()
-        assert sessions_df.shape[0] == 1  # expecting 1 row
-        session_id = sessions_df.iloc[0]["id"]
-        assert not pd.isna(session_id) and session_id
+        sessions = session.get_all_sessions_from_database()
+        assert len(sessions) == 1  # expecting 1 row
+        session_id = sessions[0].id
+        assert session_id is not None and session_id
 
         loaded_database_session = Session(database)
         assert len(loaded_database_session.played_tiles) == 0  # assert session is empty before load
@@ -208,8 +296,8 @@ def test_save_load_delete():
         assert_watched_coords_equal(session, loaded_database_session)
 
         session.delete_from_database(session_id)
-        sessions_df = session.get_all_sessions_from_database()
-        assert sessions_df.shape[0] == 0
+        sessions = session.get_all_sessions_from_database()
+        assert len(sessions) == 0
 
     os.remove(database)
 
@@ -226,10 +314,10 @@ def test_load_no_watch():
         session_name = "session_without_watch"
         session.save_to_database(session_name)
 
-        sessions_df = session.get_all_sessions_from_database()
-        assert sessions_df.shape[0] == 1  # expecting 1 row
-        session_id = sessions_df.iloc[0]["id"]
-        assert not pd.isna(session_id) and session_id
+        sessions = session.get_all_sessions_from_database()
+        assert len(sessions) == 1  # expecting 1 row
+        session_id = sessions[0].id
+        assert session_id is not None and session_id
 
         loaded_database_session = Session(database)
         loaded_database_session.load_from_database(session_id, simulate_tile_placement=False)
@@ -239,6 +327,79 @@ def test_load_no_watch():
 
     os.remove(database)
 
+def test_chunked_import(monkeypatch):
+    monkeypatch.setattr(Session, "IMPORT_CHUNK_SIZE", 2)
+    file = "./tests/data/group.csv"
+    expected_session = Session()
+    expected_session.load_from_csv(file, simulate_tile_placement=False)
+    num_tiles = len(expected_session.played_tiles)
+
+    session = Session()
+    progress = list(session.iterate_load_from_csv(file, simulate_tile_placement=False))
+    assert progress == [(min(i, num_tiles), num_tiles) for i in range(2, num_tiles + 2, 2)]
+    assert_session_equal(expected_session, session)
+
+    database = "./tests/data/__test_chunked_import__.db"
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    with Session(database) as session:
+        session.load_from_csv(file, simulate_tile_placement=False)
+        session.watch_coordinates(list(session.open_coords)[0])
+        session.save_to_database("test_session")
+        session_id = session.get_all_sessions_from_database()[0].id
+        assert session.database.count_session_tiles(session_id) == num_tiles
+        tile_records, watched_coords = session.database.load_session(session_id)
+        assert tile_records == session.get_tile_records()
+        assert watched_coords == list(session.watched_open_coords)
+        assert [len(chunk) for chunk in session.database.iterate_session_tiles(session_id, 3)] \
+            == [3] * (num_tiles // 3) + ([num_tiles % 3] if num_tiles % 3 else [])
+
+        loaded_session = Session(database)
+        progress = list(loaded_session.iterate_load_from_database(session_id, False))
+        assert progress[-1] == (num_tiles, num_tiles)
+        assert_session_equal(session, loaded_session)
+        assert_watched_coords_equal(session, loaded_session)
+
+    os.remove(database)
+
+def test_import_progress(monkeypatch):
+    monkeypatch.setattr(Session, "IMPORT_CHUNK_SIZE", 2)
+    file = "./tests/data/group.csv"
+
+    session = Session()
+    progress = []
+    finished = []
+    messages = []
+    session.import_progress.connect(progress.append)
+    session.import_finished.connect(finished.append)
+    session.trigger_message_display.connect(messages.append)
+
+    # complete import
+    assert not session.import_next_chunk()  # no running import
+    session.start_import(session.iterate_load_from_csv(file, False), "Error: ")
+    while session.import_next_chunk():
+        pass
+    assert finished == [True]
+    assert progress[-1][0] == progress[-1][1] == len(session.played_tiles)
+    assert session.running_import is None
+
+    # cancelled import keeps the tiles placed so far
+    session.start_import(session.iterate_load_from_csv(file, False), "Error: ")
+    assert session.import_next_chunk()
+    session.cancel_import()
+    assert finished == [True, False]
+    assert len(session.played_tiles) == 2
+    assert not session.import_next_chunk()
+
+    # failing import
+    session.start_import(session.iterate_load_from_csv("non existing file path", False),
+                         "Error: ")
+    assert not session.import_next_chunk()
+    assert finished == [True, False, False]
+    assert messages[0][1].startswith("Error: ")
+    assert not messages[1:]
+
 def test_load_save_csv():
     session = Session()
     input_file = "./tests/data/group.csv"
@@ -271,12 +432,12 @@ def test_save_same_name():
         # save again with same name
         session.save_to_database(session_name)
 
-        sessions_df = session.get_all_sessions_from_database()
-        assert sessions_df.shape[0] == 2  # expecting 2 rows
-        session_id_0 = sessions_df.iloc[0]["id"]
-        session_id_1 = sessions_df.iloc[1]["id"]
-        assert not pd.isna(session_id_0) and session_id_0
-        assert not pd.isna(session_id_1) and session_id_1
+        sessions = session.get_all_sessions_from_database()
+        assert len(sessions) == 2  # expecting 2 rows
+        session_id_0 = sessions[0].id
+        session_id_1 = sessions[1].id
+        assert session_id_0 is not None and session_id_0
+        assert session_id_1 is not None and session_id_1
         assert session_id_0 != session_id_1
 
     os.remove(database)
@@ -727,7 +888,7 @@ def test_watch_unwatch_coordinates_tiles_seen():
     assert placement_coordinates in session.watched_open_coords
 
     assert_num_seen(initial_expectation)
-    assert session.seen_tile_sides_tree == session_unmodified.seen_tile_sides_tree
+    assert session.seen_tiles_index == session_unmodified.seen_tiles_index
 
     session.place_candidate(prepare_candidate())
     assert_num_seen(after_place_expectation)
@@ -737,7 +898,7 @@ def test_watch_unwatch_coordinates_tiles_seen():
 
     session.undo_last_tile()
     assert_num_seen(initial_expectation)
-    assert session.seen_tile_sides_tree == session_unmodified.seen_tile_sides_tree
+    assert session.seen_tiles_index == session_unmodified.seen_tiles_index
 
     assert placement_coordinates in session.watched_open_coords
 
@@ -749,4 +910,84 @@ def test_watch_unwatch_coordinates_tiles_seen():
     for coords in after_place_expectation.keys():
         session.unwatch_coordinates(coords)
 
-    assert len(session.watched_open_coords) == 0
\ No newline at end of file
+    assert len(session.watched_open_coords) == 0
+    assert len(session.watched_coords_side_types) == 0
+
+def test_watched_coordinates_incremental_seen():
+    session = Session()
+    session.load_from_csv("./tests/data/perspective_group_extensions_self.csv", simulate_tile_placement=False)
+    for coords in session.open_coords:
+        session.watch_coordinates(coords)
+    assert len(session.watched_open_coords) > 30
+
+    def assert_num_seen():
+        assert session.watched_open_coords == \
+            {coords: session.get_num_played_tiles_matching_perfectly(coords)
+             for coords in session.watched_open_coords}
+
+    assert_num_seen()
+    for side_type_seq in ["GGGGGG", "WWGGHH", "CCCCCC", "GGWWWW", "HHHHHH"]:
+        candidates = session.compute_candidate_tiles(side_type_seq, SideType.GREEN)
+        session.place_candidate(session.compute_tile_ratings(candidates)[0].tile)
+        assert_num_seen()
+
+    for _ in range(5):
+        session.undo_last_tile()
+        assert_num_seen()
+    for _ in range(5):
+        session.redo_last_tile()
+        assert_num_seen()
+
+def test_candidate_evaluation_side_effect_free():
+    session = Session()
+    session.load_from_csv("./tests/data/group_river_ponds_train_station.csv", simulate_tile_placement=False)
+
+    def board_state():
+        return (
+            {coords: {group_id: (id(gp.group), list(gp.subsections))
+                      for group_id, gp in tile.group_participation.items()}
+             for coords, tile in session.played_tiles.items()},
+            {group_id: (group.size, set(group.tile_coordinates), dict(group.possible_extensions))
+             for group_id, group in session.groups.items()}
+        )
+
+    state_before = board_state()
+    for side_type_seq in ["RRGGGG", "GGGGGG", "TTWWRR", "PPPPPP"]:
+        candidates = session.compute_candidate_tiles(side_type_seq, SideType.GREEN)
+        assert candidates
+        session.compute_tile_ratings(candidates)
+    assert board_state() == state_before
+
+    # groups that are not reached by a placed tile are not recomputed
+    candidate = session.prepare_candidate("GGGGGG", SideType.GREEN, (60, 60))
+    groups = {group_id: copy.copy(group) for group_id, group in session.groups.items()}
+    session.place_candidate(candidate)
+    for group_id, group in groups.items():
+        assert session.groups[group_id].tile_subsections is group.tile_subsections
+
+def test_candidates_keep_orientation_groups():
+    session = Session()
+    session.load_from_csv("./tests/data/group_ponds_river_merge.csv", simulate_tile_placement=False)
+
+    # the ponds sides join the river group of the original tile in all orientations,
+    # while the side type sequence of some orientations would start a ponds group
+    side_type_seq = "RRPPGG"
+    candidates = session.compute_candidate_tiles(side_type_seq, SideType.GREEN)
+    assert candidates
+
+    orientation_candidates = []
+    for candidate in candidates:
+        orientation = next(
+            o for o in Tile(side_type_seq, SideType.GREEN, candidate.coordinates).create_all_orientations()
+            if o.get_side_type_seq() == candidate.get_side_type_seq())
+        session._update_tile_side_placements(orientation)
+        session._update_group_participation(orientation)
+        orientation_candidates.append(orientation)
+
+        assert candidate.get_connected_subsection_groups() == orientation.get_connected_subsection_groups()
+        assert [group_type for group_type, _ in candidate.get_connected_subsection_groups()] == [SideType.RIVER]
+
+    assert any(Tile(c.get_side_type_seq(), SideType.GREEN, c.coordinates).get_connected_subsection_groups()[0][0]
+               == SideType.PONDS for c in candidates)
+    assert [r.rating for r in session.compute_tile_ratings(candidates)] == \
+        [r.rating for r in session.compute_tile_ratings(orientation_candidates)]
@@ -0,0 +1,121 @@
+import os
+import pytest
+
+from src.session import Session
+from src.session_snapshot import SessionSnapshot
+from src.side_type import SideType
+from src.tile_subsection import TileSubsection
+
+def assert_derived_state_equal(left, right):
+    assert left.get_tile_records() == right.get_tile_records()
+
+    def placements(session):
+        return [[t.get_side(s).placement for s in TileSubsection.get_side_values()]
+                for t in session.played_tiles.values()]
+
+    assert placements(left) == placements(right)
+
+    def group_state(group):
+        return (group.id, group.type, group.start_tile.coordinates, group.start_tile_subsections,
+                group.tile_coordinates, group.size, group.possible_extensions,
+                group.consumed_groups)
+
+    assert [group_state(g) for g in left.groups.values()] == \
+        [group_state(g) for g in right.groups.values()]
+    assert {c: [group_state(g) for g in groups]
+            for c, groups in left.groups_marked_for_deletion_at_coords.items()} == \
+        {c: [group_state(g) for g in groups]
+         for c, groups in right.groups_marked_for_deletion_at_coords.items()}
+    assert left.marked_group_ids == right.marked_group_ids
+    assert list(left.open_coords.items()) == list(right.open_coords.items())
+    assert left.num_added_open_coords == right.num_added_open_coords
+    assert left.open_coords_index.patterns == right.open_coords_index.patterns
+    assert {g: set(c) for g, c in left.group_extensions_index.extensions.items()} == \
+        {g: set(c) for g, c in right.group_extensions_index.extensions.items()}
+
+    def delta_state(delta):
+        return (delta.tile.coordinates, delta.neighbor_placements, delta.removed_open_coords_order,
+                delta.added_open_coords, delta.added_group_ids,
+                [group_state(g) for g in delta.removed_groups], delta.score,
+                delta.unwatched_coords)
+
+    assert [delta_state(d) for d in left.placement_journal] == \
+        [delta_state(d) for d in right.placement_journal]
+    assert left.seen_tiles_index == right.seen_tiles_index
+    assert left.score == right.score
+
+def test_capture_restore():
+    session = Session()
+    session.load_from_csv("./tests/data/group_isolated_side.csv", simulate_tile_placement=False)
+    # placement at watched coordinates, which are watched again when undoing the placement
+    candidate = session.compute_candidate_tiles("GGGGGG", SideType.GREEN)[0]
+    session.watch_coordinates(candidate.coordinates)
+    session.place_candidate(candidate)
+    tile_records = session.get_tile_records()
+
+    snapshot = SessionSnapshot.capture(session)
+    assert snapshot.version == SessionSnapshot.VERSION
+    assert snapshot.is_valid_for(tile_records)
+
+    restored_session = Session()
+    snapshot.restore(restored_session, tile_records)
+    assert_derived_state_equal(session, restored_session)
+
+    # the restored session may be continued like the original session
+    for s in [session, restored_session]:
+        s.place_candidate(s.compute_tile_ratings(
+            s.compute_candidate_tiles("GGWWHH", SideType.GREEN))[0].tile)
+        s.undo_last_tile()
+        s.undo_last_tile()
+    assert_derived_state_equal(session, restored_session)
+    assert candidate.coordinates in restored_session.watched_open_coords
+
+def test_invalid_snapshot():
+    session = Session()
+    session.load_from_csv("./tests/data/group.csv", simulate_tile_placement=False)
+    tile_records = session.get_tile_records()
+    snapshot = SessionSnapshot.capture(session)
+
+    assert not snapshot.is_valid_for(tile_records[:-1])
+    assert not snapshot._replace(version=SessionSnapshot.VERSION + 1).is_valid_for(tile_records)
+    assert not snapshot._replace(data=snapshot.data + b"\0").is_valid_for(tile_records)
+
+    with pytest.raises(ValueError):
+        snapshot.restore(Session(), tile_records[:-1])
+
+def test_load_from_database():
+    database = "./tests/data/__test_session_snapshot__.db"
+
+    if os.path.exists(database):
+        os.remove(database)  # ensure a clean start
+
+    with Session(database) as session:
+        session.load_from_csv("./tests/data/group_isolated_side.csv",
+                              simulate_tile_placement=False)
+        session.watch_coordinates(list(session.open_coords)[0])
+        session.save_to_database("snapshot")
+        session_id = session.get_all_sessions_from_database()[0].id
+        assert session.database.fetch_session_snapshot(session_id) is not None
+
+        # restored from the snapshot
+        loaded_session = Session(database)
+        loaded_session.load_from_database(session_id, simulate_tile_placement=False)
+        assert_derived_state_equal(session, loaded_session)
+        assert loaded_session.watched_open_coords == session.watched_open_coords
+
+        # stale snapshot, tiles are replayed
+        session.database.journal_undo(session_id)
+        session.undo_last_tile()
+        loaded_session.load_from_database(session_id, simulate_tile_placement=False)
+        assert loaded_session.get_tile_records() == session.get_tile_records()
+        assert list(loaded_session.open_coords.items()) == list(session.open_coords.items())
+        assert loaded_session.score == session.score
+
+        # simulation does not consider the snapshot
+        loaded_session.load_from_database(session_id, simulate_tile_placement=True)
+        assert len(loaded_session.played_tiles) == len(session.played_tiles)
+
+        session.delete_from_database(session_id)
+        assert session.database.fetch_session_snapshot(session_id) is None
+
+    os.remove(database)
@@ -309,4 +309,21 @@ def test_get_all_neighbor_coords_values():
     expected_neighbor_coords = dict(zip(TileSubsection.get_all_values(), list(exptected_neighbor_coords_values)))
 
     actual_neighbor_coords = tile.get_neighbor_coords_values()
-    assert actual_neighbor_coords == exptected_neighbor_coords_values
\ No newline at end of file
+    assert actual_neighbor_coords == exptected_neighbor_coords_values
+
+def test_tile_copy_at():
+    tile = Tile("RRPPGG", SideType.GREEN, None)
+    rotated_tile = tile.get_rotation().get_rotation()
+    rotated_tile.get_side(TileSubsection.TOP).placement = Side.Placement.PERFECT_MATCH
+
+    copy = rotated_tile.get_copy_at((0,4))
+    assert copy.coordinates == (0,4)
+    assert copy.get_neighbor_coords(TileSubsection.TOP) == (0,8)
+    assert copy.get_side_type_seq() == rotated_tile.get_side_type_seq()
+    assert copy.get_side(TileSubsection.TOP).placement == Side.Placement.PERFECT_MATCH
+    # the connected subsection groups of the rotated tile are kept
+    assert copy.get_connected_subsection_groups() == rotated_tile.get_connected_subsection_groups()
+
+    # the copy is independent of the original
+    copy.get_side(TileSubsection.TOP).placement = Side.Placement.IMPERFECT_MATCH
+    assert rotated_tile.get_side(TileSubsection.TOP).placement == Side.Placement.PERFECT_MATCH
@@ -1,5 +1,6 @@
 from contextlib import contextmanager
 
+from src.constants import Constants
 from src.side import Side
 from src.side_type import SideType
 from src.tile import Tile
@@ -344,8 +345,8 @@ def test_num_perfectly_closed():
     assert candidate.get_num_perfectly_closed(session.played_tiles) == 2
 
 def test_neighbor_compatibility_score_dictionaries():
-    for neighbor_scores in [TileEvaluation._DIRECT_NEIGHBOR_COMPATIBILITY_SCORE,
-                            TileEvaluation._OTHER_NEIGHBOR_COMPATIBILITY_SCORE]:
+    for neighbor_scores in [Constants.DIRECT_NEIGHBOR_COMPATIBILITY_SCORE,
+                            Constants.OTHER_NEIGHBOR_COMPATIBILITY_SCORE]:
         combination_list = {}
         for score, side_type_dict in neighbor_scores:
             for type in SideType.get_values():
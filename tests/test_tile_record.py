@@ -0,0 +1,49 @@
+import os
+import pytest
+
+from src.side import Side
+from src.side_type import SideType
+from src.session import Session
+from src.tile_record import TileRecord
+
+def test_parse_coordinates():
+    assert TileRecord.parse_coordinates("(0, 0)") == (0, 0)
+    assert TileRecord.parse_coordinates(" (-3,-2) ") == (-3, -2)
+
+    with pytest.raises(ValueError):
+        TileRecord.parse_coordinates("(0, 0, 0)")
+    with pytest.raises(ValueError):
+        TileRecord.parse_coordinates("(a, 0)")
+
+def test_from_tile():
+    session = Session()
+    tile = session.prepare_candidate([SideType.WOODS], SideType.WOODS, coordinates=(0, 0))
+    tile.quest = Side(SideType.WOODS)
+    record = TileRecord.from_tile(tile)
+    assert record == TileRecord((0, 0), "WWWWWW", "W", "W")
+    assert record.to_strings() == ("(0, 0)", "WWWWWW", "W", "W")
+
+    record = TileRecord.from_strings("(0, 4)", "GGGGGG", "G", "")
+    assert record.quest_type is None
+    assert record.to_strings() == ("(0, 4)", "GGGGGG", "G", "")
+
+def test_csv_round_trip():
+    file = "./tests/data/__test_tile_record__.csv"
+    records = [
+        TileRecord((0, 0), "GGGGGG", "G"),
+        TileRecord((0, 4), "W(G)WGWG", "W", "W"),
+    ]
+    TileRecord.write_csv(file, records)
+    assert list(TileRecord.read_csv(file)) == records
+
+    os.remove(file)
+
+def test_read_invalid_csv():
+    file = "./tests/data/__test_tile_record__.csv"
+    for content in ["", "id,coordinates\n0,\"(0, 0)\"\n"]:
+        with open(file, "w", encoding="utf-8") as f:
+            f.write(content)
+        with pytest.raises(ValueError):
+            list(TileRecord.read_csv(file))
+
+    os.remove(file)